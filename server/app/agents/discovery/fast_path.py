@@ -0,0 +1,87 @@
+"""
+Local fast path: decide whether a chat turn can change the blueprint.
+
+Messages like "ok", "thanks", "네 계속해주세요" cannot carry new blueprint
+information, so the discovery-analysis call is skipped and the current
+BlueprintData reused. The check is deliberately conservative: any word
+outside the small acknowledgement vocabulary, any digit, or a message longer
+than MAX_TRIVIAL_CHARS sends the turn to the analysis.
+
+Bare affirmations ("yes", "맞아요") can confirm a value the assistant just
+proposed, so they only skip the analysis while no field sits between a first
+mention and the readiness threshold (per field_scores).
+
+Metrics:
+- discovery_analysis_total{path=analyzed|skipped}
+- discovery_analysis_skipped_total{reason=filler|affirmation}
+- discovery_analysis_skip_rate (gauge)
+"""
+
+import re
+
+from app.core.metrics import metrics
+from app.schemas.api.chat import BlueprintData
+
+__all__ = ["record_analysis_path", "trivial_turn_reason"]
+
+MAX_TRIVIAL_CHARS = 40
+# Same readiness threshold as DiscoveryStreamService._get_missing_fields
+READY_SCORE = 60
+
+# Acknowledgements, thanks and "go on" - never blueprint content
+FILLER = {
+    "ok", "okay", "k", "kk", "thanks", "thank", "you", "thx", "ty", "cool",
+    "great", "nice", "good", "got", "it", "continue", "go", "on", "next",
+    "please", "pls", "lol", "hmm", "hm", "oh", "ah", "i", "see",
+    "감사합니다", "감사해요", "고마워", "고마워요", "고맙습니다", "알겠어요",
+    "알겠습니다", "알겠어", "알았어", "오케이", "좋아요", "좋아", "좋네요",
+    "계속", "계속해", "계속해줘", "계속해주세요", "계속해요", "다음", "넘어가",
+    "주세요", "해주세요", "그래요", "그렇군요", "아하", "음", "ㅇㅋ", "ㅋㅋ",
+    "ㅎㅎ", "ㅋ", "ㅎ",
+}  # fmt: skip
+# Agreement that may confirm a value the assistant proposed
+AFFIRMATION = {
+    "yes", "yeah", "yep", "yup", "sure", "right", "correct", "exactly",
+    "네", "넵", "예", "응", "ㅇㅇ", "맞아", "맞아요", "맞습니다", "그래",
+}  # fmt: skip
+
+_WORD_RE = re.compile(r"[\wㄱ-ㆎ가-힣]+")
+
+
+def trivial_turn_reason(message: str, blueprint: BlueprintData) -> str | None:
+    """
+    "filler" / "affirmation" when the message cannot change the blueprint,
+    None when it may (run the analysis).
+    """
+    text = message.strip().lower()
+    if len(text) > MAX_TRIVIAL_CHARS or any(c.isdigit() for c in text):
+        return None
+    words = _WORD_RE.findall(text)
+    if any(w not in FILLER and w not in AFFIRMATION for w in words):
+        return None
+    if not any(w in AFFIRMATION for w in words):
+        return "filler"
+
+    scores = blueprint.field_scores.model_dump(exclude={"milestones"})
+    if any(0 < score < READY_SCORE for score in scores.values()):
+        return None  # "yes" may confirm a tentative field
+    return "affirmation"
+
+
+def record_analysis_path(skip_reason: str | None) -> None:
+    path = "skipped" if skip_reason else "analyzed"
+    metrics.inc("discovery_analysis_total", labels={"path": path})
+    if skip_reason:
+        metrics.inc("discovery_analysis_skipped_total", labels={"reason": skip_reason})
+
+
+def _skip_rate() -> dict[str, float]:
+    skipped, analyzed = (
+        metrics.counter_value("discovery_analysis_total", {"path": path})
+        for path in ("skipped", "analyzed")
+    )
+    total = skipped + analyzed
+    return {"": round(skipped / total, 4)} if total else {}
+
+
+metrics.register_gauge("discovery_analysis_skip_rate", _skip_rate)
@@ -0,0 +1,60 @@
+"""
+Prompt history for the discovery agent: a rolling summary of older turns plus
+the most recent messages that fit DISCOVERY_HISTORY_TOKEN_BUDGET.
+
+History dicts ({"role", "content"}, optionally "tokens" and "order" for
+server-side history) become LangChain messages here. The precomputed token
+count travels in additional_kwargs["token_count"]; messages without one are
+estimated. The summary, when present, is a leading SystemMessage.
+"""
+
+from app.utils.tokens import estimate_tokens
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+__all__ = ["entry_tokens", "format_history", "message_tokens", "to_messages"]
+
+
+def entry_tokens(entry: dict) -> int:
+    return entry.get("tokens") or estimate_tokens(entry["content"])
+
+
+def message_tokens(message: BaseMessage) -> int:
+    return message.additional_kwargs.get("token_count") or estimate_tokens(
+        message.content
+    )
+
+
+def to_messages(history: list[dict], summary: str | None = None) -> list[BaseMessage]:
+    messages: list[BaseMessage] = [SystemMessage(content=summary)] if summary else []
+    for entry in history:
+        cls = HumanMessage if entry["role"] == "user" else AIMessage
+        messages.append(
+            cls(
+                content=entry["content"],
+                additional_kwargs={"token_count": entry_tokens(entry)},
+            )
+        )
+    return messages
+
+
+def _recent_window(messages: list[BaseMessage], budget: int) -> list[BaseMessage]:
+    """Leading summary (if any) + the newest messages within budget (at least one)."""
+    summary = [m for m in messages[:1] if m.type == "system"]
+    window: list[BaseMessage] = []
+    used = 0
+    for message in reversed(messages[len(summary) :]):
+        used += message_tokens(message)
+        if window and used > budget:
+            break
+        window.append(message)
+    return summary + window[::-1]
+
+
+def format_history(messages: list[BaseMessage], budget: int) -> str:
+    lines = []
+    for m in _recent_window(messages, budget):
+        if m.type == "system":
+            lines.append(f"Summary of the earlier conversation: {m.content}")
+        else:
+            lines.append(f"{m.type}: {m.content}")
+    return "\n".join(lines)
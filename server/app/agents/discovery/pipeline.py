@@ -10,29 +10,57 @@ Key improvement over V3:
 Flow:
 1. analyze_user_message() -> extract info from user's message, update blueprint
 2. stream_response() -> stream tokens with UPDATED blueprint context
+
+History in both prompts is the rolling conversation summary (if any) plus the
+most recent messages within DISCOVERY_HISTORY_TOKEN_BUDGET (see history.py);
+summarize_history() extends that summary in the background.
 """
 
-import json
 import logging
-import re
 from typing import AsyncGenerator
 
+from app.agents.discovery.fast_path import record_analysis_path, trivial_turn_reason
+from app.agents.discovery.history import format_history
 from app.agents.discovery.prompts import (
     GREETING_INSTRUCTION_DEFAULT,
     GREETING_INSTRUCTION_FIRST_TURN,
     get_chat_prompt,
     get_pre_analysis_prompt,
+    get_summary_prompt,
 )
+from app.agents.discovery.uncertainty import UncertaintyRegistry
+from app.core.config import settings
 from app.schemas.api.chat import BlueprintData
-from app.services.gemini import get_llm
+from app.schemas.llm.discovery import DiscoveryAnalysisResult
+from app.services.chain_registry import chain_registry
+from app.services.gemini import get_llm, structured_llm
+from app.services.llm_cache import llm_cache
+from app.services.llm_resilience import llm_resilience
+from app.services.llm_scheduler import Priority, llm_scheduler
 from langchain_core.messages import BaseMessage
 from langchain_core.output_parsers import StrOutputParser
 
 logger = logging.getLogger(__name__)
 
-llm = get_llm()
+__all__ = ["analyze_user_message", "stream_response", "summarize_history"]
+
+
+def _analysis_chain(prompt, llm):
+    return prompt | structured_llm(
+        llm, DiscoveryAnalysisResult, "discovery-pre-analysis"
+    )
+
+
+def _chat_chain(prompt, llm):
+    return prompt | llm | StrOutputParser()
 
-__all__ = ["analyze_user_message", "stream_response"]
+
+def _format_uncertainties(registry: UncertaintyRegistry) -> str:
+    """Newest unresolved uncertainties, capped at UNCERTAINTY_PROMPT_LIMIT."""
+    unresolved = registry.unresolved()
+    if not unresolved:
+        return "None"
+    return ", ".join(f"{u['text']} ({u['type']})" for u in unresolved)
 
 
 async def analyze_user_message(
@@ -40,21 +68,29 @@ async def analyze_user_message(
     history: list[BaseMessage],
     blueprint: BlueprintData,
     callbacks: list | None = None,
+    user_id: str | None = None,
 ) -> BlueprintData:
     """
     Pre-analyze the user's message BEFORE generating a response.
     Updates the blueprint so the response generator knows what to ask next.
+
+    Trivial turns ("ok", "thanks") skip the LLM call and keep the blueprint
+    (see fast_path).
     """
-    existing_uncertainties = "None"
-    if blueprint.uncertainties:
-        existing_uncertainties = ", ".join(
-            [
-                f"{u.get('text', '')} ({u.get('type', 'general')}, resolved={u.get('resolved', False)})"
-                for u in blueprint.uncertainties
-            ]
-        )
+    skip_reason = (
+        trivial_turn_reason(user_message, blueprint)
+        if settings.DISCOVERY_FAST_PATH_ENABLED
+        else None
+    )
+    record_analysis_path(skip_reason)
+    if skip_reason:
+        logger.info(f"[Discovery] Skipping pre-analysis ({skip_reason} turn)")
+        return blueprint
+
+    registry = UncertaintyRegistry(blueprint.uncertainties)
+    existing_uncertainties = _format_uncertainties(registry)
 
-    history_str = "\n".join([f"{m.type}: {m.content}" for m in history[-6:]])
+    history_str = format_history(history, settings.DISCOVERY_HISTORY_TOKEN_BUDGET)
 
     prompt_variables = {
         "current_goal": blueprint.goal or "Not set",
@@ -67,59 +103,57 @@ async def analyze_user_message(
         "user_message": user_message,
     }
 
-    pre_analysis_prompt = get_pre_analysis_prompt()
-    chain = pre_analysis_prompt | llm | StrOutputParser()
+    compiled = chain_registry.get(
+        "discovery-pre-analysis",
+        get_pre_analysis_prompt(),
+        get_llm(prompt_name="discovery-analysis"),
+        _analysis_chain,
+    )
 
     config = {"tags": ["pre_analysis_v4"]}
     if callbacks:
         config["callbacks"] = callbacks
 
-    try:
-        result_str = await chain.ainvoke(prompt_variables, config=config)
+    async def attempt():
+        async with llm_scheduler.slot(Priority.INTERACTIVE, user_id=user_id):
+            return await compiled.runnable.ainvoke(prompt_variables, config=config)
+
+    async def call() -> DiscoveryAnalysisResult:
+        raw = await llm_resilience.call(compiled.prompt_name, attempt)
+        return DiscoveryAnalysisResult.model_validate(raw)
 
-        json_clean = re.sub(r"^```json?\s*", "", result_str.strip())
-        json_clean = re.sub(r"\s*```$", "", json_clean)
-        result = json.loads(json_clean)
+    try:
+        result = await llm_cache.get_or_call(
+            compiled.prompt_name,
+            compiled.prompt_version,
+            compiled.model,
+            prompt_variables,
+            call,
+            schema=DiscoveryAnalysisResult,
+        )
 
         update_fields = {}
 
         # Extract new field values
-        extracted = result.get("extracted", {})
         for key in ["goal", "why", "timeline", "obstacles", "resources"]:
-            if extracted.get(key) and extracted[key] != "null":
-                update_fields[key] = extracted[key]
+            value = getattr(result.extracted, key)
+            if value and value != "null":
+                update_fields[key] = value
 
         # Update scores
-        if result.get("scores"):
-            updated_scores = blueprint.field_scores.model_copy(update=result["scores"])
+        scores = result.scores.model_dump(exclude_none=True) if result.scores else {}
+        if scores:
+            updated_scores = blueprint.field_scores.model_copy(update=scores)
             update_fields["field_scores"] = updated_scores
 
         # Store tips
-        if result.get("tips"):
-            update_fields["readiness_tips"] = result["tips"]
-
-        # Handle uncertainties - merge + resolve
-        if result.get("uncertainties") is not None:
-            new_uncertainties = result["uncertainties"]
-            existing = blueprint.uncertainties or []
-
-            existing_texts = {u.get("text", "").lower() for u in existing}
-
-            merged = list(existing)
-            for u in new_uncertainties:
-                text_lower = u.get("text", "").lower()
-                if text_lower not in existing_texts:
-                    if "resolved" not in u:
-                        u["resolved"] = False
-                    merged.append(u)
-                else:
-                    # Update resolved status if the new one says resolved
-                    if u.get("resolved", False):
-                        for existing_u in merged:
-                            if existing_u.get("text", "").lower() == text_lower:
-                                existing_u["resolved"] = True
-
-            update_fields["uncertainties"] = merged
+        if result.tips:
+            update_fields["readiness_tips"] = result.tips
+
+        # Handle uncertainties - merge (deduped by normalized text) + resolve
+        if result.uncertainties is not None:
+            registry.merge(u.model_dump() for u in result.uncertainties)
+            update_fields["uncertainties"] = registry.to_list()
 
         return (
             blueprint.model_copy(update=update_fields) if update_fields else blueprint
@@ -135,15 +169,17 @@ async def stream_response(
     blueprint: BlueprintData,
     missing_fields: list[str] | None = None,
     callbacks: list | None = None,
+    user_id: str | None = None,
 ) -> AsyncGenerator[str, None]:
     """
     Stream chat response using the UPDATED blueprint.
     The blueprint has already been analyzed, so the AI knows what info is missing.
     """
     human_messages = [m for m in messages if m.type == "human"]
-    is_first_turn = len(human_messages) <= 1
+    has_summary = bool(messages) and messages[0].type == "system"
+    is_first_turn = len(human_messages) <= 1 and not has_summary
     last_message = messages[-1].content if messages else ""
-    history_str = "\n".join([f"{m.type}: {m.content}" for m in messages[-6:]])
+    history_str = format_history(messages, settings.DISCOVERY_HISTORY_TOKEN_BUDGET)
 
     greeting_instruction = (
         GREETING_INSTRUCTION_FIRST_TURN
@@ -152,18 +188,9 @@ async def stream_response(
     )
 
     # Format unresolved uncertainties
-    unresolved_uncertainties = "None"
-    if blueprint.uncertainties:
-        unresolved = [
-            u for u in blueprint.uncertainties if not u.get("resolved", False)
-        ]
-        if unresolved:
-            unresolved_uncertainties = ", ".join(
-                [
-                    f"{u.get('text', '')} ({u.get('type', 'general')})"
-                    for u in unresolved
-                ]
-            )
+    unresolved_uncertainties = _format_uncertainties(
+        UncertaintyRegistry(blueprint.uncertainties)
+    )
 
     # Format missing fields for the prompt
     missing_fields_str = ", ".join(missing_fields) if missing_fields else "None"
@@ -186,13 +213,50 @@ async def stream_response(
         "history": history_str,
     }
 
-    chat_prompt = get_chat_prompt()
-    chain = chat_prompt | llm | StrOutputParser()
+    chain = chain_registry.get(
+        "discovery-chat",
+        get_chat_prompt(),
+        get_llm(prompt_name="discovery-chat"),
+        _chat_chain,
+    ).runnable
 
     config = {"tags": ["stream_response_v4"]}
     if callbacks:
         config["callbacks"] = callbacks
 
-    async for chunk in chain.astream(prompt_variables, config=config):
-        if chunk:
-            yield chunk
+    # Not retried: tokens may already have reached the client
+    async with (
+        llm_resilience.guard("discovery-chat"),
+        llm_scheduler.slot(Priority.INTERACTIVE, user_id=user_id),
+    ):
+        async for chunk in chain.astream(prompt_variables, config=config):
+            if chunk:
+                yield chunk
+
+
+async def summarize_history(
+    summary: str | None,
+    messages: list[BaseMessage],
+    user_id: str | None = None,
+) -> str:
+    """Extend the rolling conversation summary with older messages."""
+    prompt_variables = {
+        "summary": summary or "None",
+        "messages": "\n".join(f"{m.type}: {m.content}" for m in messages),
+    }
+
+    compiled = chain_registry.get(
+        "discovery-summary",
+        get_summary_prompt(),
+        get_llm(prompt_name="discovery-summary"),
+        _chat_chain,
+    )
+
+    async def attempt():
+        async with llm_scheduler.slot(Priority.BACKGROUND, user_id=user_id):
+            return await compiled.runnable.ainvoke(
+                prompt_variables, config={"tags": ["conversation_summary"]}
+            )
+
+    result = await llm_resilience.call(compiled.prompt_name, attempt)
+    return result.strip()
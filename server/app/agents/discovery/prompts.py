@@ -123,6 +123,31 @@ _PRE_ANALYSIS_PROMPT_FALLBACK = ChatPromptTemplate.from_messages(
     ]
 )
 
+# Summary prompt - folds older turns into the rolling conversation summary
+_SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a goal-coaching conversation.
+
+**Summary So Far:**
+{summary}
+
+**New Messages:**
+{messages}
+
+**Task:**
+Extend the summary with the new messages. Keep every fact the user shared about
+their goal, motivation, timeline, obstacles and resources, any decisions or
+assumptions agreed with the coach, and open questions. Drop greetings and filler.
+Write at most 150 words, in the language of the conversation.
+
+Return ONLY the updated summary text.
+"""
+
+_SUMMARY_PROMPT_FALLBACK = ChatPromptTemplate.from_messages(
+    [
+        ("system", _SUMMARY_SYSTEM_PROMPT),
+        ("human", "Update the summary."),
+    ]
+)
+
 
 # ============================================
 # Prompt Getters (Langfuse with fallback)
@@ -137,3 +162,8 @@ def get_chat_prompt() -> ChatPromptTemplate:
 def get_pre_analysis_prompt() -> ChatPromptTemplate:
     """Get pre-analysis prompt from Langfuse or fallback to local."""
     return get_prompt("discovery-pre-analysis", _PRE_ANALYSIS_PROMPT_FALLBACK)
+
+
+def get_summary_prompt() -> ChatPromptTemplate:
+    """Get conversation summary prompt from Langfuse or fallback to local."""
+    return get_prompt("discovery-summary", _SUMMARY_PROMPT_FALLBACK)
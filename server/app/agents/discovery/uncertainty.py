@@ -0,0 +1,131 @@
+"""
+Uncertainty registry: the blueprint's uncertainties indexed by normalized text.
+
+BlueprintData.uncertainties stays a list[dict] (JSONB column, API payloads);
+each item also stores its normalized "key" so the registry is rebuilt without
+re-normalizing. Normalization lowercases, applies NFKC and drops punctuation
+and extra whitespace, so "Start date unclear!" and "start  date unclear" are
+one item. With UNCERTAINTY_SIMILARITY_THRESHOLD < 1, an item whose word set
+overlaps an existing one by at least that Jaccard ratio is merged into it too
+(candidates come from a word -> keys index, not a scan of every item).
+
+Prompts render at most UNCERTAINTY_PROMPT_LIMIT unresolved items, newest
+first.
+
+Usage:
+    registry = UncertaintyRegistry(blueprint.uncertainties)
+    registry.merge(u.model_dump() for u in result.uncertainties)
+    blueprint.uncertainties = registry.to_list()
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Iterable
+
+from app.core.config import settings
+
+__all__ = ["UncertaintyRegistry", "normalize_uncertainty"]
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def normalize_uncertainty(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    return " ".join(_PUNCT_RE.sub(" ", text).split())
+
+
+class UncertaintyRegistry:
+    """Uncertainties keyed by normalized text, in insertion order."""
+
+    def __init__(
+        self,
+        items: Iterable[dict] = (),
+        similarity_threshold: float | None = None,
+    ):
+        self.similarity_threshold = (
+            settings.UNCERTAINTY_SIMILARITY_THRESHOLD
+            if similarity_threshold is None
+            else similarity_threshold
+        )
+        self._items: dict[str, dict] = {}
+        self._by_word: defaultdict[str, set[str]] = defaultdict(set)
+        for item in items:
+            self.add(item)
+
+    def find(self, text: str) -> dict | None:
+        """The item for text, by normalized key or word-set similarity."""
+        key = normalize_uncertainty(text)
+        if key in self._items:
+            return self._items[key]
+        similar = self._similar_key(key)
+        return self._items[similar] if similar else None
+
+    def add(self, item: dict) -> dict:
+        """Insert item, or merge it into the existing one (resolved is sticky)."""
+        text = item.get("text", "")
+        key = item.get("key") or normalize_uncertainty(text)
+        existing = self._items.get(key)
+        if existing is None:
+            similar = self._similar_key(key)
+            existing = self._items[similar] if similar else None
+        if existing is not None:
+            if item.get("resolved", False):
+                existing["resolved"] = True
+            return existing
+
+        stored = {
+            "text": text,
+            "type": item.get("type", "general"),
+            "resolved": item.get("resolved", False),
+            "key": key,
+        }
+        self._items[key] = stored
+        for word in key.split():
+            self._by_word[word].add(key)
+        return stored
+
+    def merge(self, items: Iterable[dict]) -> None:
+        for item in items:
+            self.add(item)
+
+    def resolve(self, text: str) -> bool:
+        item = self.find(text)
+        if item is not None:
+            item["resolved"] = True
+        return item is not None
+
+    def unresolved(self, limit: int | None = None) -> list[dict]:
+        """Unresolved items, newest first, at most `limit`."""
+        limit = settings.UNCERTAINTY_PROMPT_LIMIT if limit is None else limit
+        found = []
+        for item in reversed(self._items.values()):
+            if len(found) >= limit:
+                break
+            if not item["resolved"]:
+                found.append(item)
+        return found
+
+    def to_list(self) -> list[dict]:
+        return list(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _similar_key(self, key: str) -> str | None:
+        if self.similarity_threshold >= 1:
+            return None
+        words = set(key.split())
+        if not words:
+            return None
+        shared: defaultdict[str, int] = defaultdict(int)
+        for word in words:
+            for candidate in self._by_word.get(word, ()):
+                shared[candidate] += 1
+        best, best_score = None, 0.0
+        for candidate, overlap in shared.items():
+            union = len(words) + len(candidate.split()) - overlap
+            score = overlap / union
+            if score >= self.similarity_threshold and score > best_score:
+                best, best_score = candidate, score
+        return best
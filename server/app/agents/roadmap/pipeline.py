@@ -3,32 +3,81 @@ Roadmap Generation Pipeline - Simple async functions (no graph needed)
 
 Flow:
 1. generate_skeleton() - Generate goal structure with milestones (+ optional direct actions)
+   (stream_skeleton_milestones() yields each milestone as soon as it's parsed)
 2. generate_actions() - Generate actions for all milestones in parallel
+   (generate_actions_as_completed() yields each milestone as soon as it's done)
+   Strategy "batched" asks for several milestones' actions in one call
+   (roadmap-actions-batch) instead of one roadmap-actions call each.
 """
 
 import asyncio
 import logging
 import time
-from typing import Any
+from typing import Any, AsyncGenerator, Awaitable
 
 from app.agents.roadmap.prompts import (
     get_action_generator_prompt,
+    get_batch_action_generator_prompt,
     get_strategic_planner_prompt,
 )
+from app.core.config import settings
 from app.schemas.events.roadmap import GoalNode, Milestone
-from app.schemas.llm.roadmap import ActionContent, GoalContent, MilestoneContent
-from app.services.gemini import get_llm, parse_gemini_output
+from app.schemas.llm.roadmap import (
+    ActionsResult,
+    BatchActionsResult,
+    MilestoneContent,
+    SkeletonResult,
+)
+from app.services.chain_registry import CompiledChain, chain_registry
+from app.services.gemini import (
+    get_llm,
+    parse_gemini_output,
+    schema_constrained_llm,
+    structured_llm,
+)
+from app.services.json_output import parse_json_reply
+from app.services.llm_cache import llm_cache
+from app.services.llm_hedging import llm_hedger
+from app.services.llm_resilience import llm_resilience
+from app.services.llm_scheduler import Priority, llm_scheduler
+from app.utils.partial_json import JsonArrayItemStream
 from app.utils.roadmap import assign_action_ids, assign_goal_ids
-from langchain_core.output_parsers import JsonOutputParser
+from app.utils.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
-llm = get_llm()  # defaults to gemini-3-flash-preview
+__all__ = [
+    "generate_skeleton",
+    "stream_skeleton_milestones",
+    "generate_actions",
+    "generate_actions_as_completed",
+    "generate_milestone_actions",
+    "choose_actions_strategy",
+]
+
+
+def _planner_chain(prompt, llm):
+    return prompt | structured_llm(llm, SkeletonResult, "roadmap-planner")
+
+
+def _streaming_chain(prompt, llm):
+    # Raw text chunks (schema-constrained); the caller scans them incrementally
+    return prompt | schema_constrained_llm(llm, SkeletonResult)
 
-__all__ = ["generate_skeleton", "generate_actions", "llm"]
 
+def _action_chain(prompt, llm):
+    return prompt | structured_llm(llm, ActionsResult, "roadmap-actions")
 
-async def generate_skeleton(context: dict[str, Any]) -> GoalNode | None:
+
+def _batch_action_chain(prompt, llm):
+    return prompt | structured_llm(llm, BatchActionsResult, "roadmap-actions-batch")
+
+
+async def generate_skeleton(
+    context: dict[str, Any],
+    user_id: str | None = None,
+    priority: Priority = Priority.STANDARD,
+) -> GoalNode | None:
     """
     Step 1: Generate roadmap skeleton (Goal + Milestones).
 
@@ -37,45 +86,104 @@ async def generate_skeleton(context: dict[str, Any]) -> GoalNode | None:
     """
     goal_text = context.get("goal", "")
 
-    prompt = get_strategic_planner_prompt()
-    chain = prompt | llm | parse_gemini_output | JsonOutputParser()
+    compiled = chain_registry.get(
+        "roadmap-planner",
+        get_strategic_planner_prompt(),
+        get_llm(prompt_name="roadmap-planner"),
+        _planner_chain,
+    )
 
     try:
         logger.info("[Skeleton] Calling LLM...")
         t0 = time.monotonic()
-        result = await chain.ainvoke({"goal": goal_text, "context": str(context)})
-        logger.info(f"[Skeleton] LLM responded in {time.monotonic() - t0:.1f}s")
+        variables = {"goal": goal_text, "context": str(context)}
+
+        async def attempt():
+            async with llm_scheduler.slot(priority, user_id=user_id):
+                return await compiled.runnable.ainvoke(variables)
+
+        async def call() -> SkeletonResult:
+            raw = await llm_resilience.call(compiled.prompt_name, attempt)
+            return SkeletonResult.model_validate(raw)
 
-        goal_data = result.get("goal", {})
-        milestones_data = goal_data.pop("milestones", [])
-        actions_data = goal_data.pop("actions", [])
+        result = await llm_cache.get_or_call(
+            compiled.prompt_name,
+            compiled.prompt_version,
+            compiled.model,
+            variables,
+            call,
+            schema=SkeletonResult,
+        )
+        logger.info(f"[Skeleton] LLM responded in {time.monotonic() - t0:.1f}s")
 
         # Debug: check if LLM returned schedule fields
-        for ms in milestones_data:
+        for ms in result.goal.milestones:
             logger.info(
-                f"[Skeleton] Milestone '{ms.get('label', '?')}': "
-                f"start_date={ms.get('start_date')}, "
-                f"end_date={ms.get('end_date')}, "
-                f"completion_criteria={ms.get('completion_criteria')}"
+                f"[Skeleton] Milestone '{ms.label}': "
+                f"start_date={ms.start_date}, "
+                f"end_date={ms.end_date}, "
+                f"completion_criteria={ms.completion_criteria}"
             )
 
-        goal_content = GoalContent(
-            label=goal_data.get("label", goal_text),
-            details=goal_data.get("details"),
-            milestones=[MilestoneContent(**ms) for ms in milestones_data],
-            actions=[ActionContent(**a) for a in actions_data],
-        )
-
-        return assign_goal_ids(goal_content)
+        return assign_goal_ids(result.goal)
 
     except Exception as e:
-        print(f"Skeleton planning error: {e}")
+        logger.error(f"[Skeleton] Planning error: {e}")
         return None
 
 
+async def stream_skeleton_milestones(
+    context: dict[str, Any],
+    user_id: str | None = None,
+    priority: Priority = Priority.STANDARD,
+) -> AsyncGenerator[MilestoneContent | GoalNode, None]:
+    """
+    Step 1 (streaming): Stream the planner output and parse it incrementally.
+
+    Yields a MilestoneContent as soon as each milestone object closes, then the
+    complete GoalNode last. Nothing final is yielded if the output can't be parsed.
+    """
+    goal_text = context.get("goal", "")
+
+    chain = chain_registry.get(
+        "roadmap-planner",
+        get_strategic_planner_prompt(),
+        get_llm(prompt_name="roadmap-planner"),
+        _streaming_chain,
+    ).runnable
+    scanner = JsonArrayItemStream("milestones")
+
+    try:
+        logger.info("[Skeleton] Streaming LLM...")
+        t0 = time.monotonic()
+        async with (
+            llm_resilience.guard("roadmap-planner"),
+            llm_scheduler.slot(priority, user_id=user_id),
+        ):
+            async for chunk in chain.astream(
+                {"goal": goal_text, "context": str(context)}
+            ):
+                for ms in scanner.feed(parse_gemini_output(chunk) or ""):
+                    logger.info(
+                        f"[Skeleton] Milestone parsed after "
+                        f"{time.monotonic() - t0:.1f}s: '{ms.get('label', '?')}'"
+                    )
+                    yield MilestoneContent(**ms)
+        logger.info(f"[Skeleton] LLM stream finished in {time.monotonic() - t0:.1f}s")
+
+        result = parse_json_reply(scanner.text, SkeletonResult, "roadmap-planner")
+        yield assign_goal_ids(result.goal)
+
+    except Exception as e:
+        logger.error(f"[Skeleton] Streaming planning error: {e}")
+
+
 async def generate_actions(
     goal_node: GoalNode,
     context: dict[str, Any],
+    user_id: str | None = None,
+    priority: Priority = Priority.STANDARD,
+    strategy: str | None = None,
 ) -> GoalNode | None:
     """
     Step 2: Generate actions for each milestone in parallel.
@@ -85,30 +193,43 @@ async def generate_actions(
     if not goal_node:
         return None
 
+    completed = {
+        ms.id: ms
+        async for ms in generate_actions_as_completed(
+            goal_node, context, user_id=user_id, priority=priority, strategy=strategy
+        )
+    }
+    updated_milestones = [completed.get(ms.id, ms) for ms in goal_node.milestones]
+
+    return goal_node.model_copy(update={"milestones": updated_milestones})
+
+
+async def generate_actions_as_completed(
+    goal_node: GoalNode,
+    context: dict[str, Any],
+    user_id: str | None = None,
+    priority: Priority = Priority.STANDARD,
+    prefetched: dict[str, Awaitable[Milestone]] | None = None,
+    strategy: str | None = None,
+) -> AsyncGenerator[Milestone, None]:
+    """
+    Step 2 (streaming): Yield each milestone with its actions as soon as its
+    LLM call returns, in completion order rather than milestone order.
+
+    prefetched maps milestone id -> an already-running generation (speculative
+    results); its actions are reused and only failures fall back to the LLM.
+    A milestone whose call failed is yielded unchanged (no actions).
+
+    strategy is per_milestone | batched | auto (see choose_actions_strategy);
+    None uses ACTIONS_STRATEGY. Batched milestones of one chunk are yielded
+    together when that call returns.
+    """
+    if not goal_node:
+        return
+
     goal_text = context.get("goal", "")
 
-    action_prompt = get_action_generator_prompt()
-    action_chain = action_prompt | llm | parse_gemini_output | JsonOutputParser()
-
-    async def _generate_for_milestone(ms: Milestone) -> Milestone:
-        try:
-            logger.info(f"[Actions] Generating for milestone: {ms.label}")
-            t0 = time.monotonic()
-            result = await action_chain.ainvoke(
-                {
-                    "goal": goal_text,
-                    "milestone_label": ms.label,
-                    "milestone_details": ms.details or "",
-                }
-            )
-            logger.info(f"[Actions] '{ms.label}' done in {time.monotonic() - t0:.1f}s")
-            actions_data = result.get("actions", [])
-            action_contents = [ActionContent(**a) for a in actions_data]
-            actions = assign_action_ids(action_contents, ms.id)
-            return ms.model_copy(update={"actions": actions})
-        except Exception as e:
-            logger.error(f"[Actions] Error for '{ms.label}': {e}")
-            return ms
+    compiled = _compiled_action_chain()
 
     milestones = (
         goal_node.milestones
@@ -116,8 +237,213 @@ async def generate_actions(
         else goal_node.get("milestones", [])
     )
 
-    updated_milestones = await asyncio.gather(
-        *[_generate_for_milestone(ms) for ms in milestones]
+    prefetched = prefetched or {}
+
+    async def _run(ms: Milestone) -> list[Milestone]:
+        if ms.id in prefetched:
+            try:
+                ready = await prefetched[ms.id]
+                if ready.actions:
+                    return [ms.model_copy(update={"actions": ready.actions})]
+            except Exception as e:
+                logger.warning(
+                    f"[Actions] Prefetched result unusable for '{ms.label}': {e}"
+                )
+        return [
+            await _generate_for_milestone(compiled, ms, goal_text, user_id, priority)
+        ]
+
+    async def _run_batch(chunk: list[Milestone]) -> list[Milestone]:
+        return await _generate_for_chunk(compiled, chunk, goal_text, user_id, priority)
+
+    jobs = []
+    if choose_actions_strategy(strategy, len(milestones)) == "batched":
+        live = [ms for ms in milestones if ms.id not in prefetched]
+        size = settings.ACTIONS_BATCH_CHUNK_SIZE or len(live) or 1
+        jobs += [_run(ms) for ms in milestones if ms.id in prefetched]
+        jobs += [_run_batch(live[i : i + size]) for i in range(0, len(live), size)]
+    else:
+        jobs += [_run(ms) for ms in milestones]
+
+    tasks = [asyncio.create_task(job) for job in jobs]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for ms in await next_done:
+                yield ms
+    finally:
+        # Consumer stopped early (client disconnect): don't leak LLM calls
+        for task in tasks:
+            task.cancel()
+
+
+async def generate_milestone_actions(
+    ms: Milestone,
+    goal_text: str,
+    user_id: str | None = None,
+    priority: Priority = Priority.STANDARD,
+) -> Milestone:
+    """
+    Generate actions for a single milestone (used to pipeline action calls
+    behind the streaming skeleton). Returns ms unchanged on failure.
+    """
+    return await _generate_for_milestone(
+        _compiled_action_chain(), ms, goal_text, user_id, priority
+    )
+
+
+def choose_actions_strategy(strategy: str | None, milestone_count: int) -> str:
+    """
+    Resolve the requested strategy to "per_milestone" or "batched".
+
+    auto batches once ACTIONS_BATCH_MIN_MILESTONES milestones would repeat the
+    shared goal context; fewer stay parallel per-milestone calls.
+    """
+    strategy = strategy or settings.ACTIONS_STRATEGY
+    if strategy == "auto":
+        if milestone_count >= settings.ACTIONS_BATCH_MIN_MILESTONES:
+            return "batched"
+        return "per_milestone"
+    return "batched" if strategy == "batched" else "per_milestone"
+
+
+def _compiled_action_chain() -> CompiledChain:
+    return chain_registry.get(
+        "roadmap-actions",
+        get_action_generator_prompt(),
+        get_llm(prompt_name="roadmap-actions"),
+        _action_chain,
+    )
+
+
+async def _generate_for_milestone(
+    compiled: CompiledChain,
+    ms: Milestone,
+    goal_text: str,
+    user_id: str | None,
+    priority: Priority,
+) -> Milestone:
+    variables = {
+        "goal": goal_text,
+        "milestone_label": ms.label,
+        "milestone_details": ms.details or "",
+    }
+
+    async def invoke():
+        return await compiled.runnable.ainvoke(variables)
+
+    async def attempt():
+        async with llm_scheduler.slot(priority, user_id=user_id):
+            # Hedge the provider call only (queue wait never triggers it);
+            # background (speculative) work is never hedged
+            if settings.LLM_HEDGING_ENABLED and priority <= Priority.STANDARD:
+                return await llm_hedger.run(
+                    compiled.prompt_name,
+                    invoke,
+                    input_tokens=estimate_tokens(variables),
+                    spare_slot=lambda: llm_scheduler.try_acquire(user_id),
+                    release_slot=lambda: llm_scheduler.release(user_id),
+                )
+            return await invoke()
+
+    async def call() -> ActionsResult:
+        raw = await llm_resilience.call(compiled.prompt_name, attempt)
+        # No-op for structured output; validates plain dicts before caching
+        return ActionsResult.model_validate(raw)
+
+    try:
+        logger.info(f"[Actions] Generating for milestone: {ms.label}")
+        t0 = time.monotonic()
+        result = await llm_cache.get_or_call(
+            compiled.prompt_name,
+            compiled.prompt_version,
+            compiled.model,
+            variables,
+            call,
+            schema=ActionsResult,
+            cacheable=lambda r: bool(r.actions),
+        )
+        logger.info(f"[Actions] '{ms.label}' done in {time.monotonic() - t0:.1f}s")
+        actions = assign_action_ids(result.actions, ms.id)
+        return ms.model_copy(update={"actions": actions})
+    except Exception as e:
+        logger.error(f"[Actions] Error for '{ms.label}': {e}")
+        return ms
+
+
+def _covers_chunk(result: BatchActionsResult, size: int) -> bool:
+    """True when the batch reply has actions for every milestone in the chunk."""
+    covered = {item.index for item in result.milestones if item.actions}
+    return covered >= set(range(size))
+
+
+async def _generate_for_chunk(
+    single: CompiledChain,
+    chunk: list[Milestone],
+    goal_text: str,
+    user_id: str | None,
+    priority: Priority,
+) -> list[Milestone]:
+    """
+    One roadmap-actions-batch call for several milestones. Milestones the
+    reply leaves without actions (or all of them, if the call fails) fall
+    back to per-milestone calls.
+    """
+    compiled = chain_registry.get(
+        "roadmap-actions-batch",
+        get_batch_action_generator_prompt(),
+        get_llm(prompt_name="roadmap-actions-batch"),
+        _batch_action_chain,
     )
+    variables = {
+        "goal": goal_text,
+        "milestones": "\n".join(
+            f"{index}. {ms.label} ({ms.details or ''})"
+            for index, ms in enumerate(chunk)
+        ),
+    }
+
+    async def attempt():
+        async with llm_scheduler.slot(priority, user_id=user_id):
+            return await compiled.runnable.ainvoke(variables)
 
-    return goal_node.model_copy(update={"milestones": list(updated_milestones)})
+    async def call() -> BatchActionsResult:
+        raw = await llm_resilience.call(compiled.prompt_name, attempt)
+        return BatchActionsResult.model_validate(raw)
+
+    by_index: dict[int, list] = {}
+    try:
+        logger.info(f"[Actions] Generating batch of {len(chunk)} milestones")
+        t0 = time.monotonic()
+        result = await llm_cache.get_or_call(
+            compiled.prompt_name,
+            compiled.prompt_version,
+            compiled.model,
+            variables,
+            call,
+            schema=BatchActionsResult,
+            # A reply missing any milestone would pin that gap for the TTL
+            cacheable=lambda r: _covers_chunk(r, len(chunk)),
+        )
+        logger.info(
+            f"[Actions] Batch of {len(chunk)} done in {time.monotonic() - t0:.1f}s"
+        )
+        by_index = {item.index: item.actions for item in result.milestones}
+    except Exception as e:
+        logger.error(f"[Actions] Batch error, falling back per milestone: {e}")
+
+    done: list[Milestone] = []
+    retry: list[Milestone] = []
+    for index, ms in enumerate(chunk):
+        if by_index.get(index):
+            actions = assign_action_ids(by_index[index], ms.id)
+            done.append(ms.model_copy(update={"actions": actions}))
+        else:
+            retry.append(ms)
+    if retry:
+        done += await asyncio.gather(
+            *[
+                _generate_for_milestone(single, ms, goal_text, user_id, priority)
+                for ms in retry
+            ]
+        )
+    return done
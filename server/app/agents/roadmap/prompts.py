@@ -81,6 +81,38 @@ _ACTION_GENERATOR_FALLBACK = ChatPromptTemplate.from_messages(
 )
 
 
+_BATCH_ACTION_GENERATOR_SYSTEM = """You are an Action Planner.
+Generate 3-5 specific action items for EACH of the milestones below.
+
+Goal: {goal}
+Milestones (index. label (details)):
+{milestones}
+
+Return JSON with one entry per milestone, using its index (NO IDs):
+{{
+    "milestones": [
+        {{
+            "index": 0,
+            "actions": [
+                {{
+                    "label": "Action Item",
+                    "details": "Specific action description",
+                    "is_assumed": false
+                }}
+            ]
+        }}
+    ]
+}}
+"""
+
+_BATCH_ACTION_GENERATOR_FALLBACK = ChatPromptTemplate.from_messages(
+    [
+        ("system", _BATCH_ACTION_GENERATOR_SYSTEM),
+        ("human", "Generate actions for every milestone."),
+    ]
+)
+
+
 # ============================================
 # Prompt Getters (Langfuse with fallback)
 # ============================================
@@ -94,3 +126,8 @@ def get_strategic_planner_prompt() -> ChatPromptTemplate:
 def get_action_generator_prompt() -> ChatPromptTemplate:
     """Get action generator prompt from Langfuse or fallback to local."""
     return get_prompt("roadmap-actions", _ACTION_GENERATOR_FALLBACK)
+
+
+def get_batch_action_generator_prompt() -> ChatPromptTemplate:
+    """Get batched action generator prompt from Langfuse or fallback to local."""
+    return get_prompt("roadmap-actions-batch", _BATCH_ACTION_GENERATOR_FALLBACK)
@@ -8,6 +8,7 @@ from app.schemas.api.conversations import (
     ConversationResponse,
     ConversationUpdate,
 )
+from app.services.conversation_cache import conversation_cache
 from fastapi import APIRouter, Depends, status
 
 router = APIRouter()
@@ -96,3 +97,4 @@ async def delete_conversation(
             raise AppException("Not authorized", status_code=status.HTTP_403_FORBIDDEN)
 
         await uow.conversations.delete(conversation)
+    conversation_cache.invalidate(str(conversation_id))
@@ -12,10 +12,10 @@ from app.api.dependencies import (
     get_discovery_service,
     get_optional_user,
 )
+from app.api.routes.streams import sse_response
 from app.schemas.api.chat import ChatRequest
 from app.services.discovery_service import DiscoveryStreamService
 from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -35,12 +35,11 @@ async def stream_chat(
     - Background analysis runs AFTER user sees full response
     - Blueprint update is non-blocking
     - Uncertainty detection and tracking
+    - Resumable: every frame has an `id:`; after a dropped connection, GET
+      /streams/{X-Stream-Run-Id} with Last-Event-ID continues the same run
     """
     logger.info(
         f"Incoming chat request: chat_id={request.chat_id} message={request.message[:50]}..."
     )
     user_id = user.user_id if user else None
-    return StreamingResponse(
-        service.stream_chat(request, user_id),
-        media_type="text/event-stream",
-    )
+    return sse_response(service.stream_chat(request, user_id), owner=user_id)
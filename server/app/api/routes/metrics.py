@@ -0,0 +1,17 @@
+"""
+Metrics Routes
+
+Read-only JSON snapshot of in-process counters, gauges and histograms
+(LLM scheduler queue depth / wait times, etc.).
+"""
+
+from app.core.metrics import metrics
+from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Return the current metrics snapshot for this worker process."""
+    return metrics.snapshot()
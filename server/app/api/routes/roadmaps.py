@@ -6,6 +6,7 @@ from app.api.dependencies import (
     get_roadmap_service,
     get_uow,
 )
+from app.api.routes.streams import sse_response
 from app.core.exceptions import AppException, NotFoundException
 from app.core.uow import AsyncUnitOfWork
 from app.schemas.api.roadmaps import (
@@ -157,12 +158,14 @@ async def stream_actions(
     Requires roadmap_id from the skeleton response.
 
     If modified_milestones is provided, updates milestones before generating actions.
+    Resumable via GET /streams/{X-Stream-Run-Id} with Last-Event-ID.
     """
-    return StreamingResponse(
+    return sse_response(
         service.stream_actions(
             request.roadmap_id,
             user.user_id,
             request.modified_milestones,
+            actions_strategy=request.actions_strategy,
         ),
-        media_type="text/event-stream",
+        owner=user.user_id,
     )
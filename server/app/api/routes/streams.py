@@ -0,0 +1,66 @@
+"""
+Stream Routes
+
+Resume endpoint for resumable SSE runs (see app.services.stream_runs), plus
+the response helper the streaming routes use to start them.
+"""
+
+import logging
+from typing import AsyncGenerator
+
+from app.api.dependencies import CurrentUser, get_optional_user
+from app.core.config import settings
+from app.core.exceptions import NotFoundException
+from app.services.stream_runs import stream_runs
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+RUN_ID_HEADER = "X-Stream-Run-Id"
+
+
+def sse_response(
+    source: AsyncGenerator[str, None], owner: str | None
+) -> StreamingResponse:
+    """
+    Stream source as SSE. When resumable, the generation runs detached from
+    the connection and its run id is returned in the X-Stream-Run-Id header.
+    """
+    if not settings.SSE_RESUMABLE_ENABLED:
+        return StreamingResponse(source, media_type="text/event-stream")
+    run = stream_runs.start(source, owner)
+    return StreamingResponse(
+        run.frames(),
+        media_type="text/event-stream",
+        headers={RUN_ID_HEADER: run.run_id},
+    )
+
+
+@router.get("/streams/{run_id}")
+async def resume_stream(
+    run_id: str,
+    last_event_id: str | None = Header(default=None),
+    user: CurrentUser | None = Depends(get_optional_user),
+):
+    """
+    Resume a dropped SSE stream.
+
+    Replays the frames after the Last-Event-ID header (all frames without it),
+    then follows the still-running generation. Runs are kept per worker for
+    SSE_REPLAY_TTL_SECONDS after they finish.
+    """
+    try:
+        after = int(last_event_id or 0)
+    except ValueError:
+        after = 0
+    frames = stream_runs.resume(run_id, user.user_id if user else None, after)
+    if frames is None:
+        raise NotFoundException("Stream not found or expired")
+    logger.info(f"Resuming stream run_id={run_id} after={after}")
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={RUN_ID_HEADER: run_id},
+    )
@@ -1,7 +1,8 @@
 import os
 from pathlib import Path
+from typing import Any
 
-from pydantic import AnyHttpUrl, field_validator
+from pydantic import AnyHttpUrl, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Project root (goalmap-ai/)
@@ -56,7 +57,146 @@ class Settings(BaseSettings):
     def ASYNC_DATABASE_URI(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
-    GEMINI_API_KEY: str
+    # LLM provider: gemini | vertex | offline (scripted stand-in for testing)
+    LLM_PROVIDER: str = "gemini"
+    # Ordered failover chain (env: JSON list), e.g. ["gemini", "vertex"];
+    # empty = LLM_PROVIDER only
+    LLM_PROVIDER_CHAIN: list[str] = []
+    LLM_FAILOVER_P95_SECONDS: float = 30.0  # per route, over the rolling window
+    LLM_FAILOVER_ERROR_RATE: float = 0.5
+    LLM_FAILOVER_WINDOW: int = 50  # recent calls per provider and route
+    LLM_FAILOVER_MIN_SAMPLES: int = 10
+    LLM_FAILOVER_PROBE_SECONDS: float = 30.0  # retry an unhealthy provider
+    # Gemini on Vertex AI (provider "vertex", application default credentials)
+    VERTEX_PROJECT: str | None = None
+    VERTEX_LOCATION: str = "global"
+    GEMINI_API_KEY: str | None = None
+    # Extra keys for the key pool (env: JSON list); one client per key
+    GEMINI_API_KEYS: list[str] = []
+    LLM_KEY_POOL_STRATEGY: str = "round_robin"  # round_robin | least_loaded
+    LLM_KEY_COOLDOWN_SECONDS: float = 30.0  # a key is skipped this long after a 429
+
+    @property
+    def GEMINI_KEY_POOL(self) -> list[str]:
+        """GEMINI_API_KEY followed by GEMINI_API_KEYS, without duplicates."""
+        keys = [self.GEMINI_API_KEY, *self.GEMINI_API_KEYS]
+        return list(dict.fromkeys(k for k in keys if k))
+
+    # Send Pydantic schemas as the native response schema for JSON prompts
+    LLM_STRUCTURED_OUTPUT: bool = True
+
+    # Per-prompt model routes: env JSON {prompt_name: {model, temperature,
+    # max_output_tokens}} over the built-in table; Langfuse prompt config wins
+    LLM_MODEL_ROUTES: dict[str, dict[str, Any]] = {}
+
+    # Offline scripted LLM (LLM_PROVIDER=offline)
+    OFFLINE_LLM_TTFT_MS: int = 300
+    OFFLINE_LLM_TOKEN_DELAY_MS: int = 15
+    OFFLINE_LLM_FAILURE_RATE: float = 0.0
+    OFFLINE_LLM_FAILURE_CODE: int = 503  # 429 exercises the key pool cooldown
+    OFFLINE_LLM_SEED: int = 0
+    OFFLINE_LLM_SCRIPT_PATH: str | None = None  # JSON: {prompt_name: response}
+
+    # Expose GET /api/v1/metrics (in-process JSON snapshot)
+    METRICS_ENABLED: bool = True
+    # HMAC key for per-user metric labels (unset: random per process)
+    METRICS_USER_HASH_KEY: str | None = None
+
+    # LLM concurrency scheduler (process-wide)
+    LLM_MAX_IN_FLIGHT: int = 16
+    LLM_MAX_IN_FLIGHT_PER_USER: int = 4
+
+    # Speculative generation (background work before the user asks for it)
+    SPECULATIVE_ACTIONS_ENABLED: bool = True  # actions during HIL skeleton review
+    SPECULATIVE_SKELETON_ENABLED: bool = True  # skeleton once the blueprint is ready
+    SPECULATION_TTL_SECONDS: int = 900
+
+    # LLM response cache (content-addressed, per-prompt opt-in)
+    # roadmap-planner is left out so "regenerate" still returns a fresh skeleton
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PROMPTS: list[str] = [  # env: JSON list of Langfuse prompt names
+        "roadmap-actions",
+        "roadmap-actions-batch",
+        "discovery-pre-analysis",
+        "checkin-analysis",
+    ]
+    LLM_CACHE_MAX_ENTRIES: int = 2048
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_POSTGRES_ENABLED: bool = False  # shared tier across workers
+    LLM_CACHE_PURGE_EVERY_WRITES: int = 100  # delete expired rows every N writes
+
+    # LLM resilience: retries with jittered exponential backoff + circuit breaker
+    LLM_RETRY_MAX_ATTEMPTS: int = 3  # total attempts per call, 1 = no retry
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive provider failures
+    LLM_BREAKER_RESET_SECONDS: float = 30.0  # open -> half-open probe
+
+    # Discovery chat: sequential | speculative (start the response while the
+    # pre-analysis runs, restart it only if the missing fields change)
+    DISCOVERY_RESPONSE_MODE: str = "sequential"
+    # Coalesce streamed tokens into one SSE event per window (per request:
+    # token_flush_ms / token_flush_bytes); 0 ms = one event per model chunk
+    SSE_TOKEN_FLUSH_MS: int = 50
+    SSE_TOKEN_FLUSH_BYTES: int = 512
+    # Resumable SSE (/chat/stream, /roadmaps/stream/actions): generations run
+    # detached from the connection; GET /streams/{run_id} + Last-Event-ID
+    # replays the buffered frames and follows the live run
+    SSE_RESUMABLE_ENABLED: bool = True
+    SSE_REPLAY_BUFFER_EVENTS: int = 1024  # frames kept per run
+    SSE_REPLAY_TTL_SECONDS: int = 300  # after the run finishes
+    SSE_REPLAY_MAX_RUNS: int = 1000
+    # Skip the pre-analysis LLM call for turns like "ok" / "thanks"
+    DISCOVERY_FAST_PATH_ENABLED: bool = True
+    # Server-side history for delta-only chat requests (use_server_history)
+    CONVERSATION_CACHE_MAX_ENTRIES: int = 2048
+    CONVERSATION_CACHE_TTL_SECONDS: int = 900
+    CONVERSATION_HISTORY_WINDOW: int = 20  # recent messages loaded per chat
+    # Prompt history: rolling summary + newest messages within a token budget.
+    # Server-side chats fold older messages into the summary once the
+    # unsummarized ones exceed the budget (background discovery-summary call)
+    DISCOVERY_HISTORY_TOKEN_BUDGET: int = 1500
+    CONVERSATION_SUMMARY_ENABLED: bool = True
+    # Blueprint uncertainties (see app.agents.discovery.uncertainty): word-set
+    # Jaccard ratio at which two items are merged (1 = normalized text only),
+    # and the most unresolved items rendered into prompts
+    UNCERTAINTY_SIMILARITY_THRESHOLD: float = 0.8
+    UNCERTAINTY_PROMPT_LIMIT: int = 5
+
+    # Roadmap action generation: one call per milestone, or milestones batched
+    # into one structured call (in chunks); auto batches from a milestone count
+    ACTIONS_STRATEGY: str = "per_milestone"  # per_milestone | batched | auto
+    ACTIONS_BATCH_CHUNK_SIZE: int = 5  # milestones per batched call, 0 = all
+    ACTIONS_BATCH_MIN_MILESTONES: int = 3  # auto: batch from this many milestones
+
+    # Hedged requests for the roadmap action fan-out (duplicate slow calls)
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 95.0  # hedge once a call is slower than this
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # latencies needed before using the percentile
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 5.0
+    LLM_HEDGE_BUDGET_RATIO: float = 0.1  # max share of recent calls that are hedged
+
+    @property
+    def LLM_PROVIDERS(self) -> list[str]:
+        """Providers in failover order."""
+        return self.LLM_PROVIDER_CHAIN or [self.LLM_PROVIDER]
+
+    @model_validator(mode="after")
+    def check_llm_provider(self) -> "Settings":
+        for provider in self.LLM_PROVIDERS:
+            if provider not in ("gemini", "vertex", "offline"):
+                raise ValueError(f"Unknown LLM provider '{provider}'")
+        if "vertex" in self.LLM_PROVIDERS and not self.VERTEX_PROJECT:
+            raise ValueError("VERTEX_PROJECT is required for the vertex provider")
+        if "gemini" in self.LLM_PROVIDERS and not self.GEMINI_KEY_POOL:
+            raise ValueError(
+                "GEMINI_API_KEY (or GEMINI_API_KEYS) is required when LLM_PROVIDER=gemini"
+            )
+        if self.LLM_KEY_POOL_STRATEGY not in ("round_robin", "least_loaded"):
+            raise ValueError(
+                f"Unknown LLM_KEY_POOL_STRATEGY '{self.LLM_KEY_POOL_STRATEGY}'"
+            )
+        return self
 
     # Langfuse
     LANGFUSE_PUBLIC_KEY: str | None = None
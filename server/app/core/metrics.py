@@ -0,0 +1,124 @@
+"""
+In-process metrics registry.
+
+Counters, gauges and latency histograms keyed by name + labels, exposed as
+JSON through GET /api/v1/metrics. Per-process only - each worker reports its own.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Callable
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, str] | None) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _label_str(key: LabelKey) -> str:
+    return ",".join(f"{k}={v}" for k, v in key)
+
+
+class Histogram:
+    """Bounded reservoir of recent observations with percentile summaries."""
+
+    def __init__(self, window: int = 1024):
+        self._values: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self._values.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> float | None:
+        """Percentile (0-100) over the recent window, None if empty."""
+        if not self._values:
+            return None
+        ordered = sorted(self._values)
+        idx = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+        return ordered[idx]
+
+    def summary(self) -> dict[str, float | int | None]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(self._values) if self._values else None,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry; metrics are created lazily on first use."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, Histogram]] = {}
+        self._gauges: dict[str, Callable[[], dict[str, float]]] = {}
+
+    def inc(
+        self, name: str, value: float = 1, labels: dict[str, str] | None = None
+    ) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(
+        self, name: str, value: float, labels: dict[str, str] | None = None
+    ) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(value)
+
+    def histogram(self, name: str, labels: dict[str, str] | None = None) -> Histogram:
+        """Return (creating if needed) the histogram for name + labels."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            return hist
+
+    def counter_value(self, name: str, labels: dict[str, str] | None = None) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def register_gauge(
+        self, name: str, collect: Callable[[], dict[str, float]]
+    ) -> None:
+        """Register a callback returning {label_str: value} at snapshot time."""
+        self._gauges[name] = collect
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {
+                name: {_label_str(k): v for k, v in series.items()}
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: {_label_str(k): h.summary() for k, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+        gauges = {name: collect() for name, collect in self._gauges.items()}
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def reset(self) -> None:
+        """Drop all recorded series (gauge callbacks are kept)."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+metrics = MetricsRegistry()
@@ -4,6 +4,7 @@ from app.core.database import async_session_factory
 
 if TYPE_CHECKING:
     from app.repositories.conversation_repo import ConversationRepository
+    from app.repositories.llm_cache_repo import LLMCacheRepository
     from app.repositories.roadmap_repo import RoadmapRepository
     from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -21,16 +22,19 @@ class AsyncUnitOfWork:
         # Repositories
         self.conversations: "ConversationRepository" | None = None
         self.roadmaps: "RoadmapRepository" | None = None
+        self.llm_cache: "LLMCacheRepository" | None = None
 
     async def __aenter__(self):
         self.session = self._session_factory()
 
         # Initialize repositories with the shared session
         from app.repositories.conversation_repo import ConversationRepository
+        from app.repositories.llm_cache_repo import LLMCacheRepository
         from app.repositories.roadmap_repo import RoadmapRepository
 
         self.conversations = ConversationRepository(self.session)
         self.roadmaps = RoadmapRepository(self.session)
+        self.llm_cache = LLMCacheRepository(self.session)
 
         return self
 
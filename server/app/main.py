@@ -1,7 +1,14 @@
 import logging
 from contextlib import asynccontextmanager
 
-from app.api.routes import checkins, conversations, discovery, roadmaps
+from app.api.routes import (
+    checkins,
+    conversations,
+    discovery,
+    metrics,
+    roadmaps,
+    streams,
+)
 from app.core.config import settings
 from app.core.exceptions import AppException
 from app.services.langfuse import preload_prompts
@@ -17,8 +24,10 @@ load_dotenv()
 ALL_PROMPT_NAMES = [
     "discovery-chat",
     "discovery-analysis",
+    "discovery-summary",
     "roadmap-planner",
     "roadmap-actions",
+    "roadmap-actions-batch",
     "checkin-analysis",
 ]
 
@@ -115,6 +124,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[streams.RUN_ID_HEADER],
 )
 
 
@@ -138,6 +148,17 @@ app.include_router(
     prefix=settings.API_V1_STR,
     tags=["checkins"],
 )
+app.include_router(
+    streams.router,
+    prefix=settings.API_V1_STR,
+    tags=["streams"],
+)
+if settings.METRICS_ENABLED:
+    app.include_router(
+        metrics.router,
+        prefix=settings.API_V1_STR,
+        tags=["metrics"],
+    )
 
 if __name__ == "__main__":
     import uvicorn
@@ -2,6 +2,7 @@ from app.models.base import Base
 from app.models.blueprint import Blueprint
 from app.models.checkin import CheckIn
 from app.models.conversation import Conversation
+from app.models.llm_cache import LLMCacheEntry
 from app.models.message import Message
 from app.models.node import Node, NodeStatus
 from app.models.roadmap import Roadmap, RoadmapStatus
@@ -11,6 +12,7 @@ __all__ = [
     "Blueprint",
     "CheckIn",
     "Conversation",
+    "LLMCacheEntry",
     "Message",
     "Node",
     "NodeStatus",
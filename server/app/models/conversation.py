@@ -14,6 +14,10 @@ class Conversation(Base):
 
     user_id: Mapped[str] = mapped_column(index=True)
     title: Mapped[str | None] = mapped_column(nullable=True)
+    # Rolling summary of messages[:summarized_messages] (by order), used in
+    # prompts ahead of the recent window (see app.services.conversation_summary)
+    summary: Mapped[str | None] = mapped_column(nullable=True)
+    summarized_messages: Mapped[int] = mapped_column(default=0, server_default="0")
 
     # Relationships
     messages: Mapped[list["Message"]] = relationship(
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from app.models.base import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class LLMCacheEntry(Base):
+    """Shared tier of the LLM response cache (see app.services.llm_cache)."""
+
+    __tablename__ = "llm_cache_entries"
+
+    # sha256 of prompt name + prompt version + model + rendered variables
+    cache_key: Mapped[str] = mapped_column(unique=True)
+    prompt_name: Mapped[str] = mapped_column(index=True)
+
+    # Parsed chain output, JSON-encoded
+    response: Mapped[str] = mapped_column()
+
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+
+    def __repr__(self) -> str:
+        return f"<LLMCacheEntry prompt={self.prompt_name} key={self.cache_key[:12]}>"
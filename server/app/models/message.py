@@ -14,6 +14,8 @@ class Message(Base):
     role: Mapped[str] = mapped_column()  # "user" | "assistant" | "system"
     content: Mapped[str] = mapped_column()
     order: Mapped[int] = mapped_column()
+    # estimate_tokens(content) at insert; NULL for rows older than the column
+    token_count: Mapped[int | None] = mapped_column(nullable=True)
 
     def __repr__(self) -> str:
         return f"<Message id={self.id} role={self.role} order={self.order}>"
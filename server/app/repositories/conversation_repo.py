@@ -5,7 +5,8 @@ from app.models.blueprint import Blueprint
 from app.models.conversation import Conversation
 from app.models.message import Message
 from app.repositories.base import BaseRepository
-from sqlalchemy import inspect, select
+from app.utils.tokens import estimate_tokens
+from sqlalchemy import inspect, select, update
 from sqlalchemy.orm import selectinload
 
 
@@ -44,6 +45,33 @@ class ConversationRepository(BaseRepository[Conversation]):
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_with_recent_messages(
+        self, id: UUID, limit: int
+    ) -> tuple[Conversation, list[Message]] | None:
+        """
+        Conversation + blueprint and its last `limit` messages not yet folded
+        into the summary, in order.
+        """
+        query = (
+            select(Conversation)
+            .where(Conversation.id == id)
+            .options(selectinload(Conversation.blueprint))
+        )
+        conversation = (await self.db.execute(query)).scalar_one_or_none()
+        if not conversation:
+            return None
+        query = (
+            select(Message)
+            .where(
+                Message.conversation_id == id,
+                Message.order >= conversation.summarized_messages,
+            )
+            .order_by(Message.order.desc())
+            .limit(limit)
+        )
+        messages = list((await self.db.execute(query)).scalars().all())
+        return conversation, messages[::-1]
+
     async def create(self, **kwargs) -> Conversation:
         conversation = Conversation(**kwargs)
         self.db.add(conversation)
@@ -75,6 +103,7 @@ class ConversationRepository(BaseRepository[Conversation]):
                 role=role,
                 content=str(content),  # Ensure string
                 order=new_order,
+                token_count=estimate_tokens(str(content)),
             )
             self.db.add(new_message)
             await self.db.flush()
@@ -82,6 +111,15 @@ class ConversationRepository(BaseRepository[Conversation]):
             return await self.get_with_messages_and_blueprint(conversation_id)
         return conversation
 
+    async def update_summary(
+        self, conversation_id: UUID, summary: str, summarized_messages: int
+    ) -> None:
+        await self.db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(summary=summary, summarized_messages=summarized_messages)
+        )
+
     async def update_blueprint(
         self, conversation_id: UUID, blueprint_data: dict[str, Any]
     ) -> Conversation | None:
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from app.models.llm_cache import LLMCacheEntry
+from app.repositories.base import BaseRepository
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
+
+class LLMCacheRepository(BaseRepository[LLMCacheEntry]):
+    def __init__(self, db):
+        super().__init__(LLMCacheEntry, db)
+
+    async def get_fresh(self, cache_key: str) -> LLMCacheEntry | None:
+        """Return the entry for cache_key unless it has expired."""
+        query = select(LLMCacheEntry).where(
+            LLMCacheEntry.cache_key == cache_key,
+            LLMCacheEntry.expires_at > func.now(),
+        )
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def upsert(
+        self, cache_key: str, prompt_name: str, response: str, ttl_seconds: int
+    ) -> None:
+        """Insert or refresh an entry; expiry is computed by the database clock."""
+        expires_at = func.now() + timedelta(seconds=ttl_seconds)
+        stmt = insert(LLMCacheEntry).values(
+            cache_key=cache_key,
+            prompt_name=prompt_name,
+            response=response,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LLMCacheEntry.cache_key],
+            set_={
+                "response": stmt.excluded.response,
+                "expires_at": stmt.excluded.expires_at,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def delete_expired(self) -> int:
+        """Delete expired entries; returns how many were removed."""
+        result = await self.db.execute(
+            delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= func.now())
+        )
+        return result.rowcount or 0
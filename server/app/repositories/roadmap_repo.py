@@ -139,6 +139,8 @@ class RoadmapRepository(BaseRepository[Roadmap]):
         roadmap_id: UUID,
         milestone_actions: dict[str, list[dict]],
         goal_actions: list[dict] | None = None,
+        activate: bool = True,
+        replace: bool = False,
     ) -> Roadmap:
         """
         Add action nodes under each milestone.
@@ -147,6 +149,9 @@ class RoadmapRepository(BaseRepository[Roadmap]):
             roadmap_id: The roadmap UUID
             milestone_actions: {milestone_node_id: [action_dicts]}
             goal_actions: Optional direct goal-level actions
+            activate: Set roadmap ACTIVE (False for incremental per-milestone saves)
+            replace: Delete the milestones' existing actions first, so a retried
+                or overlapping generation overwrites instead of duplicating
         """
         roadmap = await self.get(roadmap_id)
         if not roadmap:
@@ -155,6 +160,16 @@ class RoadmapRepository(BaseRepository[Roadmap]):
         # Find goal node for direct actions
         goal_node = next((n for n in roadmap.nodes if n.type == NodeType.GOAL), None)
 
+        if replace:
+            ms_ids = {
+                UUID(ms_id) if isinstance(ms_id, str) else ms_id
+                for ms_id in milestone_actions
+            }
+            for n in roadmap.nodes:
+                if n.type == NodeType.ACTION and n.parent_id in ms_ids:
+                    await self.db.delete(n)
+            await self.db.flush()
+
         # Add milestone actions
         for ms_id_str, actions in milestone_actions.items():
             ms_id = UUID(ms_id_str) if isinstance(ms_id_str, str) else ms_id_str
@@ -188,6 +203,10 @@ class RoadmapRepository(BaseRepository[Roadmap]):
 
         await self.db.flush()
 
+        if not activate:
+            logger.info(f"[Repo] Actions added to roadmap {roadmap_id}")
+            return roadmap
+
         # Activate roadmap
         roadmap.status = RoadmapStatus.ACTIVE
         await self.db.flush()
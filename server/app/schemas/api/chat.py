@@ -1,5 +1,10 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+# Discovery chat flow, see DiscoveryStreamService
+ResponseMode = Literal["sequential", "speculative"]
+
 
 class FieldScores(BaseModel):
     goal: int = 0
@@ -28,3 +33,11 @@ class ChatRequest(BaseModel):
     message: str
     history: list[dict[str, str]] = []  # [{"role": "user", "content": "..."}]
     current_blueprint: BlueprintData | None = None
+    response_mode: ResponseMode | None = None  # default: DISCOVERY_RESPONSE_MODE
+    # Authenticated clients with a chat_id may send only `message`: history and
+    # blueprint are then loaded server-side (history/current_blueprint ignored)
+    use_server_history: bool = False
+    # Token event coalescing (default: SSE_TOKEN_FLUSH_MS / SSE_TOKEN_FLUSH_BYTES);
+    # token_flush_ms=0 sends one event per model chunk
+    token_flush_ms: int | None = Field(default=None, ge=0, le=1000)
+    token_flush_bytes: int | None = Field(default=None, ge=0, le=65536)
@@ -1,10 +1,13 @@
 from datetime import date, datetime
+from typing import Literal
 from uuid import UUID
 
 from app.models.node import NodeStatus
 from app.models.roadmap import RoadmapStatus
 from pydantic import BaseModel, ConfigDict
 
+ActionsStrategy = Literal["per_milestone", "batched", "auto"]
+
 
 class RoadmapCreate(BaseModel):
     title: str
@@ -58,6 +61,13 @@ class GenerateRoadmapRequest(BaseModel):
     obstacles: str | None = None
     resources: str | None = None
 
+    # Emit roadmap_milestone events while the planner output is still streaming
+    stream_milestones: bool = False
+    # One-shot /stream only: start each milestone's actions while planning streams
+    pipelined: bool = False
+    # One-shot /stream only (not pipelined); None = ACTIONS_STRATEGY setting
+    actions_strategy: ActionsStrategy | None = None
+
 
 class ModifiedMilestone(BaseModel):
     """User-modified milestone from the review screen."""
@@ -79,3 +89,6 @@ class ResumeRoadmapRequest(BaseModel):
 
     # User modifications from review screen
     modified_milestones: list[ModifiedMilestone] | None = None
+
+    # None = ACTIONS_STRATEGY setting
+    actions_strategy: ActionsStrategy | None = None
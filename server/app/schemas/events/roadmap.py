@@ -62,6 +62,13 @@ class RoadmapSkeletonEvent(BaseModel):
     roadmap_id: str  # DB-persisted roadmap UUID
 
 
+class RoadmapMilestoneEvent(BaseModel):
+    """Event sent as each milestone is parsed from the streaming planner output."""
+
+    index: int  # Position in the skeleton; matches Milestone.order
+    milestone: Milestone  # Provisional ID, replaced by roadmap_skeleton's DB IDs
+
+
 class RoadmapActionsEvent(BaseModel):
     """Event sent when actions are generated."""
 
@@ -69,6 +76,21 @@ class RoadmapActionsEvent(BaseModel):
     actions: list[ActionNode]
 
 
+class MilestoneRef(BaseModel):
+    """Minimal milestone reference for status events."""
+
+    id: str
+    label: str
+
+
+class RoadmapPartialEvent(BaseModel):
+    """Event sent before roadmap_complete when some milestones got no actions."""
+
+    roadmap_id: str
+    missing: list[MilestoneRef]  # Milestones still without actions
+    reason: str  # provider_unavailable (circuit open) | generation_failed
+
+
 class RoadmapCompleteEvent(BaseModel):
     """Event sent when roadmap generation and persistence is complete."""
 
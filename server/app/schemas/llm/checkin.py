@@ -0,0 +1,8 @@
+from app.schemas.api.checkins import NodeUpdate
+from pydantic import BaseModel, Field
+
+
+class CheckInAnalysisResult(BaseModel):
+    """LLM output of the checkin-analysis prompt."""
+
+    updates: list[NodeUpdate] = Field(default_factory=list)
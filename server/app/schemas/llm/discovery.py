@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+
+
+class ExtractedFields(BaseModel):
+    """Blueprint fields the user revealed in their latest message."""
+
+    goal: str | None = None
+    why: str | None = None
+    timeline: str | None = None
+    obstacles: str | None = None
+    resources: str | None = None
+
+
+class AnalysisScores(BaseModel):
+    """Cumulative 0-100 completeness score per blueprint field."""
+
+    goal: int | None = None
+    why: int | None = None
+    timeline: int | None = None
+    obstacles: int | None = None
+    resources: int | None = None
+
+
+class AnalysisUncertainty(BaseModel):
+    """Uncertainty detected in the user's wording."""
+
+    text: str
+    type: str = "general"  # timeline | resources | goal | obstacles | general
+    resolved: bool = False
+
+
+class DiscoveryAnalysisResult(BaseModel):
+    """LLM output of the discovery pre-analysis prompt."""
+
+    extracted: ExtractedFields = Field(default_factory=ExtractedFields)
+    scores: AnalysisScores | None = None
+    missing_fields: list[str] = Field(default_factory=list)
+    tips: list[str] = Field(default_factory=list)
+    uncertainties: list[AnalysisUncertainty] | None = None
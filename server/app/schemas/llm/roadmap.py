@@ -30,3 +30,28 @@ class GoalContent(BaseModel):
     details: str | None = None
     milestones: list[MilestoneContent] = Field(default_factory=list)
     actions: list[ActionContent] = Field(default_factory=list)  # Direct actions
+
+
+class SkeletonResult(BaseModel):
+    """LLM output of the roadmap-planner prompt."""
+
+    goal: GoalContent
+
+
+class ActionsResult(BaseModel):
+    """LLM output of the roadmap-actions prompt."""
+
+    actions: list[ActionContent] = Field(default_factory=list)
+
+
+class MilestoneActions(BaseModel):
+    """Actions for one milestone of a batched roadmap-actions-batch call."""
+
+    index: int  # Position of the milestone in the prompt's list (0-based)
+    actions: list[ActionContent] = Field(default_factory=list)
+
+
+class BatchActionsResult(BaseModel):
+    """LLM output of the roadmap-actions-batch prompt."""
+
+    milestones: list[MilestoneActions] = Field(default_factory=list)
@@ -0,0 +1,96 @@
+"""
+Compiled LangChain runnables, built once per (prompt name, prompt version, model).
+
+Call sites used to rebuild `prompt | llm | parser` on every request. The
+registry builds each pipeline on first use and hands out the same runnable
+afterwards; a new Langfuse prompt version or a different model gets its own
+entry. Entries are dropped whenever the Langfuse prompt cache is reloaded.
+
+Usage:
+    compiled = chain_registry.get("roadmap-actions", prompt, actions_llm, _build)
+    result = await compiled.runnable.ainvoke(variables)
+
+The build callable is part of the key, so several pipelines can share one
+prompt (e.g. the streaming and one-shot planner chains).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from app.services.langfuse import add_prompt_listener, get_prompt_version
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ChainBuilder", "CompiledChain", "ChainRegistry", "chain_registry"]
+
+ChainBuilder = Callable[[ChatPromptTemplate, BaseChatModel], Runnable]
+
+
+@dataclass(frozen=True)
+class CompiledChain:
+    prompt_name: str
+    prompt_version: str
+    model: str
+    runnable: Runnable
+
+
+class ChainRegistry:
+    """Per-process registry of prebuilt runnables."""
+
+    def __init__(self):
+        # key -> (llm the runnable was built with, compiled chain)
+        self._chains: dict[
+            tuple[str, str, str, ChainBuilder], tuple[BaseChatModel, CompiledChain]
+        ] = {}
+        # (prompt_name, build) -> (prompt, llm, compiled): skips version hashing
+        # while the same prompt and model objects are in use
+        self._latest: dict[
+            tuple[str, ChainBuilder],
+            tuple[ChatPromptTemplate, BaseChatModel, CompiledChain],
+        ] = {}
+
+    def get(
+        self,
+        prompt_name: str,
+        prompt: ChatPromptTemplate,
+        llm: BaseChatModel,
+        build: ChainBuilder,
+    ) -> CompiledChain:
+        """Return the prebuilt runnable for this prompt/model, building it once."""
+        latest = self._latest.get((prompt_name, build))
+        if latest and latest[0] is prompt and latest[1] is llm:
+            return latest[2]
+
+        version = get_prompt_version(prompt_name, prompt)
+        model = getattr(llm, "model", "") or type(llm).__name__
+        key = (prompt_name, version, model, build)
+        entry = self._chains.get(key)
+        if entry is not None and entry[0] is llm:
+            compiled = entry[1]
+        else:
+            compiled = CompiledChain(prompt_name, version, model, build(prompt, llm))
+            self._chains[key] = (llm, compiled)
+            logger.info(
+                f"[Chains] Compiled '{prompt_name}' {version} for {model} "
+                f"({build.__name__})"
+            )
+        self._latest[(prompt_name, build)] = (prompt, llm, compiled)
+        return compiled
+
+    def invalidate(self) -> None:
+        """Drop every compiled runnable (prompt cache changed)."""
+        if self._chains:
+            logger.info(f"[Chains] Invalidated {len(self._chains)} compiled chain(s)")
+        self._chains.clear()
+        self._latest.clear()
+
+    def __len__(self) -> int:
+        return len(self._chains)
+
+
+chain_registry = ChainRegistry()
+add_prompt_listener(chain_registry.invalidate)
@@ -4,9 +4,13 @@ from app.core.uow import AsyncUnitOfWork
 from app.models.checkin import CheckIn
 from app.models.node import Node
 from app.schemas.api.checkins import NodeUpdate
-from app.services.gemini import get_llm
+from app.schemas.llm.checkin import CheckInAnalysisResult
+from app.services.chain_registry import chain_registry
+from app.services.gemini import get_llm, structured_llm
 from app.services.langfuse import get_prompt
-from langchain_core.output_parsers import JsonOutputParser
+from app.services.llm_cache import llm_cache
+from app.services.llm_resilience import llm_resilience
+from app.services.llm_scheduler import Priority, llm_scheduler
 from langchain_core.prompts import ChatPromptTemplate
 from sqlalchemy import select
 
@@ -58,6 +62,11 @@ Analyze and return JSON with updates.""",
 )
 
 
+def _checkin_chain(prompt, llm):
+    chain = prompt | structured_llm(llm, CheckInAnalysisResult, "checkin-analysis")
+    return chain.with_config(tags=["checkin_analysis"])
+
+
 async def analyze_checkin(
     roadmap_id: UUID, user_input: str, uow: AsyncUnitOfWork
 ) -> tuple[CheckIn, list[NodeUpdate]]:
@@ -83,46 +92,51 @@ async def analyze_checkin(
             ]
         )
 
-        # Fetch prompt from Langfuse or use fallback
-        prompt = get_prompt("checkin-analysis", fallback=FALLBACK_CHECKIN_PROMPT)
-        llm = get_llm()
+        # Prebuilt chain for the current prompt (Langfuse or fallback)
+        compiled = chain_registry.get(
+            "checkin-analysis",
+            get_prompt("checkin-analysis", fallback=FALLBACK_CHECKIN_PROMPT),
+            get_llm(prompt_name="checkin-analysis"),
+            _checkin_chain,
+        )
+
+        variables = {
+            "user_input": user_input,
+            "node_context": node_context,
+        }
 
-        # Build chain with JSON parser
-        chain = prompt | llm | JsonOutputParser()
-        chain = chain.with_config(tags=["checkin_analysis"])
+        async def attempt():
+            async with llm_scheduler.slot(Priority.STANDARD):
+                return await compiled.runnable.ainvoke(variables)
+
+        async def call() -> CheckInAnalysisResult:
+            raw = await llm_resilience.call(compiled.prompt_name, attempt)
+            return CheckInAnalysisResult.model_validate(raw)
 
         try:
-            result = await chain.ainvoke(
-                {
-                    "user_input": user_input,
-                    "node_context": node_context,
-                }
+            result = await llm_cache.get_or_call(
+                compiled.prompt_name,
+                compiled.prompt_version,
+                compiled.model,
+                variables,
+                call,
+                schema=CheckInAnalysisResult,
             )
-            proposed_updates = result.get("updates", [])
+            update_models = result.updates
         except Exception:
-            proposed_updates = []
+            update_models = []
 
         # Create CheckIn record
         checkin = CheckIn(
             roadmap_id=roadmap_id,
             user_input=user_input,
-            proposed_updates=proposed_updates,
+            proposed_updates=[u.model_dump(mode="json") for u in update_models],
             status="pending",
         )
         uow.session.add(checkin)
         await uow.commit()
         await uow.session.refresh(checkin)
 
-        # Convert to Pydantic models
-        update_models = [
-            NodeUpdate(
-                node_id=UUID(u["node_id"]),
-                progress_delta=u["progress_delta"],
-                log_entry=u["log_entry"],
-            )
-            for u in proposed_updates
-        ]
-
         return checkin, update_models
 
 
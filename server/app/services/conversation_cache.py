@@ -0,0 +1,155 @@
+"""
+Server-side conversation state for delta-only /chat/stream requests.
+
+With `use_server_history`, an authenticated client sends only the new message
+and chat_id. The rolling summary, the recent history (last
+CONVERSATION_HISTORY_WINDOW messages not yet summarized) and the blueprint
+come from this per-process LRU, loaded from the database on
+a miss and kept current by the discovery service as it persists each turn
+(write-through). Entries expire after CONVERSATION_CACHE_TTL_SECONDS, which
+bounds staleness when another worker served a turn of the same chat.
+
+Usage:
+    state = await conversation_cache.get_or_load(chat_id, user_id, load)
+    conversation_cache.append_message(chat_id, "assistant", text)
+
+Metrics:
+- conversation_cache_total{outcome=hit|miss|denied}
+- conversation_cache_entries (gauge)
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.api.chat import BlueprintData
+from app.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ConversationCache", "ConversationState", "conversation_cache"]
+
+
+@dataclass
+class ConversationState:
+    user_id: str
+    # ChatRequest.history shape plus "tokens" and "order" (Message columns)
+    history: deque[dict]
+    blueprint: BlueprintData
+    summary: str | None = None
+    message_count: int = 0  # order of the next message
+
+
+class ConversationCache:
+    """LRU of chat_id -> ConversationState with a fixed TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, history_window: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.history_window = history_window
+        # chat_id -> (expires_at, state)
+        self._entries: OrderedDict[str, tuple[float, ConversationState]] = OrderedDict()
+
+    def state(
+        self,
+        user_id: str,
+        history: list[dict],
+        blueprint: BlueprintData,
+        summary: str | None = None,
+        message_count: int = 0,
+    ) -> ConversationState:
+        """Build a state holding at most the history window."""
+        return ConversationState(
+            user_id,
+            deque(history, maxlen=self.history_window),
+            blueprint,
+            summary,
+            message_count,
+        )
+
+    async def get_or_load(
+        self,
+        chat_id: str,
+        user_id: str,
+        load: Callable[[], Awaitable[ConversationState | None]],
+    ) -> ConversationState | None:
+        """
+        Cached state for the chat, or load() on a miss. None when the chat
+        doesn't exist or belongs to another user.
+        """
+        state = self._get(chat_id)
+        outcome = "hit"
+        if state is None:
+            outcome = "miss"
+            state = await load()
+            if state is not None:
+                self._put(chat_id, state)
+        if state is not None and state.user_id != user_id:
+            state, outcome = None, "denied"
+        metrics.inc("conversation_cache_total", labels={"outcome": outcome})
+        return state
+
+    def append_message(self, chat_id: str, role: str, content: str) -> None:
+        """Record a persisted message (no-op if the chat isn't cached)."""
+        state = self._get(chat_id)
+        if state is not None:
+            state.history.append(
+                {
+                    "role": role,
+                    "content": content,
+                    "tokens": estimate_tokens(content),
+                    "order": state.message_count,
+                }
+            )
+            state.message_count += 1
+
+    def set_blueprint(self, chat_id: str, blueprint: BlueprintData) -> None:
+        state = self._get(chat_id)
+        if state is not None:
+            state.blueprint = blueprint
+
+    def set_summary(self, chat_id: str, summary: str, summarized: int) -> None:
+        """Store the extended summary and drop the messages it now covers."""
+        state = self._get(chat_id)
+        if state is not None:
+            state.summary = summary
+            while state.history and state.history[0]["order"] < summarized:
+                state.history.popleft()
+
+    def invalidate(self, chat_id: str) -> None:
+        self._entries.pop(chat_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, chat_id: str) -> ConversationState | None:
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            return None
+        expires_at, state = entry
+        if expires_at < time.monotonic():
+            del self._entries[chat_id]
+            return None
+        self._entries.move_to_end(chat_id)
+        return state
+
+    def _put(self, chat_id: str, state: ConversationState) -> None:
+        self._entries[chat_id] = (time.monotonic() + self.ttl_seconds, state)
+        self._entries.move_to_end(chat_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+conversation_cache = ConversationCache(
+    max_entries=settings.CONVERSATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CONVERSATION_CACHE_TTL_SECONDS,
+    history_window=settings.CONVERSATION_HISTORY_WINDOW,
+)
+
+metrics.register_gauge(
+    "conversation_cache_entries", lambda: {"": len(conversation_cache)}
+)
@@ -0,0 +1,110 @@
+"""
+Rolling conversation summary for server-side discovery chats.
+
+Once the messages not yet covered by Conversation.summary exceed
+DISCOVERY_HISTORY_TOKEN_BUDGET, the oldest of them are folded into the
+summary by a background discovery-summary call, leaving about half the budget
+(and at least the last exchange) as verbatim history. Prompts then carry the
+summary plus the token-budgeted recent window instead of a fixed message
+count. At most one summarization runs per chat; a failed one is retried on a
+later turn.
+
+Usage:
+    conversation_summarizer.maybe_extend(chat_id, state, user_id)
+
+Metrics:
+- conversation_summary_total{outcome=ok|error}
+- conversation_summary_seconds (histogram)
+- conversation_summary_folded_messages (histogram)
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from app.agents.discovery.history import entry_tokens, to_messages
+from app.agents.discovery.pipeline import summarize_history
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.uow import AsyncUnitOfWork
+from app.services.conversation_cache import ConversationState, conversation_cache
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ConversationSummarizer", "conversation_summarizer", "messages_to_fold"]
+
+# Always kept verbatim: the latest user message and reply
+MIN_RECENT_MESSAGES = 2
+
+
+def messages_to_fold(history: list[dict], budget: int) -> list[dict]:
+    """Oldest history entries to fold into the summary ([] while within budget)."""
+    tokens = [entry_tokens(entry) for entry in history]
+    remaining = sum(tokens)
+    if remaining <= budget:
+        return []
+    count = 0
+    while remaining > budget // 2 and count < len(history) - MIN_RECENT_MESSAGES:
+        remaining -= tokens[count]
+        count += 1
+    return history[:count]
+
+
+class ConversationSummarizer:
+    """Starts background summary updates, one at a time per chat."""
+
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+        # Own unit of work: the task outlives the request that started it
+        self.uow_factory = AsyncUnitOfWork
+        self._running: dict[str, asyncio.Task] = {}
+
+    def maybe_extend(
+        self,
+        chat_id: str,
+        state: ConversationState,
+        user_id: str | None = None,
+    ) -> asyncio.Task | None:
+        """Start a summary update if the unsummarized history is over budget."""
+        if chat_id in self._running:
+            return None
+        fold = messages_to_fold(list(state.history), self.token_budget)
+        if not fold:
+            return None
+        task = asyncio.create_task(self._extend(chat_id, state.summary, fold, user_id))
+        self._running[chat_id] = task
+        task.add_done_callback(lambda _: self._running.pop(chat_id, None))
+        return task
+
+    async def _extend(
+        self,
+        chat_id: str,
+        summary: str | None,
+        fold: list[dict],
+        user_id: str | None,
+    ) -> None:
+        started = time.monotonic()
+        outcome = "ok"
+        try:
+            summary = await summarize_history(
+                summary, to_messages(fold), user_id=user_id
+            )
+            summarized = fold[-1]["order"] + 1
+            async with self.uow_factory() as uow:
+                await uow.conversations.update_summary(
+                    uuid.UUID(chat_id), summary, summarized
+                )
+            conversation_cache.set_summary(chat_id, summary, summarized)
+            metrics.observe("conversation_summary_folded_messages", len(fold))
+            logger.info(f"[Summary] Folded {len(fold)} messages for chat_id={chat_id}")
+        except Exception as e:
+            outcome = "error"
+            logger.warning(f"[Summary] Update failed for chat_id={chat_id}: {e}")
+        metrics.inc("conversation_summary_total", labels={"outcome": outcome})
+        metrics.observe("conversation_summary_seconds", time.monotonic() - started)
+
+
+conversation_summarizer = ConversationSummarizer(
+    token_budget=settings.DISCOVERY_HISTORY_TOKEN_BUDGET
+)
@@ -5,19 +5,51 @@ Flow:
 1. Pre-analyze user message -> update blueprint (knows what's missing)
 2. Stream response using UPDATED blueprint (AI asks the right questions)
 3. Emit blueprint_update event
+
+Response modes (DISCOVERY_RESPONSE_MODE, per request: response_mode):
+- sequential: the response starts once the analysis is done
+- speculative: the response starts alongside the analysis with the missing
+  fields of the current blueprint and is buffered. If the analysis leaves the
+  missing fields unchanged, the buffer is flushed and the stream continues;
+  otherwise the speculative response is cancelled and restarted.
+
+Tokens are coalesced into one token event per SSE_TOKEN_FLUSH_MS /
+SSE_TOKEN_FLUSH_BYTES window (per request: token_flush_ms / token_flush_bytes);
+the first token is sent at once.
+
+With server-side history (use_server_history), prompts carry the rolling
+conversation summary and older turns are folded into it in the background
+(see conversation_summary).
+
+Metrics:
+- discovery_ttft_seconds{mode} (request start -> first token event)
+- discovery_speculation_total{outcome=hit|restart}
+- discovery_token_events (histogram, token events per response)
 """
 
 import logging
+import time
 import uuid
 from typing import AsyncGenerator
 
+from app.agents.discovery.history import to_messages
 from app.agents.discovery.pipeline import analyze_user_message, stream_response
+from app.agents.roadmap.pipeline import generate_skeleton
+from app.core.config import settings
+from app.core.metrics import metrics
 from app.core.uow import AsyncUnitOfWork
 from app.schemas.api.chat import BlueprintData, ChatRequest
 from app.schemas.events.base import ErrorEventData, StatusEventData, TokenEventData
 from app.schemas.events.discovery import BlueprintUpdateEventData
+from app.services.conversation_cache import ConversationState, conversation_cache
+from app.services.conversation_summary import conversation_summarizer
 from app.services.langfuse import get_langfuse_handler
-from langchain_core.messages import AIMessage, HumanMessage
+from app.services.llm_scheduler import Priority
+from app.services.speculation import speculative_skeletons
+from app.utils.async_stream import BufferedStream, coalesce
+from app.utils.roadmap import skeleton_context, skeleton_context_hash
+from app.utils.tokens import estimate_tokens
+from langchain_core.messages import HumanMessage
 
 logger = logging.getLogger(__name__)
 
@@ -41,19 +73,40 @@ class DiscoveryStreamService:
         2. Stream response with UPDATED blueprint (AI knows what to ask)
         3. Emit blueprint_update event
         """
-        # 1. Prepare messages
-        messages = []
-        for msg in request.history:
-            if msg["role"] == "user":
-                messages.append(HumanMessage(content=msg["content"]))
-            else:
-                messages.append(AIMessage(content=msg["content"]))
-        messages.append(HumanMessage(content=request.message))
-
-        # 2. Get or create blueprint
-        blueprint = request.current_blueprint or BlueprintData()
+        started = time.monotonic()
+        mode = request.response_mode or settings.DISCOVERY_RESPONSE_MODE
+        speculative: BufferedStream[str] | None = None
+        state: ConversationState | None = None
 
         try:
+            # 1. History + blueprint: from the request, or kept server-side
+            history = request.history
+            blueprint = request.current_blueprint or BlueprintData()
+            summary = None
+            if request.use_server_history and user_id and request.chat_id:
+                chat_id = request.chat_id
+                state = await conversation_cache.get_or_load(
+                    chat_id, user_id, lambda: self._load_conversation(chat_id)
+                )
+                if state is None:
+                    error_data = ErrorEventData(
+                        code="conversation_not_found",
+                        message="대화를 찾을 수 없습니다.",
+                    )
+                    yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
+                    return
+                history, blueprint = list(state.history), state.blueprint
+                summary = state.summary
+
+            # 2. Prepare messages
+            messages = to_messages(history, summary)
+            messages.append(
+                HumanMessage(
+                    content=request.message,
+                    additional_kwargs={"token_count": estimate_tokens(request.message)},
+                )
+            )
+
             # Setup Langfuse
             effective_user_id = user_id or "anonymous"
             tags = ["authenticated"] if user_id else ["anonymous"]
@@ -71,6 +124,19 @@ class DiscoveryStreamService:
             )
             callbacks = [langfuse_handler] if langfuse_handler else []
 
+            if mode == "speculative":
+                # Overlap the response's time-to-first-token with the analysis
+                speculative_missing = _get_missing_fields(blueprint)
+                speculative = BufferedStream(
+                    stream_response(
+                        messages,
+                        blueprint,
+                        speculative_missing,
+                        callbacks,
+                        user_id=user_id,
+                    )
+                )
+
             # Persist user message
             if user_id and request.chat_id:
                 await self._persist_user_message(request.chat_id, request.message)
@@ -84,6 +150,7 @@ class DiscoveryStreamService:
                 history=history_for_analysis,
                 blueprint=blueprint,
                 callbacks=callbacks,
+                user_id=user_id,
             )
 
             # Emit blueprint update immediately so frontend can show progress
@@ -95,14 +162,57 @@ class DiscoveryStreamService:
             # Determine missing fields from scores
             missing_fields = _get_missing_fields(updated_blueprint)
 
+            # Blueprint is ready: pre-generate the skeleton while the user reads
+            if (
+                settings.SPECULATIVE_SKELETON_ENABLED
+                and not missing_fields
+                and user_id
+                and request.chat_id
+            ):
+                self._speculate_skeleton(request.chat_id, updated_blueprint, user_id)
+
             full_response = ""
             run_id = str(uuid.uuid4())
 
-            async for token in stream_response(
-                messages, updated_blueprint, missing_fields, callbacks
-            ):
+            tokens = None
+            if speculative is not None:
+                hit = missing_fields == speculative_missing
+                metrics.inc(
+                    "discovery_speculation_total",
+                    labels={"outcome": "hit" if hit else "restart"},
+                )
+                if hit:
+                    tokens = speculative
+                else:
+                    await speculative.aclose()
+            if tokens is None:
+                tokens = stream_response(
+                    messages,
+                    updated_blueprint,
+                    missing_fields,
+                    callbacks,
+                    user_id=user_id,
+                )
+
+            flush_ms = request.token_flush_ms
+            if flush_ms is None:
+                flush_ms = settings.SSE_TOKEN_FLUSH_MS
+            flush_bytes = request.token_flush_bytes
+            if flush_bytes is None:
+                flush_bytes = settings.SSE_TOKEN_FLUSH_BYTES
+
+            token_events = 0
+            async for token in coalesce(tokens, flush_ms / 1000, flush_bytes):
+                if not full_response:
+                    metrics.observe(
+                        "discovery_ttft_seconds",
+                        time.monotonic() - started,
+                        {"mode": mode},
+                    )
                 full_response += token
+                token_events += 1
                 yield self._token_event(token, run_id)
+            metrics.observe("discovery_token_events", token_events)
 
             # Persist assistant message
             if user_id and request.chat_id and full_response:
@@ -112,11 +222,17 @@ class DiscoveryStreamService:
                         role="assistant",
                         content=full_response,
                     )
+                conversation_cache.append_message(
+                    request.chat_id, "assistant", full_response
+                )
 
             # Persist blueprint
             if user_id and request.chat_id:
                 await self._persist_blueprint(request.chat_id, updated_blueprint)
 
+            if state is not None and settings.CONVERSATION_SUMMARY_ENABLED:
+                conversation_summarizer.maybe_extend(request.chat_id, state, user_id)
+
         except Exception as e:
             logger.error(f"Stream error: {e}", exc_info=True)
             error_data = ErrorEventData(
@@ -124,6 +240,9 @@ class DiscoveryStreamService:
                 message="시스템 오류가 발생했습니다. 잠시 후 다시 시도해 주세요.",
             )
             yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
+        finally:
+            if speculative is not None:
+                await speculative.aclose()
 
     async def _persist_user_message(self, chat_id: str, message: str) -> None:
         """Persist user message to database."""
@@ -133,6 +252,7 @@ class DiscoveryStreamService:
                 await uow.conversations.append_message(
                     chat_uuid, role="user", content=message
                 )
+            conversation_cache.append_message(chat_id, "user", message)
         except Exception as e:
             logger.error(f"Failed to persist user message: {e}")
 
@@ -143,9 +263,71 @@ class DiscoveryStreamService:
             bp_dict = blueprint.model_dump(exclude_none=True)
             async with self.uow as uow:
                 await uow.conversations.update_blueprint(chat_uuid, bp_dict)
+            conversation_cache.set_blueprint(chat_id, blueprint)
         except Exception as e:
             logger.error(f"Failed to persist blueprint: {e}")
 
+    async def _load_conversation(self, chat_id: str) -> ConversationState | None:
+        """Recent history + blueprint of a chat from the database."""
+        async with self.uow as uow:
+            found = await uow.conversations.get_with_recent_messages(
+                uuid.UUID(chat_id), conversation_cache.history_window
+            )
+        if not found:
+            return None
+        conversation, messages = found
+        blueprint = BlueprintData()
+        if conversation.blueprint:
+            bp = conversation.blueprint
+            blueprint = BlueprintData(
+                goal=bp.goal,
+                why=bp.why,
+                timeline=bp.timeline,
+                obstacles=bp.obstacles,
+                resources=bp.resources,
+                milestones=bp.milestones or [],
+                uncertainties=bp.uncertainties or [],
+                field_scores=bp.field_scores or {},
+            )
+        history = [
+            {
+                "role": m.role,
+                "content": m.content,
+                "tokens": m.token_count,
+                "order": m.order,
+            }
+            for m in messages
+        ]
+        return conversation_cache.state(
+            conversation.user_id,
+            history,
+            blueprint,
+            summary=conversation.summary,
+            message_count=(
+                messages[-1].order + 1 if messages else conversation.summarized_messages
+            ),
+        )
+
+    @staticmethod
+    def _speculate_skeleton(
+        chat_id: str, blueprint: BlueprintData, user_id: str
+    ) -> None:
+        """Start skeleton generation in the background, keyed by blueprint hash."""
+        context = skeleton_context(blueprint)
+        key = skeleton_context_hash(context)
+        if speculative_skeletons.has(chat_id, key):
+            return
+        # Blueprint changed since the last speculation; that result is stale
+        speculative_skeletons.discard(chat_id)
+        speculative_skeletons.start(
+            chat_id,
+            key,
+            lambda: generate_skeleton(
+                context, user_id=user_id, priority=Priority.BACKGROUND
+            ),
+        )
+        logger.info(f"[Discovery] Speculating skeleton for chat_id={chat_id}")
+
     @staticmethod
     def _status_event(node: str) -> str:
         """Create SSE status event."""
@@ -1,21 +1,92 @@
+import logging
+from dataclasses import replace
 from functools import lru_cache
 
 from app.core.config import settings
+from app.services.json_output import with_json_repair
+from app.services.llm_failover import FailoverChatModel, build_failover_llm
+from app.services.llm_key_pool import KeyPoolChatModel, key_pool
+from app.services.model_routing import ModelRoute, resolve_route
+from app.services.token_usage import usage_handler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import Runnable
 from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
 
-@lru_cache()
-def get_llm(model: str = "gemini-3-flash-preview"):
+
+def get_llm(model: str | None = None, prompt_name: str | None = None) -> BaseChatModel:
     """
-    Returns a cached instance of the ChatGoogleGenerativeAI client.
-    Ensures that we don't recreate the client on every request.
+    Returns the chat model routed for `prompt_name` (see app.services.model_routing).
+
+    The route (model, temperature, max output tokens) is resolved on every call,
+    so Langfuse prompt config loaded at startup takes effect; clients are cached
+    per route so we don't recreate them on every request. `model` overrides the
+    routed model.
+
+    prompt_name selects the canned script when LLM_PROVIDER=offline and
+    labels the model's token usage metrics (see app.services.token_usage).
     """
-    return ChatGoogleGenerativeAI(
-        model=model,
-        google_api_key=settings.GEMINI_API_KEY,
-        temperature=0.7,
-        convert_system_message_to_human=True,
-    )
+    route = resolve_route(prompt_name)
+    if model:
+        route = replace(route, model=model)
+    return _build_llm(route, prompt_name)
+
+
+@lru_cache()
+def _build_llm(route: ModelRoute, prompt_name: str | None) -> BaseChatModel:
+    providers = settings.LLM_PROVIDERS
+    models = {name: _build_provider(name, route, prompt_name) for name in providers}
+    llm = models[providers[0]]
+    if len(models) > 1:
+        llm = build_failover_llm(prompt_name or "unknown", models, llm.model)
+    llm.callbacks = [usage_handler(prompt_name or "unknown", llm.model)]
+    return llm
+
+
+def _build_provider(
+    provider: str, route: ModelRoute, prompt_name: str | None
+) -> BaseChatModel:
+    # One client per API key; several keys are spread by the key pool
+    keys = settings.GEMINI_KEY_POOL
+    if provider == "offline":
+        from app.services.offline_llm import build_offline_llm
+
+        clients = [build_offline_llm(prompt_name, i) for i in range(max(1, len(keys)))]
+    else:
+        logger.info(
+            f"[Routing] {prompt_name or 'default'} -> {provider}/{route.model} "
+            f"(temperature={route.temperature}, "
+            f"max_output_tokens={route.max_output_tokens})"
+        )
+        options = {
+            "model": route.model,
+            "temperature": route.temperature,
+            "max_output_tokens": route.max_output_tokens,
+            "convert_system_message_to_human": True,
+        }
+        if provider == "vertex":
+            # Separate endpoint and quota; authenticates with ADC, not API keys
+            return ChatGoogleGenerativeAI(
+                vertexai=True,
+                project=settings.VERTEX_PROJECT,
+                location=settings.VERTEX_LOCATION,
+                **options,
+            )
+        clients = [ChatGoogleGenerativeAI(google_api_key=k, **options) for k in keys]
+
+    if len(clients) == 1:
+        return clients[0]
+    return KeyPoolChatModel(clients=clients, pool=key_pool, model=clients[0].model)
+
+
+def _is_gemini(llm: BaseChatModel) -> bool:
+    if isinstance(llm, KeyPoolChatModel):
+        return any(_is_gemini(client) for client in llm.clients)
+    if isinstance(llm, FailoverChatModel):
+        return any(_is_gemini(model) for model in llm.models)
+    return isinstance(llm, ChatGoogleGenerativeAI)
 
 
 def parse_gemini_output(ai_message):
@@ -26,3 +97,33 @@ def parse_gemini_output(ai_message):
     if isinstance(content, list):
         return "".join([c["text"] for c in content if c.get("type") == "text"])
     return content
+
+
+def structured_llm(
+    llm: BaseChatModel, schema: type[BaseModel], prompt_name: str
+) -> Runnable:
+    """
+    Model that returns a validated `schema` instance.
+
+    With LLM_STRUCTURED_OUTPUT the schema is sent as the native response schema,
+    so the reply is constrained JSON. Either way the reply goes through the local
+    JSON repair stage before validation (see app.services.json_output);
+    prompt_name labels the repair metrics.
+    """
+    text_llm = schema_constrained_llm(llm, schema) | parse_gemini_output
+    return with_json_repair(text_llm, schema, prompt_name)
+
+
+def schema_constrained_llm(llm: BaseChatModel, schema: type[BaseModel]) -> Runnable:
+    """
+    Model that still streams text chunks, but constrained to `schema` JSON.
+
+    For incremental parsing, where with_structured_output would only emit
+    whole objects.
+    """
+    if settings.LLM_STRUCTURED_OUTPUT and _is_gemini(llm):
+        return llm.bind(
+            response_mime_type="application/json",
+            response_json_schema=schema.model_json_schema(),
+        )
+    return llm
@@ -0,0 +1,157 @@
+"""
+Tolerant JSON parsing between the model and the response schema.
+
+A reply is validated as-is first. If that fails, the local repair stage
+(app.utils.json_repair) recovers common defects - prose or code fences around
+the JSON, trailing commas, unescaped quotes, truncated arrays and objects -
+and each candidate is validated in turn. A candidate that kept no content
+(every field at its default, e.g. "{}" after backing off a truncated reply)
+is not a repair. Only output that no repair can save triggers one targeted
+retry: the model gets its broken reply plus the
+validation error and is asked for corrected JSON, instead of regenerating
+from scratch.
+
+Usage:
+    chain = prompt | with_json_repair(llm | parse_gemini_output, Schema, "name")
+
+Metrics (label prompt=<name>):
+- llm_json_parse_total{outcome=clean|repaired|retried|failed}
+- llm_json_repairs_total{repair=<kind>}
+- llm_json_repair_rate (gauge: share of replies that needed local repair)
+"""
+
+import json
+import logging
+from collections import Counter
+from typing import Any, Iterable
+
+from app.core.metrics import metrics
+from app.utils.json_repair import repair_candidates
+from langchain_core.exceptions import OutputParserException
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["parse_json_reply", "with_json_repair"]
+
+_FIX_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "Your previous reply could not be parsed. Return only the corrected "
+            "JSON value, with no prose or code fences, matching this JSON schema:"
+            "\n{schema}",
+        ),
+        ("human", "Previous reply:\n{output}\n\nError:\n{error}"),
+    ]
+)
+
+# prompt -> outcome counts, for the repair-rate gauge
+_outcomes: dict[str, Counter] = {}
+
+
+def _record(prompt_name: str, outcome: str, repairs: Iterable[str] = ()) -> None:
+    _outcomes.setdefault(prompt_name, Counter())[outcome] += 1
+    metrics.inc(
+        "llm_json_parse_total", labels={"prompt": prompt_name, "outcome": outcome}
+    )
+    for repair in repairs:
+        metrics.inc(
+            "llm_json_repairs_total", labels={"prompt": prompt_name, "repair": repair}
+        )
+
+
+def _repair_rates() -> dict[str, float]:
+    return {
+        f"prompt={name}": round(counts["repaired"] / total, 4)
+        for name, counts in _outcomes.items()
+        if (total := sum(counts.values()))
+    }
+
+
+metrics.register_gauge("llm_json_repair_rate", _repair_rates)
+
+
+def _parse(text: str, schema: type[BaseModel]) -> tuple[BaseModel, list[str]]:
+    """Validate text as-is, then each local repair; raise if none fits."""
+    try:
+        return schema.model_validate_json(text), []
+    except ValidationError as e:
+        error = e
+    closest: ValidationError | None = None
+    for value, repairs in repair_candidates(text):
+        try:
+            result = schema.model_validate(value)
+        except ValidationError as e:
+            # Report why the most complete reading was rejected
+            closest = closest or e
+            continue
+        # All-default schemas accept a reading that lost everything
+        if result.model_dump(exclude_defaults=True):
+            return result, repairs
+    error = closest or error
+    raise OutputParserException(
+        f"Failed to parse {schema.__name__} from model output: {error}",
+        llm_output=text,
+    )
+
+
+def parse_json_reply(text: str, schema: type[BaseModel], prompt_name: str) -> BaseModel:
+    """Parse a complete reply (with local repair) and record the outcome."""
+    try:
+        result, repairs = _parse(text, schema)
+    except OutputParserException:
+        _record(prompt_name, "failed")
+        raise
+    _record(prompt_name, "repaired" if repairs else "clean", repairs)
+    return result
+
+
+def with_json_repair(
+    text_llm: Runnable[Any, str], schema: type[BaseModel], prompt_name: str
+) -> Runnable[Any, BaseModel]:
+    """
+    Wrap a model that returns reply text so it returns a validated `schema`.
+
+    Unrecoverable replies get one corrective call to the same model before
+    OutputParserException is raised.
+    """
+    fix_chain = _FIX_PROMPT | text_llm
+    schema_json = json.dumps(schema.model_json_schema(), ensure_ascii=False)
+
+    def _first_pass(text: str) -> BaseModel | dict[str, str]:
+        """Validated result, or the corrective-call variables if unrecoverable."""
+        try:
+            result, repairs = _parse(text, schema)
+        except OutputParserException as e:
+            logger.warning(f"[JSON] Unrecoverable '{prompt_name}' output: {e}")
+            return {"schema": schema_json, "output": text, "error": str(e)}
+        _record(prompt_name, "repaired" if repairs else "clean", repairs)
+        if repairs:
+            logger.info(f"[JSON] Repaired '{prompt_name}' output: {repairs}")
+        return result
+
+    def _second_pass(text: str) -> BaseModel:
+        try:
+            result, repairs = _parse(text, schema)
+        except OutputParserException:
+            _record(prompt_name, "failed")
+            raise
+        _record(prompt_name, "retried", repairs)
+        return result
+
+    def invoke(input: Any, config: RunnableConfig) -> BaseModel:
+        result = _first_pass(text_llm.invoke(input, config))
+        if isinstance(result, BaseModel):
+            return result
+        return _second_pass(fix_chain.invoke(result, config))
+
+    async def ainvoke(input: Any, config: RunnableConfig) -> BaseModel:
+        result = _first_pass(await text_llm.ainvoke(input, config))
+        if isinstance(result, BaseModel):
+            return result
+        return _second_pass(await fix_chain.ainvoke(result, config))
+
+    return RunnableLambda(invoke, afunc=ainvoke, name=f"json_repair:{prompt_name}")
@@ -1,4 +1,6 @@
+import hashlib
 import logging
+from typing import Any, Callable
 
 from app.core.config import settings
 from langchain_core.prompts import ChatPromptTemplate
@@ -42,21 +44,33 @@ if settings.LANGFUSE_PUBLIC_KEY and settings.LANGFUSE_SECRET_KEY:
 
 # Prompt cache: fetched once at startup, reused forever
 _prompt_cache: dict[str, ChatPromptTemplate] = {}
-
-
-def _fetch_prompt(name: str) -> ChatPromptTemplate | None:
-    """Single Langfuse fetch attempt. Returns None on failure."""
+_prompt_versions: dict[str, int] = {}
+# Prompt config from Langfuse (model, temperature, ...), see model_routing
+_prompt_configs: dict[str, dict[str, Any]] = {}
+# Called after the prompt cache is (re)loaded, e.g. to drop compiled chains
+_prompt_listeners: list[Callable[[], None]] = []
+
+
+def _fetch_prompt(
+    name: str,
+) -> tuple[ChatPromptTemplate, int, dict[str, Any]] | None:
+    """
+    Single Langfuse fetch attempt.
+    Returns (prompt, version, config) or None on failure.
+    """
     if not langfuse_client:
         return None
     try:
         prompt_client = langfuse_client.get_prompt(name, type="chat")
         logger.info(f"Loaded prompt '{name}' v{prompt_client.version} from Langfuse")
         prompt = prompt_client.get_langchain_prompt()
+        config = dict(prompt_client.config or {})
 
         if isinstance(prompt, ChatPromptTemplate):
-            return prompt
+            return prompt, prompt_client.version, config
         if isinstance(prompt, list):
-            return ChatPromptTemplate.from_messages(prompt)
+            prompt = ChatPromptTemplate.from_messages(prompt)
+            return prompt, prompt_client.version, config
         logger.warning(f"Unexpected prompt type {type(prompt)} for '{name}'")
     except Exception as e:
         logger.warning(f"Failed to fetch prompt '{name}' from Langfuse: {e}")
@@ -72,11 +86,19 @@ def preload_prompts(prompt_names: list[str]) -> None:
     for name in prompt_names:
         result = _fetch_prompt(name)
         if result:
-            _prompt_cache[name] = result
+            _prompt_cache[name], _prompt_versions[name], _prompt_configs[name] = result
+
+    for listener in _prompt_listeners:
+        listener()
 
     logger.info(f"Preloaded {len(_prompt_cache)}/{len(prompt_names)} prompts from Langfuse")
 
 
+def add_prompt_listener(listener: Callable[[], None]) -> None:
+    """Register a callback run whenever the prompt cache changes."""
+    _prompt_listeners.append(listener)
+
+
 def get_prompt(name: str, fallback: ChatPromptTemplate) -> ChatPromptTemplate:
     """Return cached prompt or fallback. No network calls after startup."""
     if name in _prompt_cache:
@@ -84,3 +106,21 @@ def get_prompt(name: str, fallback: ChatPromptTemplate) -> ChatPromptTemplate:
         return _prompt_cache[name]
     logger.debug(f"Using local fallback prompt for '{name}'")
     return fallback
+
+
+def get_prompt_config(name: str) -> dict[str, Any]:
+    """Config stored with the Langfuse prompt ({} for local fallbacks)."""
+    return _prompt_configs.get(name, {})
+
+
+def get_prompt_version(name: str, prompt: ChatPromptTemplate) -> str:
+    """
+    Version label used in LLM cache keys.
+
+    Langfuse prompts report their version ("v12"); local fallbacks are labelled
+    by a hash of the template so editing a fallback changes the label.
+    """
+    if name in _prompt_versions and _prompt_cache.get(name) is prompt:
+        return f"v{_prompt_versions[name]}"
+    digest = hashlib.sha256(prompt.pretty_repr().encode("utf-8")).hexdigest()
+    return f"local-{digest[:12]}"
@@ -0,0 +1,268 @@
+"""
+Content-addressed LLM response cache.
+
+Identical inputs (client retries, HIL re-runs of unchanged milestones,
+duplicate check-ins) are answered without a provider call. The key is a hash
+of prompt name + prompt version + model + rendered variables, so a new
+Langfuse prompt version or model never serves stale output.
+
+Tiers:
+- In-process LRU with TTL (always on when the cache is enabled)
+- Postgres (llm_cache_entries), shared across workers - LLM_CACHE_POSTGRES_ENABLED;
+  every LLM_CACHE_PURGE_EVERY_WRITES-th write also deletes expired rows
+
+Only prompts listed in LLM_CACHE_PROMPTS are cached. Concurrent misses for
+the same key share a single provider call. Callers pass a cacheable predicate
+to keep empty or degraded answers out of both tiers.
+
+Usage:
+    async def call():
+        async with llm_scheduler.slot(priority, user_id=user_id):
+            return await chain.ainvoke(variables)
+
+    result = await llm_cache.get_or_call(
+        "roadmap-actions", prompt_version, model, variables, call
+    )
+
+Metrics (label prompt=<name>):
+- llm_cache_hits_total{tier=memory|postgres|inflight}
+- llm_cache_misses_total
+- llm_cache_purged_total (expired Postgres rows deleted, no label)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.uow import AsyncUnitOfWork
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["LLMResponseCache", "cache_key", "llm_cache"]
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, BaseMessage):
+        return [obj.type, obj.content]
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def cache_key(
+    prompt_name: str, prompt_version: str, model: str, variables: dict[str, Any]
+) -> str:
+    """Stable hash of everything that determines the model's output."""
+    payload = json.dumps(
+        [prompt_name, prompt_version, model, variables],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=_json_default,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _MemoryTier:
+    """LRU of JSON-encoded responses with a fixed TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, encoded response)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, encoded = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return encoded
+
+    def set(self, key: str, encoded: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, encoded)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _PostgresTier:
+    """Shared tier; failures are logged and treated as misses."""
+
+    def __init__(self, ttl_seconds: int, purge_every: int):
+        self.ttl_seconds = ttl_seconds
+        self.purge_every = purge_every
+        self.uow_factory = AsyncUnitOfWork
+        self._writes = 0
+
+    async def get(self, key: str) -> str | None:
+        try:
+            async with self.uow_factory() as uow:
+                entry = await uow.llm_cache.get_fresh(key)
+                return entry.response if entry else None
+        except Exception as e:
+            logger.warning(f"[LLMCache] Postgres read failed: {e}")
+            return None
+
+    async def set(self, key: str, prompt_name: str, encoded: str) -> None:
+        self._writes += 1
+        # Expired rows are never read again; sampled writes clean them up
+        purge = self.purge_every > 0 and self._writes % self.purge_every == 0
+        try:
+            async with self.uow_factory() as uow:
+                await uow.llm_cache.upsert(key, prompt_name, encoded, self.ttl_seconds)
+                if purge:
+                    purged = await uow.llm_cache.delete_expired()
+                    metrics.inc("llm_cache_purged_total", purged)
+        except Exception as e:
+            logger.warning(f"[LLMCache] Postgres write failed: {e}")
+
+
+class LLMResponseCache:
+    """Two-tier response cache with per-prompt opt-in and single-flight misses."""
+
+    def __init__(
+        self,
+        prompts: list[str],
+        max_entries: int,
+        ttl_seconds: int,
+        enabled: bool = True,
+        shared: bool = False,
+        purge_every: int = 100,
+    ):
+        self.enabled = enabled
+        self.prompts = set(prompts)
+        self._memory = _MemoryTier(max_entries, ttl_seconds)
+        self._shared = _PostgresTier(ttl_seconds, purge_every) if shared else None
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def enabled_for(self, prompt_name: str) -> bool:
+        return self.enabled and prompt_name in self.prompts
+
+    async def get_or_call(
+        self,
+        prompt_name: str,
+        prompt_version: str,
+        model: str,
+        variables: dict[str, Any],
+        call: Callable[[], Awaitable[Any]],
+        schema: type[BaseModel] | None = None,
+        cacheable: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """
+        Return the cached response for these inputs, or await call() and cache
+        its result. Every caller gets its own copy; None and failures are not cached.
+
+        Pass schema when call() returns a Pydantic model so hits are decoded
+        back into that model. Pass cacheable to veto storing a result (e.g. an
+        empty reply): it is returned as-is and the next request calls again.
+        """
+        if not self.enabled_for(prompt_name):
+            return await call()
+
+        key = cache_key(prompt_name, prompt_version, model, variables)
+        labels = {"prompt": prompt_name}
+
+        encoded = await self._lookup(key, labels)
+        if encoded is not None:
+            return self._decode(encoded, schema)
+
+        leader = self._inflight.get(key)
+        if leader is not None:
+            # Same request already in flight: reuse its answer unless it fails
+            await asyncio.wait([leader])
+            if not leader.cancelled():
+                metrics.inc(
+                    "llm_cache_hits_total", labels={**labels, "tier": "inflight"}
+                )
+                return self._decode(leader.result(), schema)
+            return await call()
+
+        metrics.inc("llm_cache_misses_total", labels=labels)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+            if cacheable is not None and not cacheable(result):
+                # Waiting duplicates make their own call rather than share it
+                future.cancel()
+                return result
+            encoded = self._encode(result)
+            if encoded is None:
+                future.cancel()
+                return result
+            future.set_result(encoded)
+            self._memory.set(key, encoded)
+            if self._shared:
+                await self._shared.set(key, prompt_name, encoded)
+            return result
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _lookup(self, key: str, labels: dict[str, str]) -> str | None:
+        encoded = self._memory.get(key)
+        if encoded is not None:
+            metrics.inc("llm_cache_hits_total", labels={**labels, "tier": "memory"})
+            return encoded
+        if self._shared:
+            encoded = await self._shared.get(key)
+            if encoded is not None:
+                self._memory.set(key, encoded)
+                metrics.inc(
+                    "llm_cache_hits_total", labels={**labels, "tier": "postgres"}
+                )
+                return encoded
+        return None
+
+    @staticmethod
+    def _decode(encoded: str, schema: type[BaseModel] | None) -> Any:
+        if schema is not None:
+            return schema.model_validate_json(encoded)
+        return json.loads(encoded)
+
+    @staticmethod
+    def _encode(result: Any) -> str | None:
+        if result is None:
+            return None
+        if isinstance(result, BaseModel):
+            return result.model_dump_json()
+        try:
+            return json.dumps(result, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"[LLMCache] Result not cacheable: {e}")
+            return None
+
+
+llm_cache = LLMResponseCache(
+    prompts=settings.LLM_CACHE_PROMPTS,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    enabled=settings.LLM_CACHE_ENABLED,
+    shared=settings.LLM_CACHE_POSTGRES_ENABLED,
+    purge_every=settings.LLM_CACHE_PURGE_EVERY_WRITES,
+)
+
+metrics.register_gauge("llm_cache_entries", lambda: {"": len(llm_cache)})
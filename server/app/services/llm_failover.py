@@ -0,0 +1,297 @@
+"""
+Provider failover: an ordered chain of LLM providers behind get_llm().
+
+With LLM_PROVIDER_CHAIN set (e.g. ["gemini", "vertex"]), each route gets a
+FailoverChatModel holding one model per provider. Calls go to the first
+healthy provider in chain order. A provider is unhealthy once its rolling
+window (LLM_FAILOVER_WINDOW calls, at least LLM_FAILOVER_MIN_SAMPLES) shows
+- p95 latency above LLM_FAILOVER_P95_SECONDS, or
+- an error rate above LLM_FAILOVER_ERROR_RATE.
+
+Traffic then moves down the chain. Every LLM_FAILOVER_PROBE_SECONDS one call
+is sent back to an unhealthy provider as a probe; if it succeeds within the
+latency threshold the provider's window is reset and traffic returns to it.
+A call that fails with a retryable error is retried once on each remaining
+provider (streams only until the first chunk was sent).
+
+Health is tracked per route (prompt name), since a planner call is expected
+to be slower than an analysis call.
+
+Metrics (labels prompt, provider):
+- llm_provider_calls_total{outcome=ok|error}
+- llm_failover_total{from_provider, to_provider} (switches of the active provider)
+- llm_provider_unhealthy (gauge: 1 while failed over)
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.llm_resilience import is_retryable
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "FailoverChain",
+    "FailoverChatModel",
+    "ProviderHealth",
+    "build_failover_llm",
+]
+
+# prompt name -> chain of the route's current model (for the gauge)
+_chains: dict[str, "FailoverChain"] = {}
+
+
+class ProviderHealth:
+    """Rolling window of (latency, ok) outcomes for one provider."""
+
+    def __init__(self, window: int, min_samples: int):
+        self.min_samples = min_samples
+        self._outcomes: deque[tuple[float, bool]] = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self._outcomes.append((seconds, ok))
+
+    def reset(self) -> None:
+        self._outcomes.clear()
+
+    @property
+    def samples(self) -> int:
+        return len(self._outcomes)
+
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def p95(self) -> float | None:
+        latencies = sorted(seconds for seconds, ok in self._outcomes if ok)
+        if not latencies:
+            return None
+        return latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)]
+
+    def is_healthy(self, p95_threshold: float, error_threshold: float) -> bool:
+        if self.samples < self.min_samples:
+            return True
+        p95 = self.p95()
+        return self.error_rate() <= error_threshold and (
+            p95 is None or p95 <= p95_threshold
+        )
+
+
+class FailoverChain:
+    """Chooses the provider for each call of one route."""
+
+    def __init__(
+        self,
+        prompt_name: str,
+        providers: list[str],
+        p95_threshold: float,
+        error_threshold: float,
+        window: int = 50,
+        min_samples: int = 10,
+        probe_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.prompt_name = prompt_name
+        self.providers = providers
+        self.p95_threshold = p95_threshold
+        self.error_threshold = error_threshold
+        self.probe_seconds = probe_seconds
+        self._clock = clock
+        self.health = [ProviderHealth(window, min_samples) for _ in providers]
+        # Unhealthy providers: when the last probe was sent (or the outage seen)
+        self._last_probe: list[float | None] = [None] * len(providers)
+        self._active = 0
+
+    def is_healthy(self, index: int) -> bool:
+        return self.health[index].is_healthy(self.p95_threshold, self.error_threshold)
+
+    def select(
+        self, exclude: set[int] | frozenset[int] = frozenset()
+    ) -> tuple[int, bool]:
+        """(provider index, is_probe) for the next call."""
+        candidates = [i for i in range(len(self.providers)) if i not in exclude]
+        now = self._clock()
+        for i in candidates:
+            if self.is_healthy(i):
+                self._activate(i)
+                return i, False
+            if self._last_probe[i] is None:
+                self._last_probe[i] = now
+            elif now - self._last_probe[i] >= self.probe_seconds:
+                self._last_probe[i] = now
+                return i, True
+        # Everything degraded: least-failing provider, earliest in the chain
+        index = min(candidates, key=lambda i: self.health[i].error_rate())
+        return index, False
+
+    def record(self, index: int, seconds: float, ok: bool, probe: bool) -> None:
+        labels = {
+            "prompt": self.prompt_name,
+            "provider": self.providers[index],
+            "outcome": "ok" if ok else "error",
+        }
+        metrics.inc("llm_provider_calls_total", labels=labels)
+        if probe and ok and seconds <= self.p95_threshold:
+            logger.info(
+                f"[Failover] '{self.prompt_name}' probe to "
+                f"{self.providers[index]} succeeded in {seconds:.1f}s"
+            )
+            self.health[index].reset()
+            self._last_probe[index] = None
+            return
+        self.health[index].record(seconds, ok)
+
+    def _activate(self, index: int) -> None:
+        if index == self._active:
+            return
+        previous, self._active = self.providers[self._active], index
+        logger.warning(
+            f"[Failover] '{self.prompt_name}' {previous} -> {self.providers[index]}"
+        )
+        metrics.inc(
+            "llm_failover_total",
+            labels={
+                "prompt": self.prompt_name,
+                "from_provider": previous,
+                "to_provider": self.providers[index],
+            },
+        )
+
+    def unhealthy(self) -> dict[str, float]:
+        return {
+            f"prompt={self.prompt_name},provider={name}": float(not self.is_healthy(i))
+            for i, name in enumerate(self.providers)
+        }
+
+
+class FailoverChatModel(BaseChatModel):
+    """Chat model that sends each call to the chain's current provider."""
+
+    models: list[BaseChatModel]
+    chain: FailoverChain
+    model: str = ""
+
+    @property
+    def _llm_type(self) -> str:
+        return "failover"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model, "providers": self.chain.providers}
+
+    def _failed(
+        self, index: int, tried: set[int], exc: Exception, seconds: float, probe: bool
+    ) -> bool:
+        """Record a provider failure; True if the next provider should be tried."""
+        if not is_retryable(exc):
+            return False  # e.g. a bad request: not the provider's health
+        self.chain.record(index, seconds, False, probe)
+        tried.add(index)
+        return len(tried) < len(self.models)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tried: set[int] = set()
+        while True:
+            index, probe = self.chain.select(tried)
+            t0 = time.monotonic()
+            try:
+                result = self.models[index]._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                if not self._failed(index, tried, e, time.monotonic() - t0, probe):
+                    raise
+                continue
+            self.chain.record(index, time.monotonic() - t0, True, probe)
+            return result
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tried: set[int] = set()
+        while True:
+            index, probe = self.chain.select(tried)
+            t0 = time.monotonic()
+            try:
+                result = await self.models[index]._agenerate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                if not self._failed(index, tried, e, time.monotonic() - t0, probe):
+                    raise
+                continue
+            self.chain.record(index, time.monotonic() - t0, True, probe)
+            return result
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        tried: set[int] = set()
+        while True:
+            index, probe = self.chain.select(tried)
+            t0 = time.monotonic()
+            started = False
+            try:
+                async for chunk in self.models[index]._astream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                seconds = time.monotonic() - t0
+                # Tokens already sent can't be replayed from another provider
+                if not self._failed(index, tried, e, seconds, probe) or started:
+                    raise
+                continue
+            self.chain.record(index, time.monotonic() - t0, True, probe)
+            return
+
+
+def build_failover_llm(
+    prompt_name: str, models: dict[str, BaseChatModel], model: str = ""
+) -> FailoverChatModel:
+    """Wrap one model per provider (in chain order) with settings' thresholds."""
+    chain = FailoverChain(
+        prompt_name,
+        list(models),
+        p95_threshold=settings.LLM_FAILOVER_P95_SECONDS,
+        error_threshold=settings.LLM_FAILOVER_ERROR_RATE,
+        window=settings.LLM_FAILOVER_WINDOW,
+        min_samples=settings.LLM_FAILOVER_MIN_SAMPLES,
+        probe_seconds=settings.LLM_FAILOVER_PROBE_SECONDS,
+    )
+    _chains[prompt_name] = chain
+    return FailoverChatModel(models=list(models.values()), chain=chain, model=model)
+
+
+def _unhealthy() -> dict[str, float]:
+    values: dict[str, float] = {}
+    for chain in _chains.values():
+        values.update(chain.unhealthy())
+    return values
+
+
+metrics.register_gauge("llm_provider_unhealthy", _unhealthy)
@@ -0,0 +1,165 @@
+"""
+Hedged LLM requests for the roadmap action fan-out.
+
+Roadmap actions finish when the slowest of N parallel calls does, so the
+provider's tail latency dominates. With LLM_HEDGING_ENABLED, a call that has
+not returned by the LLM_HEDGE_PERCENTILE latency of its prompt gets a
+duplicate; whichever finishes first wins and the other is cancelled.
+
+run() wraps the provider call itself, inside the scheduler slot: the deadline
+clock starts once the call holds a slot, and llm_call_seconds measures
+provider latency only (no queue wait, no retry backoff). Cancelled and failed
+attempts are recorded at their elapsed time, so hedging does not hide the
+tail it cuts off and shrink its own deadline. A call still queued for a slot
+is never hedged. The duplicate needs a spare slot right away (spare_slot);
+when the scheduler is saturated the primary just continues.
+
+Extra calls are capped at LLM_HEDGE_BUDGET_RATIO of recent calls. Until
+LLM_HEDGE_MIN_SAMPLES latencies are known, LLM_HEDGE_DEFAULT_DELAY_SECONDS is
+used as the deadline.
+
+Usage:
+    async with llm_scheduler.slot(priority, user_id=user_id):
+        result = await llm_hedger.run(
+            "roadmap-actions",
+            invoke,
+            input_tokens=n,
+            spare_slot=lambda: llm_scheduler.try_acquire(user_id),
+            release_slot=lambda: llm_scheduler.release(user_id),
+        )
+
+Metrics (label prompt=<name>):
+- llm_call_seconds (histogram, provider latency; feeds the deadline)
+- llm_hedges_total / llm_hedge_wins_total
+- llm_hedge_budget_exhausted_total
+- llm_hedge_no_capacity_total (deadline missed, no spare scheduler slot)
+- llm_hedge_extra_tokens_total (estimated tokens spent on duplicates)
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["LLMHedger", "llm_hedger"]
+
+T = TypeVar("T")
+
+
+class LLMHedger:
+    """Percentile-deadline hedging with a rolling budget on duplicate calls."""
+
+    def __init__(
+        self,
+        percentile: float,
+        min_samples: int,
+        default_delay: float,
+        budget_ratio: float,
+        budget_window: int = 200,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.budget_ratio = budget_ratio
+        # True for each recent call that was hedged
+        self._recent: deque[bool] = deque(maxlen=budget_window)
+
+    def deadline(self, prompt_name: str) -> float:
+        """Seconds to wait for the primary call before hedging."""
+        hist = metrics.histogram("llm_call_seconds", {"prompt": prompt_name})
+        if hist.count < self.min_samples:
+            return self.default_delay
+        return hist.percentile(self.percentile) or self.default_delay
+
+    def _within_budget(self) -> bool:
+        hedged = sum(self._recent)
+        return hedged < max(1.0, self.budget_ratio * len(self._recent))
+
+    async def run(
+        self,
+        prompt_name: str,
+        fn: Callable[[], Awaitable[T]],
+        input_tokens: int = 0,
+        spare_slot: Callable[[], bool] | None = None,
+        release_slot: Callable[[], None] | None = None,
+    ) -> T:
+        """
+        Await fn() (a started provider call), racing a duplicate if it misses
+        the deadline. spare_slot() must grant the duplicate a scheduler slot
+        without waiting, or no duplicate is sent; release_slot() returns it.
+        """
+        labels = {"prompt": prompt_name}
+        tasks = [asyncio.create_task(self._timed(prompt_name, fn))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.deadline(prompt_name))
+            if done or not self._within_budget():
+                if not done:
+                    metrics.inc("llm_hedge_budget_exhausted_total", labels=labels)
+                self._recent.append(False)
+                return await tasks[0]
+            if spare_slot is not None and not spare_slot():
+                # Saturated scheduler: a duplicate would only queue and add load
+                metrics.inc("llm_hedge_no_capacity_total", labels=labels)
+                self._recent.append(False)
+                return await tasks[0]
+
+            self._recent.append(True)
+            metrics.inc("llm_hedges_total", labels=labels)
+            logger.info(f"[Hedge] '{prompt_name}' missed its deadline; hedging")
+            hedge = asyncio.create_task(self._timed(prompt_name, fn))
+            if release_slot is not None:
+                # Also runs if the hedge is cancelled before it starts
+                hedge.add_done_callback(lambda _: release_slot())
+            tasks.append(hedge)
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # A failed copy only loses if the other can still succeed
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is None:
+                    if pending:
+                        continue
+                    return done.pop().result()
+                if winner is tasks[1]:
+                    metrics.inc("llm_hedge_wins_total", labels=labels)
+                metrics.inc(
+                    "llm_hedge_extra_tokens_total",
+                    input_tokens + estimate_tokens(winner.result()),
+                    labels=labels,
+                )
+                return winner.result()
+        finally:
+            # Loser (or both, if the caller was cancelled)
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    async def _timed(prompt_name: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        t0 = time.monotonic()
+        try:
+            return await fn()
+        finally:
+            # Cancelled losers are the slow tail; skipping them drags p95 down
+            metrics.observe(
+                "llm_call_seconds",
+                time.monotonic() - t0,
+                labels={"prompt": prompt_name},
+            )
+
+
+llm_hedger = LLMHedger(
+    percentile=settings.LLM_HEDGE_PERCENTILE,
+    min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+    default_delay=settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS,
+    budget_ratio=settings.LLM_HEDGE_BUDGET_RATIO,
+)
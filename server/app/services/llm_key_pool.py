@@ -0,0 +1,200 @@
+"""
+API key pool: one client per key, with calls spread across keys.
+
+Per-key rate limits cap throughput when every call goes through one key. With
+GEMINI_API_KEYS set, get_llm() returns a KeyPoolChatModel that holds a client
+per key and picks one per call (LLM_KEY_POOL_STRATEGY):
+- round_robin: rotate through the keys
+- least_loaded: fewest calls in flight, ties broken in rotation order
+
+A key that answers 429 cools down for LLM_KEY_COOLDOWN_SECONDS and the call
+moves on to the next key; only when every key was rate limited does the 429
+reach the caller (and the retry policy in llm_resilience). If all keys are
+cooling down, the one whose cooldown ends first is used anyway.
+
+The pool state is shared by every route, since quotas belong to the key.
+
+Metrics (label key=key-<index>, never the key itself):
+- llm_key_calls_total
+- llm_key_rate_limited_total
+- llm_key_in_flight (gauge)
+- llm_key_cooling_down (gauge: 1 while cooling down)
+"""
+
+import logging
+import time
+from typing import Any, AsyncIterator, Callable
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.llm_resilience import is_rate_limited
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["KeyPool", "KeyPoolChatModel", "key_pool"]
+
+
+class KeyPool:
+    """In-flight counts and 429 cooldowns per key index."""
+
+    def __init__(
+        self,
+        size: int,
+        strategy: str = "round_robin",
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.size = max(1, size)
+        self.strategy = strategy
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._in_flight = [0] * self.size
+        self._cooldown_until = [0.0] * self.size
+        self._next = 0
+
+    def label(self, index: int) -> str:
+        return f"key-{index}"
+
+    def is_cooling_down(self, index: int) -> bool:
+        return self._cooldown_until[index] > self._clock()
+
+    def acquire(self, exclude: set[int] | frozenset[int] = frozenset()) -> int:
+        """Pick a key for one call (skipping `exclude`) and mark it in flight."""
+        # Rotation order starting at the round-robin cursor
+        order = [(self._next + i) % self.size for i in range(self.size)]
+        order = [i for i in order if i not in exclude] or order
+        ready = [i for i in order if not self.is_cooling_down(i)]
+        if not ready:
+            index = min(order, key=lambda i: self._cooldown_until[i])
+        elif self.strategy == "least_loaded":
+            index = min(ready, key=lambda i: self._in_flight[i])
+        else:
+            index = ready[0]
+
+        self._next = (index + 1) % self.size
+        self._in_flight[index] += 1
+        metrics.inc("llm_key_calls_total", labels={"key": self.label(index)})
+        return index
+
+    def release(self, index: int) -> None:
+        self._in_flight[index] -= 1
+
+    def cool_down(self, index: int, seconds: float | None = None) -> None:
+        """Skip this key for a while after it was rate limited."""
+        seconds = self.cooldown_seconds if seconds is None else seconds
+        self._cooldown_until[index] = self._clock() + seconds
+        metrics.inc("llm_key_rate_limited_total", labels={"key": self.label(index)})
+        logger.warning(
+            f"[KeyPool] {self.label(index)} rate limited, cooling down {seconds:.0f}s"
+        )
+
+    def in_flight(self) -> dict[str, float]:
+        return {f"key={self.label(i)}": n for i, n in enumerate(self._in_flight)}
+
+    def cooling_down(self) -> dict[str, float]:
+        return {
+            f"key={self.label(i)}": float(self.is_cooling_down(i))
+            for i in range(self.size)
+        }
+
+
+class KeyPoolChatModel(BaseChatModel):
+    """Chat model that sends each call to one client of the pool."""
+
+    clients: list[BaseChatModel]
+    pool: KeyPool
+    model: str = ""
+
+    @property
+    def _llm_type(self) -> str:
+        return "key-pool"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model, "keys": len(self.clients)}
+
+    def _rate_limited(self, index: int, tried: set[int], exc: Exception) -> bool:
+        """Cool the key down; True if another key should be tried."""
+        if not is_rate_limited(exc):
+            return False
+        self.pool.cool_down(index)
+        tried.add(index)
+        return len(tried) < len(self.clients)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tried: set[int] = set()
+        while True:
+            index = self.pool.acquire(tried)
+            try:
+                return self.clients[index]._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                if not self._rate_limited(index, tried, e):
+                    raise
+            finally:
+                self.pool.release(index)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tried: set[int] = set()
+        while True:
+            index = self.pool.acquire(tried)
+            try:
+                return await self.clients[index]._agenerate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                if not self._rate_limited(index, tried, e):
+                    raise
+            finally:
+                self.pool.release(index)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        tried: set[int] = set()
+        while True:
+            index = self.pool.acquire(tried)
+            started = False
+            try:
+                async for chunk in self.clients[index]._astream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                # Tokens already sent can't be replayed from another key
+                if not self._rate_limited(index, tried, e) or started:
+                    raise
+            finally:
+                self.pool.release(index)
+
+
+key_pool = KeyPool(
+    len(settings.GEMINI_KEY_POOL),
+    strategy=settings.LLM_KEY_POOL_STRATEGY,
+    cooldown_seconds=settings.LLM_KEY_COOLDOWN_SECONDS,
+)
+
+metrics.register_gauge("llm_key_in_flight", lambda: key_pool.in_flight())
+metrics.register_gauge("llm_key_cooling_down", lambda: key_pool.cooling_down())
@@ -0,0 +1,229 @@
+"""
+Retry and circuit-breaker policy shared by every LLM invocation.
+
+- Retryable provider errors (429, 5xx, timeouts, connection resets) are
+  retried with full-jitter exponential backoff, up to LLM_RETRY_MAX_ATTEMPTS.
+  Other failures (bad requests, unparseable output) are raised immediately.
+- One process-wide circuit breaker counts consecutive provider failures. After
+  LLM_BREAKER_FAILURE_THRESHOLD it opens and calls fail fast with
+  CircuitOpenError instead of each waiting for its own timeout; after
+  LLM_BREAKER_RESET_SECONDS a single probe call decides whether it closes.
+
+Usage:
+    async def attempt():
+        async with llm_scheduler.slot(priority, user_id=user_id):
+            return await chain.ainvoke(variables)
+
+    result = await llm_resilience.call("roadmap-actions", attempt)
+
+    # Streams can't be replayed once tokens were sent; only guard them
+    async with llm_resilience.guard("discovery-chat"):
+        async for chunk in chain.astream(variables): ...
+
+Metrics (label prompt=<name>):
+- llm_retries_total
+- llm_breaker_rejected_total
+- llm_breaker_transitions_total{state=open|half_open|closed}
+- llm_breaker_state (gauge: 0 closed, 1 half-open, 2 open)
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "LLMResilience",
+    "is_rate_limited",
+    "is_retryable",
+    "llm_resilience",
+]
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while the breaker is open."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    True for transient provider failures. Walks the exception chain, since
+    langchain-google-genai re-raises SDK errors (which carry the HTTP code).
+    """
+    seen = 0
+    while exc is not None and seen < 5:
+        if isinstance(exc, CircuitOpenError):
+            return False
+        if isinstance(exc, (TimeoutError, ConnectionError)):
+            return True
+        if getattr(exc, "retryable", False):
+            return True
+        code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+        if isinstance(code, int) and code in RETRYABLE_STATUS:
+            return True
+        exc = exc.__cause__ or exc.__context__
+        seen += 1
+    return False
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True when the provider rejected the call for quota (HTTP 429)."""
+    seen = 0
+    while exc is not None and seen < 5:
+        code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+        if code == 429 or type(exc).__name__ == "ResourceExhausted":
+            return True
+        exc = exc.__cause__ or exc.__context__
+        seen += 1
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open -> closed."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def before_call(self) -> bool:
+        """
+        Admit a call or raise CircuitOpenError. Returns True when the call is
+        the half-open probe.
+        """
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                raise CircuitOpenError("LLM provider circuit is open")
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                raise CircuitOpenError("LLM provider circuit is half-open")
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self, probe: bool = False) -> None:
+        if probe:
+            self._probe_in_flight = False
+        self._failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self, probe: bool = False) -> None:
+        if probe:
+            self._probe_in_flight = False
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != OPEN:
+                self._transition(OPEN)
+
+    def release(self, probe: bool) -> None:
+        """Call ended without a provider verdict (e.g. bad request, cancelled)."""
+        if probe:
+            self._probe_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        logger.warning(f"[LLMBreaker] {self.state} -> {state}")
+        self.state = state
+        metrics.inc("llm_breaker_transitions_total", labels={"state": state})
+
+
+class LLMResilience:
+    """Retry policy + shared breaker applied around provider calls."""
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        breaker: CircuitBreaker,
+        rng: random.Random | None = None,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return self._rng.uniform(0, ceiling)
+
+    async def call(self, prompt_name: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn() with retries; fails fast while the breaker is open."""
+        labels = {"prompt": prompt_name}
+        attempt = 1
+        while True:
+            try:
+                async with self.guard(prompt_name):
+                    return await fn()
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_attempts:
+                    raise
+                error = e
+            delay = self.backoff(attempt)
+            metrics.inc("llm_retries_total", labels=labels)
+            logger.warning(
+                f"[LLMRetry] '{prompt_name}' attempt {attempt} failed ({error}); "
+                f"retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @asynccontextmanager
+    async def guard(self, prompt_name: str) -> AsyncIterator[None]:
+        """Breaker admission + outcome recording for one provider call."""
+        try:
+            probe = self.breaker.before_call()
+        except CircuitOpenError:
+            metrics.inc("llm_breaker_rejected_total", labels={"prompt": prompt_name})
+            raise
+        try:
+            yield
+        except BaseException as e:
+            if isinstance(e, Exception) and is_retryable(e):
+                self.breaker.record_failure(probe)
+            else:
+                self.breaker.release(probe)
+            raise
+        self.breaker.record_success(probe)
+
+
+llm_resilience = LLMResilience(
+    max_attempts=settings.LLM_RETRY_MAX_ATTEMPTS,
+    base_delay=settings.LLM_RETRY_BASE_DELAY_SECONDS,
+    max_delay=settings.LLM_RETRY_MAX_DELAY_SECONDS,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+    ),
+)
+
+metrics.register_gauge(
+    "llm_breaker_state",
+    lambda: {"": _STATE_VALUES[llm_resilience.breaker.state]},
+)
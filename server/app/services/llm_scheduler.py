@@ -0,0 +1,228 @@
+"""
+Process-wide LLM concurrency scheduler.
+
+Every chain invocation acquires a slot before calling the provider:
+- Global in-flight cap (LLM_MAX_IN_FLIGHT) protects provider rate limits
+- Per-user cap (LLM_MAX_IN_FLIGHT_PER_USER) stops one user's fan-out starving others
+- Priority classes: queued interactive discovery calls are granted before
+  roadmap generation, which goes before background/bulk work
+- promote(): when a user starts waiting on background work (a claimed
+  speculative task), its queued and later requests move to the user's class
+
+Usage:
+    async with llm_scheduler.slot(Priority.INTERACTIVE, user_id=user_id):
+        result = await chain.ainvoke(...)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["LLMScheduler", "Priority", "current_llm_user", "llm_scheduler"]
+
+# User the slot held in this context belongs to (read by token accounting)
+current_llm_user: ContextVar[str | None] = ContextVar("current_llm_user", default=None)
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+
+    INTERACTIVE = 0  # discovery chat tokens / pre-analysis
+    STANDARD = 1  # user-initiated roadmap generation, check-ins
+    BACKGROUND = 2  # speculative / prefetch work
+    BULK = 3  # batch jobs, scripts
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    user_id: str | None = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    task: asyncio.Task | None = field(compare=False, default=None)
+
+
+class LLMScheduler:
+    """Async admission control with priority queueing."""
+
+    def __init__(self, max_in_flight: int, max_per_user: int):
+        self.max_in_flight = max_in_flight
+        self.max_per_user = max_per_user
+        self._in_flight = 0
+        self._per_user: dict[str, int] = {}
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        # task -> priority its requests were promoted to
+        self._promoted: weakref.WeakKeyDictionary[asyncio.Task, Priority] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Priority = Priority.STANDARD,
+        user_id: str | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold one in-flight slot for the duration of the block."""
+        await self.acquire(priority, user_id)
+        previous_user = current_llm_user.get()
+        current_llm_user.set(user_id)
+        try:
+            yield
+        finally:
+            # set() rather than reset(): streaming generators may exit in
+            # another context than they entered
+            current_llm_user.set(previous_user)
+            self.release(user_id)
+
+    async def acquire(
+        self, priority: Priority = Priority.STANDARD, user_id: str | None = None
+    ) -> None:
+        task = asyncio.current_task()
+        priority = min(priority, self._promoted.get(task, priority))
+        labels = {"priority": priority.name.lower()}
+        t0 = time.monotonic()
+
+        if not self._queue and self._has_capacity(user_id):
+            self._grant(user_id)
+            metrics.observe("llm_scheduler_wait_seconds", 0.0, labels)
+            return
+
+        waiter = _Waiter(
+            priority=int(priority),
+            seq=next(self._seq),
+            user_id=user_id,
+            future=asyncio.get_running_loop().create_future(),
+            task=task,
+        )
+        heapq.heappush(self._queue, waiter)
+        # A queued waiter may still be admissible (e.g. blocked only by another user)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted at the same moment we were cancelled: give it back
+                self.release(user_id)
+            else:
+                self._remove(waiter)
+            raise
+
+        metrics.observe("llm_scheduler_wait_seconds", time.monotonic() - t0, labels)
+
+    def try_acquire(self, user_id: str | None = None) -> bool:
+        """Take a slot only if one is free and nobody is queued; never waits."""
+        if self._queue or not self._has_capacity(user_id):
+            return False
+        self._grant(user_id)
+        return True
+
+    def release(self, user_id: str | None = None) -> None:
+        self._in_flight -= 1
+        if user_id is not None:
+            remaining = self._per_user.get(user_id, 1) - 1
+            if remaining > 0:
+                self._per_user[user_id] = remaining
+            else:
+                self._per_user.pop(user_id, None)
+        self._dispatch()
+
+    def promote(self, task: asyncio.Task, priority: Priority) -> None:
+        """
+        Serve task's slot requests at priority from now on: requests already
+        queued move up, later ones (retries) are made at that priority.
+        """
+        if task.done():
+            return
+        if self._promoted.get(task, priority) < priority:
+            return
+        self._promoted[task] = priority
+        moved = False
+        for waiter in self._queue:
+            if waiter.task is task and waiter.priority > priority:
+                waiter.priority = int(priority)
+                moved = True
+        if moved:
+            heapq.heapify(self._queue)
+            metrics.inc("llm_scheduler_promoted_total")
+            self._dispatch()
+
+    def queue_depth(self) -> dict[str, int]:
+        depth = {p.name.lower(): 0 for p in Priority}
+        for w in self._queue:
+            if not w.future.done():
+                depth[Priority(w.priority).name.lower()] += 1
+        return depth
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _has_capacity(self, user_id: str | None) -> bool:
+        if self._in_flight >= self.max_in_flight:
+            return False
+        if user_id is not None and self._per_user.get(user_id, 0) >= self.max_per_user:
+            return False
+        return True
+
+    def _grant(self, user_id: str | None) -> None:
+        self._in_flight += 1
+        if user_id is not None:
+            self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        metrics.inc("llm_scheduler_granted_total")
+
+    def _dispatch(self) -> None:
+        """Grant queued waiters in priority order while capacity remains."""
+        if not self._queue:
+            return
+        deferred: list[_Waiter] = []
+        while self._queue and self._in_flight < self.max_in_flight:
+            waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue
+            if self._has_capacity(waiter.user_id):
+                self._grant(waiter.user_id)
+                waiter.future.set_result(None)
+            else:
+                # Per-user cap reached; keep its place without blocking others
+                deferred.append(waiter)
+        for waiter in deferred:
+            heapq.heappush(self._queue, waiter)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        try:
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+        except ValueError:
+            pass
+
+
+llm_scheduler = LLMScheduler(
+    max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+    max_per_user=settings.LLM_MAX_IN_FLIGHT_PER_USER,
+)
+
+metrics.register_gauge("llm_scheduler_queue_depth", llm_scheduler.queue_depth)
+metrics.register_gauge("llm_scheduler_in_flight", lambda: {"": llm_scheduler.in_flight})
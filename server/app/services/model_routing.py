@@ -0,0 +1,84 @@
+"""
+Per-prompt model routing: which model, temperature and output budget serve
+each pipeline stage.
+
+Routes are resolved per call from three layers (later wins):
+1. DEFAULT_ROUTES below - cheap/fast models for the extraction-style prompts
+   (discovery-analysis, discovery-summary, checkin-analysis), a stronger
+   model for planning
+2. settings.LLM_MODEL_ROUTES (env JSON, per prompt, partial overrides allowed)
+3. the Langfuse prompt config (`model`, `temperature`, `max_output_tokens`
+   or `max_tokens`), so routes can be tuned from the Langfuse UI
+
+Latency per route is recorded as llm_stage_seconds{stage, model} by the
+token usage handler (see app.services.token_usage).
+"""
+
+import logging
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+from app.core.config import settings
+from app.services.langfuse import get_prompt_config
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ModelRoute", "DEFAULT_MODEL", "DEFAULT_ROUTES", "resolve_route"]
+
+DEFAULT_MODEL = "gemini-3-flash-preview"
+FAST_MODEL = "gemini-2.5-flash-lite"
+STRONG_MODEL = "gemini-3-pro-preview"
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    model: str = DEFAULT_MODEL
+    temperature: float = 0.7
+    max_output_tokens: int | None = None
+
+    def as_config(self) -> dict[str, Any]:
+        """Langfuse prompt config form (see scripts/sync_prompts.py)."""
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+DEFAULT_ROUTES: dict[str, ModelRoute] = {
+    "discovery-chat": ModelRoute(DEFAULT_MODEL, 0.7, 2048),
+    "discovery-analysis": ModelRoute(FAST_MODEL, 0.0, 2048),
+    "discovery-summary": ModelRoute(FAST_MODEL, 0.2, 512),
+    "roadmap-planner": ModelRoute(STRONG_MODEL, 0.3, 8192),
+    "roadmap-actions": ModelRoute(DEFAULT_MODEL, 0.3, 4096),
+    "roadmap-actions-batch": ModelRoute(DEFAULT_MODEL, 0.3, 8192),
+    "checkin-analysis": ModelRoute(FAST_MODEL, 0.0, 2048),
+}
+
+_ROUTE_KEYS = {"model": str, "temperature": float, "max_output_tokens": int}
+
+
+def _overrides(config: dict[str, Any], source: str) -> dict[str, Any]:
+    config = dict(config)
+    if "max_output_tokens" not in config and "max_tokens" in config:
+        config["max_output_tokens"] = config["max_tokens"]
+
+    overrides = {}
+    for key, cast in _ROUTE_KEYS.items():
+        if config.get(key) is None:
+            continue
+        try:
+            overrides[key] = cast(config[key])
+        except (TypeError, ValueError):
+            logger.warning(f"[Routing] Ignoring {source} {key}={config[key]!r}")
+    return overrides
+
+
+def resolve_route(prompt_name: str | None) -> ModelRoute:
+    """Current route for a prompt name (unknown prompts get the default route)."""
+    route = DEFAULT_ROUTES.get(prompt_name or "", ModelRoute())
+    if not prompt_name:
+        return route
+    env = settings.LLM_MODEL_ROUTES.get(prompt_name)
+    if env:
+        route = replace(route, **_overrides(env, "LLM_MODEL_ROUTES"))
+    langfuse = get_prompt_config(prompt_name)
+    if langfuse:
+        route = replace(route, **_overrides(langfuse, "Langfuse config"))
+    return route
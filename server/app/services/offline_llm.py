@@ -0,0 +1,284 @@
+"""
+Offline scripted chat model for load and latency testing.
+
+Selected with LLM_PROVIDER=offline. Replies with canned output per prompt name,
+simulating time-to-first-token, per-token delay and random failures so the
+full SSE stack can be benchmarked without spending Gemini quota.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
+
+from app.core.config import settings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field, PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DEFAULT_SCRIPTS",
+    "ScriptedChatModel",
+    "ScriptedLLMError",
+    "build_offline_llm",
+    "load_scripts",
+]
+
+# Canned responses keyed by Langfuse prompt name
+DEFAULT_SCRIPTS: dict[str, Any] = {
+    "discovery-analysis": {
+        "extracted": {
+            "goal": "Run a half marathon",
+            "why": None,
+            "timeline": "6 months",
+            "obstacles": None,
+            "resources": None,
+        },
+        "scores": {
+            "goal": 70,
+            "why": 20,
+            "timeline": 65,
+            "obstacles": 10,
+            "resources": 10,
+        },
+        "missing_fields": ["why", "obstacles", "resources"],
+        "tips": ["Explain why this goal matters to you."],
+        "uncertainties": [
+            {
+                "text": "주당 훈련 가능 시간이 불확실함",
+                "type": "resources",
+                "resolved": False,
+            }
+        ],
+    },
+    "discovery-chat": (
+        "좋아요, 6개월 안에 하프 마라톤 완주라는 목표가 분명하네요. "
+        "이 목표가 당신에게 왜 중요한지 조금 더 들려주실 수 있을까요?"
+    ),
+    "discovery-summary": (
+        "사용자는 6개월 안에 하프 마라톤 완주를 목표로 한다. "
+        "주당 훈련 가능 시간은 아직 정해지지 않았다."
+    ),
+    "roadmap-planner": {
+        "goal": {
+            "label": "Run a half marathon",
+            "details": "Finish a half marathon within six months",
+            "milestones": [
+                {
+                    "label": "Build an aerobic base",
+                    "details": "Run easy three times a week",
+                    "is_assumed": False,
+                    "start_date": "2026-01-01",
+                    "end_date": "2026-02-15",
+                    "completion_criteria": "Run 5km without stopping",
+                },
+                {
+                    "label": "Increase long-run distance",
+                    "details": "Extend the weekly long run gradually",
+                    "is_assumed": False,
+                    "start_date": "2026-02-16",
+                    "end_date": "2026-04-15",
+                    "completion_criteria": "Complete a 15km long run",
+                },
+                {
+                    "label": "Race preparation",
+                    "details": "Taper and rehearse race-day logistics",
+                    "is_assumed": True,
+                    "start_date": "2026-04-16",
+                    "end_date": "2026-06-30",
+                    "completion_criteria": "Finish the half marathon",
+                },
+            ],
+            "actions": [
+                {
+                    "label": "Log every run",
+                    "details": "Track distance and pace in a training log",
+                    "is_assumed": False,
+                }
+            ],
+        }
+    },
+    "roadmap-actions": {
+        "actions": [
+            {
+                "label": "Schedule sessions",
+                "details": "Block training time in the calendar",
+                "is_assumed": False,
+            },
+            {
+                "label": "Prepare gear",
+                "details": "Get proper running shoes",
+                "is_assumed": False,
+            },
+            {
+                "label": "Review progress",
+                "details": "Check weekly mileage every Sunday",
+                "is_assumed": True,
+            },
+        ]
+    },
+    "roadmap-actions-batch": {
+        "milestones": [
+            {
+                "index": index,
+                "actions": [
+                    {
+                        "label": "Schedule sessions",
+                        "details": "Block training time in the calendar",
+                        "is_assumed": False,
+                    },
+                    {
+                        "label": "Review progress",
+                        "details": "Check weekly mileage every Sunday",
+                        "is_assumed": True,
+                    },
+                ],
+            }
+            for index in range(5)
+        ]
+    },
+    "checkin-analysis": {"updates": []},
+}
+
+
+class ScriptedLLMError(RuntimeError):
+    """Simulated provider failure raised by the offline model."""
+
+    retryable = True  # behaves like a transient 503 for the retry policy
+
+    def __init__(self, message: str, code: int = 503):
+        super().__init__(message)
+        self.code = code  # 429 simulates a rate-limited API key
+
+
+def load_scripts(path: str | None) -> dict[str, Any]:
+    """Merge canned responses from a JSON file over the defaults."""
+    scripts = dict(DEFAULT_SCRIPTS)
+    if path:
+        scripts.update(json.loads(Path(path).read_text(encoding="utf-8")))
+        logger.info(f"Loaded offline LLM scripts from {path}")
+    return scripts
+
+
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic local stand-in for ChatGoogleGenerativeAI."""
+
+    prompt_name: str | None = None
+    model: str = "offline-scripted"
+    ttft_ms: int = 300
+    token_delay_ms: int = 15
+    failure_rate: float = 0.0
+    failure_code: int = 503
+    seed: int = 0
+    scripts: dict[str, Any] = Field(default_factory=lambda: dict(DEFAULT_SCRIPTS))
+
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        # Seeded per prompt so call N of a given prompt always behaves the same
+        self._rng = random.Random(f"{self.seed}:{self.prompt_name}")
+
+    @property
+    def _llm_type(self) -> str:
+        return "offline-scripted"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model, "prompt_name": self.prompt_name}
+
+    def _script_text(self) -> str:
+        script = self.scripts.get(self.prompt_name or "", "")
+        if isinstance(script, str):
+            return script
+        return json.dumps(script, ensure_ascii=False)
+
+    def _maybe_fail(self) -> None:
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise ScriptedLLMError(
+                f"Simulated failure for prompt '{self.prompt_name}'", self.failure_code
+            )
+
+    def _tokens(self) -> list[str]:
+        return _TOKEN_RE.findall(self._script_text())
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._maybe_fail()
+        tokens = self._tokens()
+        time.sleep((self.ttft_ms + self.token_delay_ms * len(tokens)) / 1000)
+        message = AIMessage(content="".join(tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._maybe_fail()
+        tokens = self._tokens()
+        await asyncio.sleep((self.ttft_ms + self.token_delay_ms * len(tokens)) / 1000)
+        message = AIMessage(content="".join(tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        self._maybe_fail()
+        time.sleep(self.ttft_ms / 1000)
+        for i, token in enumerate(self._tokens()):
+            if i:
+                time.sleep(self.token_delay_ms / 1000)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        self._maybe_fail()
+        await asyncio.sleep(self.ttft_ms / 1000)
+        for i, token in enumerate(self._tokens()):
+            if i:
+                await asyncio.sleep(self.token_delay_ms / 1000)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def build_offline_llm(
+    prompt_name: str | None = None, key_index: int = 0
+) -> ScriptedChatModel:
+    """
+    Build a scripted model configured from Settings. key_index stands in for
+    one API key of a key pool (it offsets the failure seed).
+    """
+    return ScriptedChatModel(
+        prompt_name=prompt_name,
+        ttft_ms=settings.OFFLINE_LLM_TTFT_MS,
+        token_delay_ms=settings.OFFLINE_LLM_TOKEN_DELAY_MS,
+        failure_rate=settings.OFFLINE_LLM_FAILURE_RATE,
+        failure_code=settings.OFFLINE_LLM_FAILURE_CODE,
+        seed=settings.OFFLINE_LLM_SEED + key_index,
+        scripts=load_scripts(settings.OFFLINE_LLM_SCRIPT_PATH),
+    )
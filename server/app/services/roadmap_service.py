@@ -6,11 +6,18 @@ Supports 2-step generation flow with HIL:
 2. stream_actions()  - Loads from DB, generates actions, sets ACTIVE
 """
 
+import asyncio
 import logging
 from typing import AsyncGenerator
 from uuid import UUID
 
-from app.agents.roadmap.pipeline import generate_actions, generate_skeleton
+from app.agents.roadmap.pipeline import (
+    generate_actions_as_completed,
+    generate_milestone_actions,
+    generate_skeleton,
+    stream_skeleton_milestones,
+)
+from app.core.config import settings
 from app.core.uow import AsyncUnitOfWork
 from app.models.node import NodeType
 from app.schemas.api.roadmaps import GenerateRoadmapRequest, ModifiedMilestone
@@ -18,10 +25,22 @@ from app.schemas.events.base import ErrorEventData
 from app.schemas.events.roadmap import (
     GoalNode,
     Milestone,
+    MilestoneRef,
     RoadmapActionsEvent,
     RoadmapCompleteEvent,
+    RoadmapMilestoneEvent,
+    RoadmapPartialEvent,
     RoadmapSkeletonEvent,
 )
+from app.services.llm_resilience import llm_resilience
+from app.services.llm_scheduler import Priority
+from app.services.speculation import speculative_actions, speculative_skeletons
+from app.utils.roadmap import (
+    assign_milestone_ids,
+    milestone_content_hash,
+    skeleton_context,
+    skeleton_context_hash,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -46,20 +65,51 @@ class RoadmapStreamService:
 
         Persists Roadmap(DRAFT) + Goal Node + Milestones to DB.
         Returns roadmap_id for Step 2.
+
+        With request.stream_milestones, a roadmap_milestone event is emitted for
+        each milestone as soon as the planner finishes writing it; the final
+        roadmap_skeleton event (with DB IDs) still arrives last.
+
+        If discovery already speculated a skeleton for this conversation and the
+        blueprint fields still match, it is returned without a new LLM call.
+
+        With SPECULATIVE_ACTIONS_ENABLED, action generation for every milestone
+        starts in the background (low priority) while the user reviews.
         """
         logger.info(f"[Skeleton] Starting for goal='{request.goal}'")
 
-        context = {
-            "goal": request.goal,
-            "why": request.why,
-            "timeline": request.timeline,
-            "obstacles": request.obstacles,
-            "resources": request.resources,
-        }
+        context = skeleton_context(request)
 
         try:
+            # Reuse the skeleton speculated when the blueprint became ready
+            goal_node = await self._claim_speculative_skeleton(
+                request.conversation_id, context
+            )
+
+            if goal_node is not None:
+                logger.info("[Skeleton] Served from speculation")
+                if request.stream_milestones:
+                    for index, ms in enumerate(goal_node.milestones):
+                        evt = RoadmapMilestoneEvent(
+                            index=index,
+                            milestone=ms.model_copy(update={"order": index}),
+                        )
+                        yield f"event: roadmap_milestone\ndata: {evt.model_dump_json()}\n\n"
             # Generate skeleton via LLM
-            goal_node = await generate_skeleton(context)
+            elif request.stream_milestones:
+                index = 0
+                async for item in stream_skeleton_milestones(context, user_id=user_id):
+                    if isinstance(item, GoalNode):
+                        goal_node = item
+                        continue
+                    (ms,) = assign_milestone_ids([item])
+                    evt = RoadmapMilestoneEvent(
+                        index=index, milestone=ms.model_copy(update={"order": index})
+                    )
+                    yield f"event: roadmap_milestone\ndata: {evt.model_dump_json()}\n\n"
+                    index += 1
+            else:
+                goal_node = await generate_skeleton(context, user_id=user_id)
 
             if not goal_node:
                 error_data = ErrorEventData(
@@ -69,32 +119,10 @@ class RoadmapStreamService:
                 yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
                 return
 
-            # Persist to DB as DRAFT
-            milestones_data = [
-                {
-                    "label": ms.label,
-                    "details": ms.details,
-                    "order": ms.order,
-                    "is_assumed": ms.is_assumed,
-                    "start_date": ms.start_date,
-                    "end_date": ms.end_date,
-                    "completion_criteria": ms.completion_criteria,
-                }
-                for ms in goal_node.milestones
-            ]
-
-            async with self.uow as uow:
-                roadmap = await uow.roadmaps.create_skeleton(
-                    user_id=user_id,
-                    title=request.goal,
-                    goal=request.goal,
-                    milestones_data=milestones_data,
-                    conversation_id=request.conversation_id or None,
-                )
-                roadmap_id = str(roadmap.id)
-
-            # Re-build goal_node with DB-assigned IDs
-            goal_with_db_ids = await self._load_goal_node(roadmap_id)
+            # Persist to DB as DRAFT, re-build goal_node with DB-assigned IDs
+            roadmap_id, goal_with_db_ids = await self._persist_skeleton(
+                request, user_id, goal_node
+            )
             if not goal_with_db_ids:
                 error_data = ErrorEventData(
                     code="internal_error",
@@ -103,10 +131,11 @@ class RoadmapStreamService:
                 yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
                 return
 
-            # Clear actions for skeleton view
-            for ms in goal_with_db_ids.milestones:
-                ms.actions = []
-            goal_with_db_ids.actions = []
+            # Use the user's review time: prefetch actions for every milestone
+            if settings.SPECULATIVE_ACTIONS_ENABLED:
+                self._speculate_actions(
+                    roadmap_id, goal_with_db_ids, request.goal, user_id
+                )
 
             evt = RoadmapSkeletonEvent(
                 goal=goal_with_db_ids,
@@ -130,11 +159,25 @@ class RoadmapStreamService:
         roadmap_id: str,
         user_id: str,
         modified_milestones: list[ModifiedMilestone] | None = None,
+        actions_strategy: str | None = None,
     ) -> AsyncGenerator[str, None]:
         """
         Step 2: Generate all actions for a DRAFT roadmap.
 
         Loads skeleton from DB, generates actions via LLM, persists and activates.
+        Each milestone's roadmap_actions event is emitted as soon as its LLM call
+        returns, so the first actions arrive after the fastest milestone.
+        Milestones left unchanged during review reuse the actions speculated
+        after step 1; edited or new milestones are generated live.
+
+        Milestones whose generation failed (after retries) are named in a
+        roadmap_partial event before roadmap_complete.
+
+        Retrying an interrupted run (re-POST) only generates the milestones that
+        have no saved actions yet; the saved ones are emitted from the DB.
+
+        actions_strategy picks one call per milestone or batched calls
+        (per_milestone | batched | auto, default ACTIONS_STRATEGY).
         """
         logger.info(
             f"[Actions] Starting, roadmap_id={roadmap_id}, modified={modified_milestones is not None}"
@@ -160,24 +203,51 @@ class RoadmapStreamService:
                 roadmap = await uow.roadmaps.get(roadmap_id)
             context = {"goal": roadmap.goal if roadmap else ""}
 
-            # Generate actions via LLM
-            final_goal_node = await generate_actions(goal_node, context)
+            # Unchanged milestones reuse actions speculated during review
+            prefetched = self._claim_speculative_actions(
+                roadmap_id, goal_node, context["goal"], modified_milestones
+            )
 
-            if not final_goal_node:
-                error_data = ErrorEventData(
-                    code="generation_failed",
-                    message="Failed to generate actions.",
+            # Milestones saved by an earlier, interrupted run keep their actions
+            saved = [ms for ms in goal_node.milestones if ms.actions]
+            pending = [ms for ms in goal_node.milestones if not ms.actions]
+            if saved:
+                logger.info(
+                    f"[Actions] Reusing saved actions for {len(saved)}/"
+                    f"{len(goal_node.milestones)} milestones"
                 )
-                yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
-                return
+            async for sse in self._yield_actions(
+                goal_node.model_copy(update={"milestones": saved, "actions": []})
+            ):
+                yield sse
 
-            # Persist actions to DB
-            await self._persist_actions(roadmap_id, final_goal_node)
+            # Generate actions via LLM; persist + emit each milestone as it completes
+            missing: list[Milestone] = []
+            async for ms in generate_actions_as_completed(
+                goal_node.model_copy(update={"milestones": pending}),
+                context,
+                user_id=user_id,
+                prefetched=prefetched,
+                strategy=actions_strategy,
+            ):
+                if not ms.actions:
+                    missing.append(ms)
+                    continue
+                await self._persist_milestone_actions(roadmap_id, ms)
+                evt = RoadmapActionsEvent(milestone_id=ms.id, actions=ms.actions)
+                yield f"event: roadmap_actions\ndata: {evt.model_dump_json()}\n\n"
 
-            # Yield action events to frontend
-            async for sse in self._yield_actions(final_goal_node):
+            # Direct goal actions (already in the DB) + activate roadmap
+            direct_only = goal_node.model_copy(update={"milestones": []})
+            await self._persist_actions(
+                roadmap_id, direct_only.model_copy(update={"actions": []})
+            )
+            async for sse in self._yield_actions(direct_only):
                 yield sse
 
+            if missing:
+                yield self._partial_event(roadmap_id, missing)
+
             # Complete
             complete_evt = RoadmapCompleteEvent(roadmap_id=roadmap_id)
             yield f"event: roadmap_complete\ndata: {complete_evt.model_dump_json()}\n\n"
@@ -206,6 +276,11 @@ class RoadmapStreamService:
             yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
             return
 
+        if request.pipelined:
+            async for event in self._stream_roadmap_pipelined(request, user_id):
+                yield event
+            return
+
         # Stream skeleton, then immediately stream actions
         roadmap_id = None
 
@@ -219,13 +294,275 @@ class RoadmapStreamService:
                 roadmap_id = data.get("roadmap_id")
 
         if roadmap_id:
-            async for event in self.stream_actions(roadmap_id, user_id):
+            async for event in self.stream_actions(
+                roadmap_id, user_id, actions_strategy=request.actions_strategy
+            ):
                 yield event
 
+    async def _stream_roadmap_pipelined(
+        self,
+        request: GenerateRoadmapRequest,
+        user_id: str,
+    ) -> AsyncGenerator[str, None]:
+        """
+        One-shot generation with skeleton planning and action generation overlapped.
+
+        Each milestone parsed from the streaming planner output immediately
+        dispatches its roadmap-actions call, so end-to-end latency is roughly
+        planner time + one action call. Actions that finish before the skeleton
+        is persisted are emitted right after roadmap_skeleton (once DB IDs exist).
+
+        Early calls are matched to the final planner output by label: a milestone
+        the scanner skipped gets its call once the output is complete, and one
+        the final output no longer contains is cancelled.
+        """
+        logger.info(f"[Pipelined] Starting for goal='{request.goal}'")
+        context = skeleton_context(request)
+        # call key -> task; scanned milestones use their scan index as key
+        action_tasks: dict[int, asyncio.Task] = {}
+        scanned: list[Milestone] = []
+
+        async def _actions_for(key: int, ms: Milestone) -> tuple[int, Milestone]:
+            return key, await generate_milestone_actions(
+                ms, request.goal, user_id=user_id
+            )
+
+        try:
+            goal_node = None
+            async for item in stream_skeleton_milestones(context, user_id=user_id):
+                if isinstance(item, GoalNode):
+                    goal_node = item
+                    continue
+                index = len(scanned)
+                (ms,) = assign_milestone_ids([item])
+                ms = ms.model_copy(update={"order": index})
+                scanned.append(ms)
+                action_tasks[index] = asyncio.create_task(_actions_for(index, ms))
+                evt = RoadmapMilestoneEvent(index=index, milestone=ms)
+                yield f"event: roadmap_milestone\ndata: {evt.model_dump_json()}\n\n"
+
+            if not goal_node:
+                error_data = ErrorEventData(
+                    code="generation_failed",
+                    message="Failed to generate roadmap skeleton.",
+                )
+                yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
+                return
+
+            # Match started calls to final positions; missed milestones still
+            # need actions
+            position_of: dict[int, int] = {}
+            positions = {ms.label: i for i, ms in enumerate(goal_node.milestones)}
+            for key, ms in enumerate(scanned):
+                position = positions.get(ms.label)
+                if position is None or position in position_of.values():
+                    action_tasks.pop(key).cancel()
+                    continue
+                position_of[key] = position
+            covered = set(position_of.values())
+            for position, ms in enumerate(goal_node.milestones):
+                if position not in covered:
+                    key = len(scanned) + position
+                    position_of[key] = position
+                    action_tasks[key] = asyncio.create_task(_actions_for(key, ms))
+
+            roadmap_id, goal_with_db_ids = await self._persist_skeleton(
+                request, user_id, goal_node
+            )
+            if not goal_with_db_ids:
+                error_data = ErrorEventData(
+                    code="internal_error",
+                    message="Failed to load persisted skeleton.",
+                )
+                yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
+                return
+
+            evt = RoadmapSkeletonEvent(goal=goal_with_db_ids, roadmap_id=roadmap_id)
+            yield f"event: roadmap_skeleton\ndata: {evt.model_dump_json()}\n\n"
+
+            db_milestones = {ms.order: ms for ms in goal_with_db_ids.milestones}
+            missing: list[Milestone] = []
+            for next_done in asyncio.as_completed(list(action_tasks.values())):
+                key, ms = await next_done
+                db_ms = db_milestones.get(position_of[key])
+                if not db_ms:
+                    continue
+                if not ms.actions:
+                    missing.append(db_ms)
+                    continue
+                db_ms = db_ms.model_copy(update={"actions": ms.actions})
+                await self._persist_milestone_actions(roadmap_id, db_ms)
+                evt = RoadmapActionsEvent(milestone_id=db_ms.id, actions=ms.actions)
+                yield f"event: roadmap_actions\ndata: {evt.model_dump_json()}\n\n"
+
+            # Direct goal actions come from the planner output + activate roadmap
+            direct_only = goal_with_db_ids.model_copy(
+                update={"milestones": [], "actions": goal_node.actions}
+            )
+            await self._persist_actions(roadmap_id, direct_only)
+            async for sse in self._yield_actions(direct_only):
+                yield sse
+
+            if missing:
+                yield self._partial_event(roadmap_id, missing)
+
+            complete_evt = RoadmapCompleteEvent(roadmap_id=roadmap_id)
+            yield f"event: roadmap_complete\ndata: {complete_evt.model_dump_json()}\n\n"
+
+            logger.info(f"[Pipelined] Completed, roadmap_id={roadmap_id}")
+
+        except Exception as e:
+            logger.error(f"[Pipelined] Error: {e}", exc_info=True)
+            error_data = ErrorEventData(code="internal_error", message=str(e))
+            yield f"event: error\ndata: {error_data.model_dump_json()}\n\n"
+        finally:
+            for task in action_tasks.values():
+                task.cancel()
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _partial_event(roadmap_id: str, missing: list[Milestone]) -> str:
+        """roadmap_partial SSE frame naming milestones left without actions."""
+        reason = (
+            "provider_unavailable"
+            if llm_resilience.breaker.is_open
+            else "generation_failed"
+        )
+        logger.warning(
+            f"[Actions] {len(missing)} milestone(s) without actions ({reason}), "
+            f"roadmap_id={roadmap_id}"
+        )
+        evt = RoadmapPartialEvent(
+            roadmap_id=roadmap_id,
+            missing=[MilestoneRef(id=ms.id, label=ms.label) for ms in missing],
+            reason=reason,
+        )
+        return f"event: roadmap_partial\ndata: {evt.model_dump_json()}\n\n"
+
+    @staticmethod
+    def _speculate_actions(
+        roadmap_id: str,
+        goal_node: GoalNode,
+        goal_text: str,
+        user_id: str,
+    ) -> None:
+        """Start background action generation for every DRAFT milestone."""
+        # A regenerated skeleton reuses the roadmap_id; older results are stale
+        speculative_actions.discard(roadmap_id)
+        for ms in goal_node.milestones:
+            key = f"{ms.id}:{milestone_content_hash(goal_text, ms.label, ms.details)}"
+            speculative_actions.start(
+                roadmap_id,
+                key,
+                lambda ms=ms: generate_milestone_actions(
+                    ms, goal_text, user_id=user_id, priority=Priority.BACKGROUND
+                ),
+            )
+
+    @staticmethod
+    def _claim_speculative_actions(
+        roadmap_id: str,
+        goal_node: GoalNode,
+        goal_text: str,
+        modified_milestones: list[ModifiedMilestone] | None,
+    ) -> dict[str, asyncio.Task]:
+        """
+        Map current milestone id -> speculative task for unchanged milestones.
+
+        Edits re-create milestone rows (new IDs) in the submitted order, so the
+        lookup uses the original id + content from modified_milestones by position.
+        Unclaimed speculation is discarded and counted as wasted.
+        """
+        if not speculative_actions.has_scope(roadmap_id):
+            return {}
+
+        if modified_milestones:
+            sources = [(m.id, m.label, m.details) for m in modified_milestones]
+        else:
+            sources = [(ms.id, ms.label, ms.details) for ms in goal_node.milestones]
+
+        prefetched: dict[str, asyncio.Task] = {}
+        for ms, (orig_id, label, details) in zip(goal_node.milestones, sources):
+            key = f"{orig_id}:{milestone_content_hash(goal_text, label, details)}"
+            task = speculative_actions.take(roadmap_id, key)
+            if task:
+                prefetched[ms.id] = task
+
+        speculative_actions.discard(roadmap_id)
+        logger.info(
+            f"[Actions] Speculation reused for {len(prefetched)}/"
+            f"{len(goal_node.milestones)} milestones"
+        )
+        return prefetched
+
+    @staticmethod
+    async def _claim_speculative_skeleton(
+        conversation_id: str, context: dict
+    ) -> GoalNode | None:
+        """
+        Return the skeleton speculated during discovery if the blueprint is
+        unchanged since; None means generate live.
+        """
+        if not speculative_skeletons.has_scope(conversation_id):
+            return None
+        task = speculative_skeletons.take(
+            conversation_id, skeleton_context_hash(context)
+        )
+        speculative_skeletons.discard(conversation_id)
+        if task is None:
+            return None
+        try:
+            return await task
+        except Exception as e:
+            logger.warning(f"[Skeleton] Speculative result unusable: {e}")
+            return None
+
+    async def _persist_skeleton(
+        self,
+        request: GenerateRoadmapRequest,
+        user_id: str,
+        goal_node: GoalNode,
+    ) -> tuple[str, GoalNode | None]:
+        """Persist skeleton as DRAFT; return roadmap_id + GoalNode with DB IDs."""
+        # Persist to DB as DRAFT
+        milestones_data = [
+            {
+                "label": ms.label,
+                "details": ms.details,
+                "order": ms.order,
+                "is_assumed": ms.is_assumed,
+                "start_date": ms.start_date,
+                "end_date": ms.end_date,
+                "completion_criteria": ms.completion_criteria,
+            }
+            for ms in goal_node.milestones
+        ]
+
+        async with self.uow as uow:
+            roadmap = await uow.roadmaps.create_skeleton(
+                user_id=user_id,
+                title=request.goal,
+                goal=request.goal,
+                milestones_data=milestones_data,
+                conversation_id=request.conversation_id or None,
+            )
+            roadmap_id = str(roadmap.id)
+
+        # Re-build goal_node with DB-assigned IDs
+        goal_with_db_ids = await self._load_goal_node(roadmap_id)
+        if not goal_with_db_ids:
+            return roadmap_id, None
+
+        # Clear actions for skeleton view
+        for ms in goal_with_db_ids.milestones:
+            ms.actions = []
+        goal_with_db_ids.actions = []
+
+        return roadmap_id, goal_with_db_ids
+
     async def _load_goal_node(self, roadmap_id: str) -> GoalNode | None:
         """Load roadmap from DB and reconstruct as GoalNode tree."""
         async with self.uow as uow:
@@ -365,6 +702,22 @@ class RoadmapStreamService:
                 goal_actions or None,
             )
 
+    async def _persist_milestone_actions(self, roadmap_id: str, ms: Milestone) -> None:
+        """Save one milestone's actions over any saved ones (roadmap stays DRAFT)."""
+        actions = [
+            {
+                "label": a.label,
+                "details": a.details,
+                "order": a.order,
+                "is_assumed": a.is_assumed,
+            }
+            for a in ms.actions
+        ]
+        async with self.uow as uow:
+            await uow.roadmaps.add_actions_to_roadmap(
+                UUID(roadmap_id), {ms.id: actions}, activate=False, replace=True
+            )
+
     async def _yield_actions(self, goal_node: GoalNode) -> AsyncGenerator[str, None]:
         """Yield action events for all milestones and direct actions."""
         for ms in goal_node.milestones:
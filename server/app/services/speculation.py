@@ -0,0 +1,120 @@
+"""
+Speculative LLM work started in the background before the user asks for it.
+
+Tasks are grouped by scope (roadmap_id, conversation_id) and keyed by a content hash so a
+result is only reused when its inputs are unchanged. Unclaimed tasks are
+counted as wasted when their scope is discarded or expires. Tasks run at
+BACKGROUND priority; claiming one promotes its scheduler requests to the
+claimant's priority, so a user never waits in the background queue.
+
+Metrics (label kind=<store name>):
+- speculation_started_total
+- speculation_hits_total / speculation_misses_total
+- speculation_wasted_total{state=completed|cancelled}
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.llm_scheduler import Priority, llm_scheduler
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["SpeculativeTasks", "speculative_actions", "speculative_skeletons"]
+
+
+class SpeculativeTasks:
+    """Per-process store of background tasks: scope -> {key: task}."""
+
+    def __init__(self, kind: str, ttl_seconds: float, max_scopes: int = 1000):
+        self.kind = kind
+        self.ttl_seconds = ttl_seconds
+        self.max_scopes = max_scopes
+        # scope -> (created_at, {key: task})
+        self._scopes: OrderedDict[str, tuple[float, dict[str, asyncio.Task]]] = (
+            OrderedDict()
+        )
+
+    def start(
+        self,
+        scope: str,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Start factory() in the background unless the same key is already running."""
+        self._expire()
+        _, tasks = self._scopes.setdefault(scope, (time.monotonic(), {}))
+        self._scopes.move_to_end(scope)
+        if key in tasks:
+            return
+        task = asyncio.create_task(factory())
+        # Mark failures as retrieved; a failed speculation is just a miss later
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        tasks[key] = task
+        metrics.inc("speculation_started_total", labels={"kind": self.kind})
+
+        while len(self._scopes) > self.max_scopes:
+            oldest, _ = next(iter(self._scopes.items()))
+            self.discard(oldest)
+
+    def has_scope(self, scope: str) -> bool:
+        self._expire()
+        return scope in self._scopes
+
+    def has(self, scope: str, key: str) -> bool:
+        self._expire()
+        entry = self._scopes.get(scope)
+        return bool(entry) and key in entry[1]
+
+    def take(
+        self, scope: str, key: str, priority: Priority = Priority.STANDARD
+    ) -> asyncio.Task | None:
+        """
+        Claim the task for key (hit) or return None (miss). The claimant now
+        waits on it, so its LLM calls are promoted to `priority`.
+        """
+        self._expire()
+        entry = self._scopes.get(scope)
+        task = entry[1].pop(key, None) if entry else None
+        name = "speculation_hits_total" if task else "speculation_misses_total"
+        metrics.inc(name, labels={"kind": self.kind})
+        if task:
+            llm_scheduler.promote(task, priority)
+        return task
+
+    def discard(self, scope: str) -> int:
+        """Drop a scope; unclaimed tasks are cancelled and counted as wasted."""
+        entry = self._scopes.pop(scope, None)
+        if not entry:
+            return 0
+        for task in entry[1].values():
+            state = "completed" if task.done() else "cancelled"
+            task.cancel()
+            metrics.inc(
+                "speculation_wasted_total", labels={"kind": self.kind, "state": state}
+            )
+        if entry[1]:
+            logger.info(
+                f"[Speculation] Discarded {len(entry[1])} unused {self.kind} "
+                f"task(s) for scope={scope}"
+            )
+        return len(entry[1])
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [s for s, (created, _) in self._scopes.items() if created < cutoff]
+        for scope in expired:
+            self.discard(scope)
+
+
+speculative_actions = SpeculativeTasks(
+    "roadmap_actions", ttl_seconds=settings.SPECULATION_TTL_SECONDS
+)
+speculative_skeletons = SpeculativeTasks(
+    "roadmap_skeleton", ttl_seconds=settings.SPECULATION_TTL_SECONDS
+)
@@ -0,0 +1,188 @@
+"""
+Resumable SSE streams: generations detached from the HTTP connection.
+
+A streaming endpoint starts a StreamRun instead of iterating its service
+generator in the response. The run consumes the generator in a background
+task, numbers every frame with a monotonically increasing `id:` line and
+keeps the last SSE_REPLAY_BUFFER_EVENTS frames. The id goes after the data
+line (`event: …\ndata: …\nid: N\n\n`): the web client reads the event type
+and data from the first two lines of each frame. Responses subscribe to the run, so a
+dropped connection no longer cancels the LLM calls; the client resumes with
+GET /streams/{run_id} and Last-Event-ID, gets the missed frames replayed and
+then the live ones as the same generation continues.
+
+The run id is sent in the X-Stream-Run-Id response header. Finished runs are
+kept for SSE_REPLAY_TTL_SECONDS, at most SSE_REPLAY_MAX_RUNS per process
+(resume must reach the worker that started the run).
+
+Usage:
+    run = stream_runs.start(service.stream_chat(request, user_id), owner=user_id)
+    return StreamingResponse(run.frames(), ...)
+
+Metrics:
+- sse_runs_started_total
+- sse_resume_total{outcome=replayed|not_found|expired}
+- sse_replayed_events_total
+- sse_runs_active (gauge)
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import AsyncGenerator
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.events.base import ErrorEventData
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["StreamRun", "StreamRunRegistry", "stream_runs"]
+
+
+class StreamRun:
+    """One generation: a ring buffer of numbered SSE frames + live updates."""
+
+    def __init__(self, run_id: str, owner: str | None, buffer_size: int):
+        self.run_id = run_id
+        self.owner = owner
+        self.last_id = 0
+        self.finished_at: float | None = None
+        self._events: deque[tuple[int, str]] = deque(maxlen=buffer_size)
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def start(self, source: AsyncGenerator[str, None]) -> None:
+        self._task = asyncio.create_task(self._pump(source))
+
+    def can_replay(self, after: int) -> bool:
+        """False once frames after `after` have left the ring buffer."""
+        oldest = self._events[0][0] if self._events else self.last_id + 1
+        return after + 1 >= oldest
+
+    def publish(self, frame: str) -> None:
+        self.last_id += 1
+        # After event/data: the client parses those from lines 0 and 1
+        numbered = frame.rstrip("\n") + f"\nid: {self.last_id}\n\n"
+        self._events.append((self.last_id, numbered))
+        self._wake()
+
+    def finish(self) -> None:
+        self.finished_at = time.monotonic()
+        self._wake()
+
+    def _wake(self) -> None:
+        # Waiters hold the old event; the next wait gets a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _pump(self, source: AsyncGenerator[str, None]) -> None:
+        try:
+            async for frame in source:
+                self.publish(frame)
+        except Exception as e:
+            logger.error(f"[Stream] Run {self.run_id} failed: {e}", exc_info=True)
+        finally:
+            self.finish()
+
+    async def frames(self, after: int = 0) -> AsyncGenerator[str, None]:
+        """Frames with id > after: buffered ones first, then live until done."""
+        cursor = after
+        while True:
+            changed = self._changed
+            if not self.can_replay(cursor):
+                error = ErrorEventData(
+                    code="replay_unavailable",
+                    message="스트림 일부가 만료되었습니다. 다시 요청해 주세요.",
+                )
+                yield f"event: error\ndata: {error.model_dump_json()}\n\n"
+                return
+            missed = []
+            # Newest first: live subscribers only look at the tail
+            for event_id, frame in reversed(self._events):
+                if event_id <= cursor:
+                    break
+                missed.append(frame)
+            cursor = max(cursor, self.last_id)
+            for frame in reversed(missed):
+                yield frame
+            if self.done and cursor >= self.last_id:
+                return
+            await changed.wait()
+
+
+class StreamRunRegistry:
+    """Per-process runs by id; finished runs expire after a TTL."""
+
+    def __init__(self, buffer_size: int, ttl_seconds: float, max_runs: int):
+        self.buffer_size = buffer_size
+        self.ttl_seconds = ttl_seconds
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, StreamRun] = OrderedDict()
+
+    def start(self, source: AsyncGenerator[str, None], owner: str | None) -> StreamRun:
+        """Run source in the background; the run outlives its first response."""
+        self._expire()
+        run = StreamRun(str(uuid.uuid4()), owner, self.buffer_size)
+        run.start(source)
+        self._runs[run.run_id] = run
+        while len(self._runs) > self.max_runs:
+            self._runs.popitem(last=False)
+        metrics.inc("sse_runs_started_total")
+        return run
+
+    def get(self, run_id: str, owner: str | None) -> StreamRun | None:
+        """The run, unless unknown, expired or started by another user."""
+        self._expire()
+        run = self._runs.get(run_id)
+        if run is None or (run.owner is not None and run.owner != owner):
+            return None
+        return run
+
+    def resume(
+        self, run_id: str, owner: str | None, last_event_id: int
+    ) -> AsyncGenerator[str, None] | None:
+        """
+        Frames after last_event_id, then the live run; None if the run is
+        unknown. Frames that already left the buffer end the stream with a
+        replay_unavailable error.
+        """
+        run = self.get(run_id, owner)
+        if run is None:
+            metrics.inc("sse_resume_total", labels={"outcome": "not_found"})
+            return None
+        if run.can_replay(last_event_id):
+            metrics.inc("sse_resume_total", labels={"outcome": "replayed"})
+            metrics.inc(
+                "sse_replayed_events_total", max(0, run.last_id - last_event_id)
+            )
+        else:
+            metrics.inc("sse_resume_total", labels={"outcome": "expired"})
+        return run.frames(after=last_event_id)
+
+    def active(self) -> int:
+        return sum(1 for run in self._runs.values() if not run.done)
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        for run_id in [
+            run_id
+            for run_id, run in self._runs.items()
+            if run.finished_at is not None and run.finished_at < cutoff
+        ]:
+            del self._runs[run_id]
+
+
+stream_runs = StreamRunRegistry(
+    buffer_size=settings.SSE_REPLAY_BUFFER_EVENTS,
+    ttl_seconds=settings.SSE_REPLAY_TTL_SECONDS,
+    max_runs=settings.SSE_REPLAY_MAX_RUNS,
+)
+
+metrics.register_gauge("sse_runs_active", lambda: {"": stream_runs.active()})
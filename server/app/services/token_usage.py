@@ -0,0 +1,156 @@
+"""
+Token accounting for every LLM response, per pipeline stage and per user.
+
+A callback handler attached to each model by get_llm() (one per prompt name,
+the "stage", and routed model) reads usage_metadata from the response. When the provider omits
+it (e.g. the offline model), input and output tokens are estimated locally
+from the prompt messages and the reply text. The user is whoever holds the
+scheduler slot the call runs in; the metrics endpoint is unauthenticated, so
+the user label is a keyed hash (METRICS_USER_HASH_KEY), never the raw id.
+
+Metrics:
+- llm_input_tokens{stage} / llm_output_tokens{stage} (histograms, per call)
+- llm_stage_seconds{stage, model} (histogram, model call latency per route)
+- llm_user_tokens{user=u-<hmac>} (histogram, input + output per call)
+- llm_tokens_total{stage, kind=input|output, source=provider|estimate}
+"""
+
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.llm_scheduler import current_llm_user
+from app.utils.tokens import estimate_tokens
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["TokenUsageHandler", "record_usage", "usage_handler", "user_label"]
+
+# Per-user series beyond this many distinct users are folded into one label
+MAX_TRACKED_USERS = 1000
+_OTHER_USERS = "_other"
+_tracked_users: set[str] = set()
+_LABEL_KEY = (settings.METRICS_USER_HASH_KEY or secrets.token_hex(16)).encode()
+
+
+def user_label(user_id: str) -> str:
+    """Pseudonymous metric label for a user (look a user up by computing it)."""
+    digest = hmac.new(_LABEL_KEY, user_id.encode(), hashlib.sha256).hexdigest()
+    return f"u-{digest[:16]}"
+
+
+def _user_label(user_id: str | None) -> str:
+    if not user_id:
+        return "anonymous"
+    label = user_label(user_id)
+    if label in _tracked_users:
+        return label
+    if len(_tracked_users) < MAX_TRACKED_USERS:
+        _tracked_users.add(label)
+        return label
+    return _OTHER_USERS
+
+
+def record_usage(
+    stage: str,
+    input_tokens: int,
+    output_tokens: int,
+    source: str,
+    user_id: str | None = None,
+) -> None:
+    """Record one LLM call's token usage."""
+    stage_labels = {"stage": stage}
+    metrics.observe("llm_input_tokens", input_tokens, stage_labels)
+    metrics.observe("llm_output_tokens", output_tokens, stage_labels)
+    metrics.observe(
+        "llm_user_tokens", input_tokens + output_tokens, {"user": _user_label(user_id)}
+    )
+    for kind, value in (("input", input_tokens), ("output", output_tokens)):
+        metrics.inc(
+            "llm_tokens_total",
+            value,
+            labels={"stage": stage, "kind": kind, "source": source},
+        )
+
+
+def _message_text(message: Any) -> str:
+    content = getattr(message, "content", "") or ""
+    if isinstance(content, list):
+        return "".join(c.get("text", "") for c in content if isinstance(c, dict))
+    return str(content)
+
+
+class TokenUsageHandler(AsyncCallbackHandler):
+    """Records usage for every chat model call of one stage."""
+
+    def __init__(self, stage: str, model: str = ""):
+        self.stage = stage
+        self.model = model
+        # run_id -> (start time, estimated input tokens)
+        self._runs: dict[UUID, tuple[float, int]] = {}
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[BaseMessage]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        estimated = sum(
+            estimate_tokens(_message_text(m)) for batch in messages for m in batch
+        )
+        self._runs[run_id] = (time.monotonic(), estimated)
+
+    async def on_llm_end(
+        self, response: LLMResult, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        started, estimated_input = self._runs.pop(run_id, (None, 0))
+        if started is not None:
+            metrics.observe(
+                "llm_stage_seconds",
+                time.monotonic() - started,
+                {"stage": self.stage, "model": self.model},
+            )
+
+        generation = response.generations[0][0] if response.generations else None
+        message = getattr(generation, "message", None)
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            record_usage(
+                self.stage,
+                usage.get("input_tokens", 0),
+                usage.get("output_tokens", 0),
+                "provider",
+                current_llm_user.get(),
+            )
+            return
+        text = _message_text(message) if message else getattr(generation, "text", "")
+        record_usage(
+            self.stage,
+            estimated_input,
+            estimate_tokens(text),
+            "estimate",
+            current_llm_user.get(),
+        )
+
+    async def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._runs.pop(run_id, None)
+
+
+@lru_cache()
+def usage_handler(stage: str, model: str = "") -> TokenUsageHandler:
+    """Shared handler for a stage (prompt name) served by `model`."""
+    return TokenUsageHandler(stage, model)
@@ -0,0 +1,139 @@
+"""
+Read-ahead buffering and coalescing for async generators.
+"""
+
+import asyncio
+from typing import AsyncGenerator, AsyncIterator, Generic, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+_TIMEOUT = object()
+
+
+class _Failed:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class BufferedStream(Generic[T]):
+    """
+    Consume an async generator in a background task from construction on.
+
+    Items are buffered until someone iterates, so a stream can be started
+    speculatively and either replayed (buffer first, then live) or dropped
+    with aclose(). Errors from the source are raised to the reader.
+    """
+
+    def __init__(self, source: AsyncGenerator[T, None]):
+        self._source = source
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._pump())
+
+    async def _pump(self) -> None:
+        try:
+            async for item in self._source:
+                self._queue.put_nowait(item)
+        except Exception as e:
+            self._queue.put_nowait(_Failed(e))
+        finally:
+            self._queue.put_nowait(_DONE)
+
+    @property
+    def buffered(self) -> int:
+        """Items read ahead and not yet consumed."""
+        return self._queue.qsize()
+
+    async def next(self) -> T:
+        """
+        Next item. Raises StopAsyncIteration once the source is exhausted and
+        TimeoutError when a deadline set with interrupt_at() passes first.
+        """
+        item = await self._queue.get()
+        if item is _DONE:
+            self._queue.put_nowait(_DONE)  # stay exhausted
+            raise StopAsyncIteration
+        if item is _TIMEOUT:
+            raise TimeoutError
+        if isinstance(item, _Failed):
+            raise item.error
+        return item
+
+    def interrupt_at(self, when: float) -> asyncio.TimerHandle:
+        """Wake the reader at loop time `when` (cancel the handle to disarm)."""
+        loop = asyncio.get_running_loop()
+        return loop.call_at(when, self._queue.put_nowait, _TIMEOUT)
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        while True:
+            try:
+                item = await self.next()
+            except StopAsyncIteration:
+                return
+            yield item
+
+    async def aclose(self) -> None:
+        """Stop reading the source (cancels the underlying call)."""
+        if not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def coalesce(
+    source: AsyncGenerator[str, None] | BufferedStream[str],
+    max_delay: float,
+    max_bytes: int,
+) -> AsyncGenerator[str, None]:
+    """
+    Join small string chunks into fewer, larger ones.
+
+    The first chunk is passed through at once (time-to-first-token is
+    unchanged). After that chunks are buffered and joined when the buffer
+    holds max_bytes (UTF-8) or its oldest chunk is max_delay seconds old -
+    even if the source is silent meanwhile - and once more when the source
+    ends. max_delay <= 0 passes chunks through one by one; max_bytes <= 0
+    flushes on time only.
+    """
+    if max_delay <= 0:
+        async for chunk in source:
+            yield chunk
+        return
+
+    stream = source if isinstance(source, BufferedStream) else BufferedStream(source)
+    loop = asyncio.get_running_loop()
+    buffer: list[str] = []
+    size = 0
+    # One timer per window rather than a timeout per read
+    window: asyncio.TimerHandle | None = None
+    try:
+        try:
+            yield await stream.next()
+        except StopAsyncIteration:
+            return
+        while True:
+            try:
+                chunk = await stream.next()
+            except TimeoutError:
+                chunk = None
+            except StopAsyncIteration:
+                break
+            if chunk is not None:
+                buffer.append(chunk)
+                size += len(chunk.encode())
+                if window is None:
+                    window = stream.interrupt_at(loop.time() + max_delay)
+            if buffer and (chunk is None or (max_bytes > 0 and size >= max_bytes)):
+                yield "".join(buffer)
+                buffer, size = [], 0
+                if window is not None:
+                    window.cancel()
+                    window = None
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if window is not None:
+            window.cancel()
+        await stream.aclose()
@@ -0,0 +1,146 @@
+import json
+from typing import Any, Iterator
+
+# Repair kinds reported in metrics
+STRAY_PROSE = "stray_prose"
+TRAILING_COMMA = "trailing_comma"
+UNESCAPED_QUOTE = "unescaped_quote"
+CONTROL_CHAR = "control_char"
+TRUNCATED = "truncated"
+
+_CLOSERS = {"{": "}", "[": "]"}
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+class _Scan:
+    """Result of normalising raw model text into (possibly unterminated) JSON."""
+
+    def __init__(self):
+        # One character per element: cut points index the joined text
+        self.out: list[str] = []
+        self.stack: list[str] = []
+        self.in_string = False
+        self.repairs: set[str] = set()
+        # (length of out, open containers) wherever the prefix can be closed
+        self.cut_points: list[tuple[int, tuple[str, ...]]] = []
+
+
+def _next_significant(text: str, i: int) -> str:
+    while i < len(text) and text[i] in " \t\r\n":
+        i += 1
+    return text[i] if i < len(text) else ""
+
+
+def _scan(text: str) -> _Scan:
+    scan = _Scan()
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return scan
+    start = min(starts)
+    if text[:start].strip():
+        scan.repairs.add(STRAY_PROSE)
+
+    out = scan.out
+    escape = False
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if scan.in_string:
+            if escape:
+                escape = False
+                out.append(ch)
+            elif ch == "\\":
+                escape = True
+                out.append(ch)
+            elif ch == '"':
+                # A quote only ends the string if JSON structure follows it
+                if _next_significant(text, i + 1) in ("", ",", ":", "}", "]"):
+                    scan.in_string = False
+                    out.append(ch)
+                else:
+                    scan.repairs.add(UNESCAPED_QUOTE)
+                    out.extend('\\"')
+            elif ch in _CONTROL_ESCAPES:
+                scan.repairs.add(CONTROL_CHAR)
+                out.extend(_CONTROL_ESCAPES[ch])
+            else:
+                out.append(ch)
+        elif ch == '"':
+            scan.in_string = True
+            out.append(ch)
+        elif ch in "{[":
+            scan.stack.append(ch)
+            out.append(ch)
+            scan.cut_points.append((len(out), tuple(scan.stack)))
+        elif ch in "}]":
+            while out and (out[-1].isspace() or out[-1] == ","):
+                if out.pop() == ",":
+                    scan.repairs.add(TRAILING_COMMA)
+            if scan.stack:
+                out.append(_CLOSERS[scan.stack.pop()])
+            if not scan.stack:
+                if text[i + 1 :].strip():
+                    scan.repairs.add(STRAY_PROSE)
+                break
+            scan.cut_points.append((len(out), tuple(scan.stack)))
+        elif ch == ",":
+            scan.cut_points.append((len(out), tuple(scan.stack)))
+            out.append(ch)
+        else:
+            out.append(ch)
+        i += 1
+    return scan
+
+
+def _close(prefix: str, stack: tuple[str, ...] | list[str]) -> str:
+    body = prefix.rstrip().rstrip(",")
+    return body + "".join(_CLOSERS[c] for c in reversed(stack))
+
+
+def repair_candidates(text: str) -> Iterator[tuple[Any, list[str]]]:
+    """
+    Yield (parsed value, repairs applied) for each plausible reading of a
+    malformed JSON reply, most complete first.
+
+    Handles prose around the JSON, trailing commas, unescaped inner quotes,
+    raw control characters and truncation (unclosed strings, arrays and
+    objects; an incomplete last element is dropped). Callers validate each
+    candidate and keep the first that fits their schema.
+    """
+    scan = _scan(text)
+    if not scan.out:
+        return
+    normalised = "".join(scan.out)
+    repairs = sorted(scan.repairs)
+
+    if not scan.stack and not scan.in_string:
+        try:
+            yield json.loads(normalised), repairs
+        except json.JSONDecodeError:
+            pass
+        return
+
+    repairs = sorted(scan.repairs | {TRUNCATED})
+    # Close everything as-is (keeps a partial last string value)
+    tail = '"' if scan.in_string else ""
+    seen: set[str] = set()
+    candidates = [_close(normalised + tail, scan.stack)]
+    # Then back off to each earlier complete element
+    candidates += [
+        _close(normalised[:pos], stack) for pos, stack in reversed(scan.cut_points)
+    ]
+    for candidate in candidates:
+        if candidate in seen:
+            continue
+        seen.add(candidate)
+        try:
+            yield json.loads(candidate), repairs
+        except json.JSONDecodeError:
+            continue
+
+
+def repair_json(text: str) -> tuple[Any, list[str]]:
+    """First parseable repair of text; raises ValueError if none exists."""
+    for value, repairs in repair_candidates(text):
+        return value, repairs
+    raise ValueError("Unrecoverable JSON output")
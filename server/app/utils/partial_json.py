@@ -0,0 +1,83 @@
+import json
+from typing import Any
+
+
+class JsonArrayItemStream:
+    """
+    Incrementally scan streamed JSON text and return each object of a named
+    array as soon as its closing brace arrives.
+
+    Only the array stored under `key` is extracted (at any depth), e.g.
+    key="milestones" yields every goal.milestones[i] object. Text outside the
+    top-level JSON value (markdown fences, prose) is ignored.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._pos = 0
+        self._text = ""
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: str | None = None
+        self._pending_key: str | None = None
+        # (opening char, key the container is stored under, start offset)
+        self._stack: list[tuple[str, str | None, int]] = []
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """Consume a chunk; return array items completed by it."""
+        self._text += chunk
+        completed: list[dict[str, Any]] = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start : i]
+                continue
+
+            if not self._stack and ch not in "{[":
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i + 1
+            elif ch == ":":
+                self._pending_key = self._last_string
+            elif ch == ",":
+                self._pending_key = None
+            elif ch in "{[":
+                in_object = bool(self._stack) and self._stack[-1][0] == "{"
+                key = self._pending_key if in_object else None
+                self._stack.append((ch, key, i))
+                self._pending_key = None
+            elif ch in "}]":
+                if not self._stack:
+                    continue
+                opener, _, start = self._stack.pop()
+                parent = self._stack[-1] if self._stack else None
+                if (
+                    opener == "{"
+                    and parent is not None
+                    and parent[0] == "["
+                    and parent[1] == self.key
+                ):
+                    try:
+                        completed.append(json.loads(text[start : i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+
+        self._pos = len(text)
+        return completed
@@ -1,3 +1,6 @@
+import hashlib
+import json
+from typing import Any
 from uuid import uuid4
 
 from app.schemas.events.roadmap import ActionNode, GoalNode, Milestone
@@ -49,3 +52,26 @@ def assign_goal_ids(goal: GoalContent) -> GoalNode:
         milestones=assign_milestone_ids(goal.milestones),
         actions=assign_action_ids(goal.actions, goal_id),
     )
+
+
+def milestone_content_hash(goal: str, label: str, details: str | None) -> str:
+    """Hash of the inputs the roadmap-actions prompt sees for a milestone."""
+    payload = json.dumps([goal, label, details or ""], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+SKELETON_CONTEXT_FIELDS = ("goal", "why", "timeline", "obstacles", "resources")
+
+
+def skeleton_context(source: Any) -> dict[str, str | None]:
+    """Planner context from any object with blueprint fields (request/blueprint)."""
+    return {field: getattr(source, field, None) for field in SKELETON_CONTEXT_FIELDS}
+
+
+def skeleton_context_hash(context: dict[str, str | None]) -> str:
+    """Hash of the inputs the roadmap-planner prompt sees."""
+    payload = json.dumps(
+        [context.get(field) or "" for field in SKELETON_CONTEXT_FIELDS],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,23 @@
+import json
+import math
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Rough token count for text (or a JSON-serialisable value) when the provider
+    reports no usage: ~4 ASCII characters per token, ~1 token per non-ASCII
+    character (Korean text tokenises close to one token per syllable).
+    """
+    if value is None:
+        return 0
+    if isinstance(value, BaseModel):
+        text = value.model_dump_json()
+    elif isinstance(value, str):
+        text = value
+    else:
+        text = json.dumps(value, ensure_ascii=False, default=str)
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars))
@@ -0,0 +1,149 @@
+"""
+Benchmark: per-milestone vs batched roadmap action generation.
+
+Runs generate_actions() against the offline LLM for several milestone counts
+and reports total tokens (prompt + completion, estimated locally), mean wall
+time and p95 wall time per strategy. The response cache is disabled so every
+run hits the (simulated) provider. Latency comes from OFFLINE_LLM_TTFT_MS and
+OFFLINE_LLM_TOKEN_DELAY_MS, so longer batched replies cost proportionally more.
+
+Usage:
+    cd server && uv run python scripts/bench_actions_strategy.py [runs]
+"""
+
+import asyncio
+import math
+import os
+import re
+import sys
+import time
+from typing import Any
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LLM_PROVIDER", "offline")
+
+from app.agents.roadmap import pipeline
+from app.core.config import settings
+from app.schemas.events.roadmap import GoalNode, Milestone
+from app.services.llm_cache import llm_cache
+from app.services.offline_llm import DEFAULT_SCRIPTS, ScriptedChatModel
+from app.utils.tokens import estimate_tokens
+
+MILESTONE_COUNTS = (3, 5, 8)
+# (label, strategy, batch chunk size; 0 = all milestones in one call)
+CONFIGS = (
+    ("per_milestone", "per_milestone", 0),
+    ("batched", "batched", 0),
+    ("batched/3", "batched", 3),
+)
+
+usage = {"calls": 0, "tokens": 0}
+
+
+class CountingModel(ScriptedChatModel):
+    """
+    Scripted model that tallies estimated prompt + completion tokens. Batched
+    replies hold one entry per milestone listed in the prompt.
+    """
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        model = self
+        if self.prompt_name == "roadmap-actions-batch":
+            count = len(re.findall(r"^\d+\. ", messages[0].content, re.MULTILINE))
+            model = self.model_copy(update={"scripts": _batch_script(count)})
+        result = await ScriptedChatModel._agenerate(
+            model, messages, stop, run_manager, **kwargs
+        )
+        usage["calls"] += 1
+        usage["tokens"] += sum(estimate_tokens(m.content) for m in messages)
+        usage["tokens"] += estimate_tokens(result.generations[0].message.content)
+        return result
+
+
+def _batch_script(count: int) -> dict[str, Any]:
+    # Same 3 actions per milestone as the single-milestone script
+    actions = DEFAULT_SCRIPTS["roadmap-actions"]["actions"]
+    return {
+        "roadmap-actions-batch": {
+            "milestones": [{"index": i, "actions": actions} for i in range(count)]
+        }
+    }
+
+
+def _model(prompt_name: str) -> CountingModel:
+    return CountingModel(
+        prompt_name=prompt_name,
+        ttft_ms=settings.OFFLINE_LLM_TTFT_MS,
+        token_delay_ms=settings.OFFLINE_LLM_TOKEN_DELAY_MS,
+    )
+
+
+def _goal_node(count: int) -> GoalNode:
+    return GoalNode(
+        id="goal-bench",
+        label="Run a half marathon",
+        milestones=[
+            Milestone(
+                id=f"ms-{i}",
+                label=f"Milestone {i + 1}",
+                details="Build weekly mileage and recovery habits",
+                order=i,
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+async def _run(count: int, strategy: str, chunk: int, runs: int) -> dict:
+    settings.ACTIONS_BATCH_CHUNK_SIZE = chunk
+    usage.update(calls=0, tokens=0)
+    walls = []
+    for run in range(runs):
+        t0 = time.monotonic()
+        result = await pipeline.generate_actions(
+            _goal_node(count),
+            {"goal": f"Run a half marathon #{run}"},
+            strategy=strategy,
+        )
+        walls.append(time.monotonic() - t0)
+        assert all(ms.actions for ms in result.milestones)
+    return {
+        "calls": usage["calls"] / runs,
+        "tokens": usage["tokens"] / runs,
+        "mean": sum(walls) / runs,
+        "p95": _p95(walls),
+    }
+
+
+async def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    llm_cache.enabled = False
+    models = {
+        name: _model(name) for name in ("roadmap-actions", "roadmap-actions-batch")
+    }
+    pipeline.get_llm = lambda prompt_name: models[prompt_name]
+
+    print(
+        f"{'milestones':>10} {'strategy':<14} {'calls':>6} {'tokens':>8} "
+        f"{'mean (s)':>9} {'p95 (s)':>8}"
+    )
+    for count in MILESTONE_COUNTS:
+        baseline = None
+        for label, strategy, chunk in CONFIGS:
+            r = await _run(count, strategy, chunk, runs)
+            baseline = baseline or r
+            delta = r["tokens"] / baseline["tokens"] - 1
+            print(
+                f"{count:>10} {label:<14} {r['calls']:>6.1f} {r['tokens']:>8.0f} "
+                f"{r['mean']:>9.2f} {r['p95']:>8.2f}"
+                + (f"   tokens {delta:+.0%}" if r is not baseline else "")
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
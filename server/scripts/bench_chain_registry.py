@@ -0,0 +1,58 @@
+"""
+Microbenchmark: per-request chain construction vs the chain registry.
+
+Compares building `prompt | llm | parse_gemini_output | JsonOutputParser()`
+on every request (the old call-site pattern) with fetching the prebuilt
+runnable from chain_registry. Uses the offline LLM, so no API calls are made.
+
+Usage:
+    cd server && uv run python scripts/bench_chain_registry.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LLM_PROVIDER", "offline")
+
+from app.agents.roadmap.pipeline import _action_chain
+from app.agents.roadmap.prompts import get_action_generator_prompt
+from app.services.chain_registry import chain_registry
+from app.services.gemini import get_llm, parse_gemini_output
+from langchain_core.output_parsers import JsonOutputParser
+
+actions_llm = get_llm(prompt_name="roadmap-actions")
+
+
+def rebuild():
+    prompt = get_action_generator_prompt()
+    return prompt | actions_llm | parse_gemini_output | JsonOutputParser()
+
+
+def registry():
+    return chain_registry.get(
+        "roadmap-actions", get_action_generator_prompt(), actions_llm, _action_chain
+    ).runnable
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    registry()  # compile once, as the first request would
+
+    print(f"{'pattern':<12} {'total (s)':>10} {'per call (us)':>14}")
+    results = {}
+    for name, fn in (("rebuild", rebuild), ("registry", registry)):
+        total = min(timeit.repeat(fn, number=iterations, repeat=3))
+        results[name] = total / iterations * 1e6
+        print(f"{name:<12} {total:>10.3f} {results[name]:>14.2f}")
+
+    saved = results["rebuild"] - results["registry"]
+    print(
+        f"\nremoved {saved:.2f} us of construction per chain call "
+        f"({results['rebuild'] / results['registry']:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
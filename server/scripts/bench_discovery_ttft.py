@@ -0,0 +1,88 @@
+"""
+Benchmark: time-to-first-token of /chat/stream, sequential vs speculative.
+
+Drives DiscoveryStreamService.stream_chat() against the offline LLM and
+reports TTFT (request start -> first token event) and total stream time per
+response mode, for two blueprints:
+- unchanged: the analysis keeps the missing fields (speculation is kept)
+- changed: the analysis fills fields in (speculation is restarted)
+
+The response cache is disabled so every run hits the (simulated) provider.
+Latency comes from OFFLINE_LLM_TTFT_MS and OFFLINE_LLM_TOKEN_DELAY_MS.
+
+Usage:
+    cd server && uv run python scripts/bench_discovery_ttft.py [runs]
+"""
+
+import asyncio
+import math
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LLM_PROVIDER", "offline")
+
+from app.schemas.api.chat import BlueprintData, ChatRequest, FieldScores
+from app.services.discovery_service import DiscoveryStreamService
+from app.services.llm_cache import llm_cache
+
+# Scores the offline discovery-analysis script returns
+ANALYZED = FieldScores(goal=70, why=20, timeline=65, obstacles=10, resources=10)
+BLUEPRINTS = {
+    "unchanged": BlueprintData(goal="Run a half marathon", field_scores=ANALYZED),
+    "changed": BlueprintData(),
+}
+MODES = ("sequential", "speculative")
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+async def _run(blueprint: BlueprintData, mode: str, runs: int) -> dict:
+    ttfts, totals = [], []
+    for run in range(runs):
+        request = ChatRequest(
+            message=f"I want to run a half marathon #{run}",
+            current_blueprint=blueprint,
+            response_mode=mode,
+        )
+        t0 = time.monotonic()
+        ttft = None
+        async for event in DiscoveryStreamService(uow=None).stream_chat(request):
+            if ttft is None and event.startswith("event: token"):
+                ttft = time.monotonic() - t0
+        totals.append(time.monotonic() - t0)
+        ttfts.append(ttft or 0.0)
+    return {
+        "ttft": sum(ttfts) / runs,
+        "ttft_p95": _p95(ttfts),
+        "total": sum(totals) / runs,
+    }
+
+
+async def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    llm_cache.enabled = False
+
+    print(
+        f"{'blueprint':<10} {'mode':<12} {'ttft (s)':>9} {'p95 (s)':>8} "
+        f"{'total (s)':>10}"
+    )
+    for name, blueprint in BLUEPRINTS.items():
+        baseline = None
+        for mode in MODES:
+            r = await _run(blueprint, mode, runs)
+            baseline = baseline or r
+            delta = r["ttft"] / baseline["ttft"] - 1
+            print(
+                f"{name:<10} {mode:<12} {r['ttft']:>9.2f} {r['ttft_p95']:>8.2f} "
+                f"{r['total']:>10.2f}"
+                + (f"   ttft {delta:+.0%}" if r is not baseline else "")
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
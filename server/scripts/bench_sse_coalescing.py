@@ -0,0 +1,136 @@
+"""
+Benchmark: SSE token coalescing on /chat/stream.
+
+Drives DiscoveryStreamService.stream_chat() with a long reply and, per token
+flush window, reports per response:
+- CPU time of the process (time.process_time)
+- token events and total SSE frames; StreamingResponse sends each frame
+  as its own ASGI body message, i.e. one socket write (send syscall) each.
+  The benchmark writes every frame to a local socket pair to pay that cost.
+- bytes on the wire
+
+Window "0 ms" is the previous behaviour: one event per model chunk.
+
+Two sources: "sse" replaces the LLM calls with a synthetic token stream
+(word-sized chunks every 2ms) so CPU is the service + SSE framing alone;
+"offline" runs the full LangChain pipeline against the offline LLM, where
+the model stack dominates CPU.
+
+Usage:
+    cd server && uv run python scripts/bench_sse_coalescing.py [runs]
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ~320 word-sized chunks, streamed quickly like a fast provider
+_REPLY = "좋아요, 6개월 안에 하프 마라톤 완주라는 목표가 분명하네요. " * 40
+_SCRIPTS = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+json.dump({"discovery-chat": _REPLY}, _SCRIPTS, ensure_ascii=False)
+_SCRIPTS.close()
+os.environ.setdefault("LLM_PROVIDER", "offline")
+os.environ.setdefault("OFFLINE_LLM_SCRIPT_PATH", _SCRIPTS.name)
+os.environ.setdefault("OFFLINE_LLM_TTFT_MS", "20")
+os.environ.setdefault("OFFLINE_LLM_TOKEN_DELAY_MS", "2")
+
+from app.schemas.api.chat import BlueprintData, ChatRequest
+from app.services.discovery_service import DiscoveryStreamService
+from app.services.llm_cache import llm_cache
+
+# (token_flush_ms, token_flush_bytes)
+WINDOWS = [(0, 0), (25, 512), (50, 512), (100, 1024)]
+TOKEN_DELAY = 0.002
+
+
+async def _keep_blueprint(user_message, history, blueprint, **kwargs):
+    return blueprint
+
+
+async def _synthetic_stream(messages, blueprint, missing_fields, callbacks, user_id):
+    for word in _REPLY.split(" "):
+        await asyncio.sleep(TOKEN_DELAY)
+        yield word + " "
+
+
+def _source(name: str) -> ExitStack:
+    stack = ExitStack()
+    if name == "sse":
+        service = "app.services.discovery_service"
+        stack.enter_context(patch(f"{service}.analyze_user_message", _keep_blueprint))
+        stack.enter_context(patch(f"{service}.stream_response", _synthetic_stream))
+    return stack
+
+
+def _drain(reader: socket.socket) -> None:
+    try:
+        while reader.recv(1 << 16):
+            pass
+    except BlockingIOError:
+        pass
+
+
+async def _run(flush_ms: int, flush_bytes: int, runs: int) -> dict:
+    cpu = tokens = frames = size = 0.0
+    writer, reader = socket.socketpair()
+    reader.setblocking(False)
+    for run in range(runs):
+        request = ChatRequest(
+            message=f"I want to run a half marathon #{run}",
+            current_blueprint=BlueprintData(),
+            token_flush_ms=flush_ms,
+            token_flush_bytes=flush_bytes,
+        )
+        t0 = time.process_time()
+        async for event in DiscoveryStreamService(uow=None).stream_chat(request):
+            data = event.encode()
+            writer.sendall(data)
+            _drain(reader)  # the client reads as frames arrive
+            frames += 1
+            size += len(data)
+            tokens += event.startswith("event: token")
+        cpu += time.process_time() - t0
+    writer.close()
+    reader.close()
+    return {
+        "cpu_ms": cpu / runs * 1000,
+        "tokens": tokens / runs,
+        "frames": frames / runs,
+        "kb": size / runs / 1024,
+    }
+
+
+async def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    llm_cache.enabled = False
+
+    print(
+        f"{'source':<8} {'window':<12} {'cpu/resp (ms)':>13} {'token events':>13} "
+        f"{'writes/turn':>12} {'KB/turn':>8}"
+    )
+    for source in ("sse", "offline"):
+        baseline = None
+        with _source(source):
+            for flush_ms, flush_bytes in WINDOWS:
+                r = await _run(flush_ms, flush_bytes, runs)
+                baseline = baseline or r
+                delta = r["cpu_ms"] / baseline["cpu_ms"] - 1
+                print(
+                    f"{source:<8} {f'{flush_ms}ms/{flush_bytes}B':<12} "
+                    f"{r['cpu_ms']:>13.1f} {r['tokens']:>13.0f} "
+                    f"{r['frames']:>12.0f} {r['kb']:>8.1f}"
+                    + (f"   cpu {delta:+.0%}" if r is not baseline else "")
+                )
+    os.unlink(_SCRIPTS.name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,16 +16,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.agents.discovery.prompts import (
     _CHAT_SYSTEM_PROMPT,
     _PRE_ANALYSIS_SYSTEM_PROMPT,
+    _SUMMARY_SYSTEM_PROMPT,
 )
 from app.agents.roadmap.prompts import (
     _ACTION_GENERATOR_SYSTEM,
+    _BATCH_ACTION_GENERATOR_SYSTEM,
     _STRATEGIC_PLANNER_SYSTEM,
 )
 from app.core.config import settings
 from app.services.checkin_service import FALLBACK_CHECKIN_ANALYSIS_PROMPT
+from app.services.model_routing import DEFAULT_ROUTES
 from langfuse import Langfuse
 
-# All prompts that the app uses, keyed by Langfuse name
+# All prompts that the app uses, keyed by Langfuse name. Config carries the
+# model route (model, temperature, max_output_tokens) honored by get_llm()
 PROMPTS = {
     "discovery-chat": {
         "messages": [
@@ -35,28 +39,54 @@ PROMPTS = {
                 "content": "Latest: {{last_message}}\n\nHistory:\n{{history}}",
             },
         ],
-        "config": {"temperature": 0.7},
+        "config": DEFAULT_ROUTES["discovery-chat"].as_config(),
     },
     "discovery-analysis": {
         "messages": [
             {"role": "system", "content": _PRE_ANALYSIS_SYSTEM_PROMPT},
             {"role": "user", "content": "Analyze and return JSON only."},
         ],
-        "config": {"temperature": 0, "response_format": {"type": "json_object"}},
+        "config": {
+            **DEFAULT_ROUTES["discovery-analysis"].as_config(),
+            "response_format": {"type": "json_object"},
+        },
+    },
+    "discovery-summary": {
+        "messages": [
+            {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": "Update the summary."},
+        ],
+        "config": DEFAULT_ROUTES["discovery-summary"].as_config(),
     },
     "roadmap-planner": {
         "messages": [
             {"role": "system", "content": _STRATEGIC_PLANNER_SYSTEM},
             {"role": "user", "content": "Create the roadmap skeleton."},
         ],
-        "config": {"temperature": 0.3, "response_format": {"type": "json_object"}},
+        "config": {
+            **DEFAULT_ROUTES["roadmap-planner"].as_config(),
+            "response_format": {"type": "json_object"},
+        },
     },
     "roadmap-actions": {
         "messages": [
             {"role": "system", "content": _ACTION_GENERATOR_SYSTEM},
             {"role": "user", "content": "Generate actions."},
         ],
-        "config": {"temperature": 0.3, "response_format": {"type": "json_object"}},
+        "config": {
+            **DEFAULT_ROUTES["roadmap-actions"].as_config(),
+            "response_format": {"type": "json_object"},
+        },
+    },
+    "roadmap-actions-batch": {
+        "messages": [
+            {"role": "system", "content": _BATCH_ACTION_GENERATOR_SYSTEM},
+            {"role": "user", "content": "Generate actions for every milestone."},
+        ],
+        "config": {
+            **DEFAULT_ROUTES["roadmap-actions-batch"].as_config(),
+            "response_format": {"type": "json_object"},
+        },
     },
     "checkin-analysis": {
         "messages": [
@@ -66,7 +96,10 @@ PROMPTS = {
                 "content": 'User\'s check-in: "{{user_input}}"\n\nAvailable nodes:\n{{node_context}}\n\nAnalyze and return JSON with updates.',
             },
         ],
-        "config": {"temperature": 0, "response_format": {"type": "json_object"}},
+        "config": {
+            **DEFAULT_ROUTES["checkin-analysis"].as_config(),
+            "response_format": {"type": "json_object"},
+        },
     },
 }
 
@@ -0,0 +1,16 @@
+"""Tests for the shared (Postgres) tier of the LLM response cache."""
+
+import pytest
+from app.repositories.llm_cache_repo import LLMCacheRepository
+
+
+@pytest.mark.asyncio
+async def test_delete_expired_keeps_fresh_entries(db_session):
+    """Expired rows are purged; fresh ones are still served."""
+    repo = LLMCacheRepository(db_session)
+    await repo.upsert("stale", "roadmap-actions", "{}", ttl_seconds=-60)
+    await repo.upsert("fresh", "roadmap-actions", "{}", ttl_seconds=3600)
+
+    assert await repo.delete_expired() == 1
+    assert await repo.get_fresh("fresh") is not None
+    assert await repo.delete_expired() == 0
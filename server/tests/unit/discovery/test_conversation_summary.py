@@ -0,0 +1,130 @@
+"""
+Unit tests for the rolling conversation summary and token-budgeted history.
+
+Mocks the LLM pipeline and the unit of work - no database interaction.
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from app.agents.discovery.history import format_history, to_messages
+from app.schemas.api.chat import ChatRequest
+from app.services.conversation_cache import conversation_cache
+from app.services.conversation_summary import conversation_summarizer, messages_to_fold
+from app.services.discovery_service import DiscoveryStreamService
+
+CHAT_ID = str(uuid.uuid4())
+
+
+def _entry(order: int, tokens: int) -> dict:
+    role = "user" if order % 2 == 0 else "assistant"
+    return {"role": role, "content": f"m{order}", "tokens": tokens, "order": order}
+
+
+def test_history_is_summary_plus_newest_messages_within_budget():
+    history = [_entry(i, 40) for i in range(6)]
+
+    text = format_history(to_messages(history, summary="wants to run"), budget=100)
+
+    assert text.splitlines() == [
+        "Summary of the earlier conversation: wants to run",
+        "human: m4",
+        "ai: m5",
+    ]
+    # The newest message is kept even when it alone exceeds the budget
+    assert format_history(to_messages([_entry(0, 500)]), budget=100) == "human: m0"
+
+
+def test_messages_to_fold_leaves_half_the_budget():
+    assert messages_to_fold([_entry(i, 10) for i in range(6)], budget=100) == []
+
+    history = [_entry(i, 30) for i in range(6)]
+    assert [e["order"] for e in messages_to_fold(history, budget=100)] == [0, 1, 2, 3]
+
+
+class FakeConversations:
+    def __init__(self):
+        self.summaries: list[tuple[str, int]] = []
+
+    async def get_with_recent_messages(self, id, limit):
+        conversation = SimpleNamespace(
+            user_id="user-1",
+            summary=None,
+            summarized_messages=0,
+            blueprint=None,
+        )
+        entries = [_entry(i, 30) for i in range(4)]
+        messages = [
+            SimpleNamespace(
+                role=e["role"], content=e["content"], token_count=30, order=e["order"]
+            )
+            for e in entries
+        ]
+        return conversation, messages
+
+    async def append_message(self, conversation_id, role, content):
+        pass
+
+    async def update_blueprint(self, conversation_id, data):
+        pass
+
+    async def update_summary(self, conversation_id, summary, summarized_messages):
+        self.summaries.append((summary, summarized_messages))
+
+
+class FakeUow:
+    def __init__(self, conversations: FakeConversations):
+        self.conversations = conversations
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_older_turns_are_folded_into_the_summary_in_the_background():
+    conversations = FakeConversations()
+    seen: list[list[str]] = []
+
+    async def fake_analyze(user_message, history, blueprint, **kwargs):
+        seen.append([f"{m.type}: {m.content}" for m in history])
+        return blueprint
+
+    async def fake_stream(messages, blueprint, missing_fields, callbacks, user_id):
+        yield "reply"
+
+    async def fake_summarize(summary, messages, user_id=None):
+        return f"summary of {len(messages)}"
+
+    service = DiscoveryStreamService(FakeUow(conversations))
+    conversation_cache.invalidate(CHAT_ID)
+    with (
+        patch("app.services.discovery_service.analyze_user_message", fake_analyze),
+        patch("app.services.discovery_service.stream_response", fake_stream),
+        patch("app.services.conversation_summary.summarize_history", fake_summarize),
+        patch.object(conversation_summarizer, "token_budget", 100),
+        patch.object(
+            conversation_summarizer, "uow_factory", lambda: FakeUow(conversations)
+        ),
+    ):
+        for message in ("first", "second"):
+            request = ChatRequest(
+                chat_id=CHAT_ID, message=message, use_server_history=True
+            )
+            [e async for e in service.stream_chat(request, "user-1")]
+            if task := conversation_summarizer._running.get(CHAT_ID):
+                await task
+    conversation_cache.invalidate(CHAT_ID)
+
+    # 4 loaded (30 each) + "first" + reply > 100 tokens: fold down to <= 50
+    assert conversations.summaries == [("summary of 3", 3)]
+    assert seen[1] == [
+        "system: summary of 3",
+        "ai: m3",
+        "human: first",
+        "ai: reply",
+    ]
@@ -0,0 +1,47 @@
+"""
+Unit tests for the local fast path that skips pre-analysis on trivial turns.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from app.agents.discovery.fast_path import trivial_turn_reason
+from app.agents.discovery.pipeline import analyze_user_message
+from app.core.metrics import metrics
+from app.schemas.api.chat import BlueprintData, FieldScores
+
+EMPTY = BlueprintData()
+TENTATIVE = BlueprintData(timeline="6 months", field_scores=FieldScores(timeline=40))
+
+
+@pytest.mark.parametrize(
+    "message,blueprint,expected",
+    [
+        ("ok", EMPTY, "filler"),
+        ("Thanks!", TENTATIVE, "filler"),
+        ("네 계속해주세요", EMPTY, "affirmation"),
+        ("yes, continue", EMPTY, "affirmation"),
+        ("yes", TENTATIVE, None),  # may confirm the proposed timeline
+        ("ok, 3 months", EMPTY, None),
+        ("I want to run a marathon", EMPTY, None),
+        ("no", EMPTY, None),
+        ("ok " * 20, EMPTY, None),
+    ],
+)
+def test_trivial_turn_reason(message, blueprint, expected):
+    assert trivial_turn_reason(message, blueprint) == expected
+
+
+@pytest.mark.asyncio
+async def test_trivial_turn_skips_llm_and_keeps_blueprint():
+    metrics.reset()
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("analysis LLM must not be called")
+
+    with patch("langchain_core.runnables.base.RunnableSequence.ainvoke", fail):
+        result = await analyze_user_message("thanks!", [], TENTATIVE)
+
+    assert result is TENTATIVE
+    assert metrics.counter_value("discovery_analysis_total", {"path": "skipped"}) == 1
+    assert metrics.snapshot()["gauges"]["discovery_analysis_skip_rate"] == {"": 1.0}
@@ -0,0 +1,83 @@
+"""
+Unit tests for the sequential and speculative discovery response modes.
+
+Mocks analysis and response streaming - no LLM or database interaction.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from app.schemas.api.chat import BlueprintData, ChatRequest, FieldScores
+from app.services.discovery_service import DiscoveryStreamService
+
+COMPLETE = FieldScores(goal=80, why=80, timeline=80, obstacles=80, resources=80)
+
+
+@pytest.fixture
+def streams():
+    """Fake pipeline; records (missing fields, cancelled) per response stream."""
+    streams: list[dict] = []
+
+    async def fake_analyze(user_message, history, blueprint, **kwargs):
+        await asyncio.sleep(0.02)
+        if user_message == "complete":
+            return blueprint.model_copy(update={"field_scores": COMPLETE})
+        return blueprint
+
+    async def fake_stream(messages, blueprint, missing_fields, callbacks, user_id):
+        stream = {"missing": missing_fields, "cancelled": False}
+        streams.append(stream)
+        try:
+            for token in ("ask ", ",".join(missing_fields) or "done"):
+                await asyncio.sleep(0.03)
+                yield token
+        except asyncio.CancelledError:
+            stream["cancelled"] = True
+            raise
+
+    with (
+        patch("app.services.discovery_service.analyze_user_message", fake_analyze),
+        patch("app.services.discovery_service.stream_response", fake_stream),
+    ):
+        yield streams
+
+
+async def _reply(message: str, mode: str) -> str:
+    request = ChatRequest(
+        message=message, current_blueprint=BlueprintData(), response_mode=mode
+    )
+    events = [e async for e in DiscoveryStreamService(uow=None).stream_chat(request)]
+    tokens = [
+        json.loads(e.split("data: ", 1)[1])["text"]
+        for e in events
+        if e.startswith("event: token")
+    ]
+    return "".join(tokens)
+
+
+@pytest.mark.asyncio
+async def test_speculative_response_is_kept_when_missing_fields_match(streams):
+    reply = await _reply("hello", "speculative")
+
+    assert reply == "ask goal,why,timeline,obstacles,resources"
+    assert len(streams) == 1
+
+
+@pytest.mark.asyncio
+async def test_speculative_response_restarts_when_missing_fields_change(streams):
+    reply = await _reply("complete", "speculative")
+
+    assert reply == "ask done"
+    assert [s["missing"] for s in streams] == [
+        ["goal", "why", "timeline", "obstacles", "resources"],
+        [],
+    ]
+    assert streams[0]["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_sequential_mode_streams_after_analysis(streams):
+    assert await _reply("complete", "sequential") == "ask done"
+    assert len(streams) == 1
@@ -0,0 +1,114 @@
+"""
+Unit tests for delta-only chat requests backed by the conversation cache.
+
+Mocks the LLM pipeline and the unit of work - no database interaction.
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from app.schemas.api.chat import ChatRequest
+from app.services.conversation_cache import conversation_cache
+from app.services.discovery_service import DiscoveryStreamService
+
+CHAT_ID = str(uuid.uuid4())
+
+
+class FakeConversations:
+    def __init__(self):
+        self.loads = 0
+        self.appended: list[tuple[str, str]] = []
+
+    async def get_with_recent_messages(self, id, limit):
+        self.loads += 1
+        conversation = SimpleNamespace(
+            user_id="user-1",
+            summary=None,
+            summarized_messages=0,
+            blueprint=SimpleNamespace(
+                goal="Run a half marathon",
+                why=None,
+                timeline=None,
+                obstacles=None,
+                resources=None,
+                milestones=None,
+                uncertainties=[],
+                field_scores={"goal": 70},
+            ),
+        )
+        messages = [
+            SimpleNamespace(
+                role="user", content="I want to run", token_count=4, order=0
+            )
+        ]
+        return conversation, messages
+
+    async def append_message(self, conversation_id, role, content):
+        self.appended.append((role, content))
+
+    async def update_blueprint(self, conversation_id, data):
+        pass
+
+
+class FakeUow:
+    def __init__(self):
+        self.conversations = FakeConversations()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def seen():
+    """Fake pipeline; records the history and blueprint each turn saw."""
+    seen: list[dict] = []
+
+    async def fake_analyze(user_message, history, blueprint, **kwargs):
+        seen.append({"history": [m.content for m in history], "goal": blueprint.goal})
+        return blueprint
+
+    async def fake_stream(messages, blueprint, missing_fields, callbacks, user_id):
+        yield f"reply to {messages[-1].content}"
+
+    conversation_cache.invalidate(CHAT_ID)
+    with (
+        patch("app.services.discovery_service.analyze_user_message", fake_analyze),
+        patch("app.services.discovery_service.stream_response", fake_stream),
+    ):
+        yield seen
+    conversation_cache.invalidate(CHAT_ID)
+
+
+async def _turn(service, message: str, user_id: str = "user-1") -> list[str]:
+    request = ChatRequest(chat_id=CHAT_ID, message=message, use_server_history=True)
+    return [e async for e in service.stream_chat(request, user_id)]
+
+
+@pytest.mark.asyncio
+async def test_history_and_blueprint_come_from_the_server(seen):
+    uow = FakeUow()
+    service = DiscoveryStreamService(uow)
+
+    await _turn(service, "in 6 months")
+    await _turn(service, "for my health")
+
+    assert uow.conversations.loads == 1  # second turn is a cache hit
+    assert seen[0] == {"history": ["I want to run"], "goal": "Run a half marathon"}
+    assert seen[1]["history"] == [
+        "I want to run",
+        "in 6 months",
+        "reply to in 6 months",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_other_users_conversation_is_not_served(seen):
+    events = await _turn(DiscoveryStreamService(FakeUow()), "hi", user_id="intruder")
+
+    assert any("conversation_not_found" in e for e in events)
+    assert not seen
@@ -1,25 +1,23 @@
 """
 Unit test for discovery agent uncertainty extraction.
 
-This tests the analyze_turn pipeline logic with mocked LLM responses.
+This tests the analyze_user_message pipeline logic and the uncertainty
+registry with mocked LLM responses.
 No database interaction - pure logic validation.
 """
 
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from app.agents.discovery.pipeline import analyze_turn
+from app.agents.discovery.pipeline import analyze_user_message
+from app.agents.discovery.uncertainty import UncertaintyRegistry
 from app.schemas.api.chat import BlueprintData, FieldScores
-from langchain_core.messages import HumanMessage
 
 
 @pytest.mark.asyncio
 async def test_uncertainty_extraction_updates_blueprint():
     """Test that uncertainties are correctly extracted and stored in blueprint."""
     blueprint = BlueprintData(goal="Learn Python", field_scores=FieldScores(goal=50))
-    messages = [
-        HumanMessage(content="I want to learn Python but I'm not sure when to start.")
-    ]
 
     mock_response = {
         "extracted": {"timeline": "Unsure"},
@@ -32,7 +30,9 @@ async def test_uncertainty_extraction_updates_blueprint():
     ) as mock_invoke:
         mock_invoke.return_value = mock_response
 
-        result = await analyze_turn(messages, blueprint)
+        result = await analyze_user_message(
+            "I want to learn Python but I'm not sure when to start.", [], blueprint
+        )
 
         # Verify Uncertainty Persistence
         assert result.uncertainties is not None
@@ -49,11 +49,6 @@ async def test_uncertainty_extraction_updates_blueprint():
 async def test_uncertainty_with_multiple_fields():
     """Test handling multiple uncertainties from single turn."""
     blueprint = BlueprintData(goal="Career change", field_scores=FieldScores(goal=40))
-    messages = [
-        HumanMessage(
-            content="I want to change careers but not sure about timeline or obstacles."
-        )
-    ]
 
     mock_response = {
         "extracted": {"timeline": "Unknown", "obstacles": "Unclear"},
@@ -69,24 +64,78 @@ async def test_uncertainty_with_multiple_fields():
     ) as mock_invoke:
         mock_invoke.return_value = mock_response
 
-        result = await analyze_turn(messages, blueprint)
+        result = await analyze_user_message(
+            "I want to change careers but not sure about timeline or obstacles.",
+            [],
+            blueprint,
+        )
 
         assert len(result.uncertainties) == 2
 
 
 @pytest.mark.asyncio
-async def test_analyze_turn_returns_unchanged_on_failure():
+async def test_near_duplicate_uncertainties_are_merged_and_resolved():
+    """Punctuation/spacing variants of an existing item only update its state."""
+    blueprint = BlueprintData(
+        goal="Career change",
+        uncertainties=[{"text": "Timeline not defined", "type": "timeline"}],
+    )
+
+    mock_response = {
+        "uncertainties": [
+            {"text": "timeline  not defined!", "type": "timeline", "resolved": True}
+        ],
+    }
+
+    with patch(
+        "langchain_core.runnables.base.RunnableSequence.ainvoke", new_callable=AsyncMock
+    ) as mock_invoke:
+        mock_invoke.return_value = mock_response
+
+        result = await analyze_user_message(
+            "I'll switch careers by next March.", [], blueprint
+        )
+
+        assert [(u["text"], u["resolved"]) for u in result.uncertainties] == [
+            ("Timeline not defined", True)
+        ]
+        assert blueprint.uncertainties[0].get("resolved") is None  # not mutated
+
+
+@pytest.mark.asyncio
+async def test_analyze_returns_unchanged_on_failure():
     """Test that blueprint is returned unchanged if analysis fails."""
     blueprint = BlueprintData(goal="Original Goal", field_scores=FieldScores(goal=50))
-    messages = [HumanMessage(content="Some message")]
 
     with patch(
         "langchain_core.runnables.base.RunnableSequence.ainvoke", new_callable=AsyncMock
     ) as mock_invoke:
         mock_invoke.side_effect = Exception("LLM Error")
 
-        result = await analyze_turn(messages, blueprint)
+        result = await analyze_user_message("Some message", [], blueprint)
 
         # Should return original blueprint unchanged
         assert result.goal == "Original Goal"
         assert result.field_scores.goal == 50
+
+
+def test_registry_merges_similar_items_and_caps_prompt_items():
+    registry = UncertaintyRegistry(
+        [
+            {"text": "주당 훈련 가능 시간이 불확실함", "type": "resources"},
+            {"text": "Budget unknown", "type": "resources"},
+        ],
+        similarity_threshold=0.75,
+    )
+
+    registry.add({"text": "주당 훈련 시간이 불확실함"})  # 4/5 words shared
+    assert len(registry) == 2
+    assert registry.resolve("BUDGET unknown.")
+    assert registry.find("budget unknown")["resolved"]
+
+    registry.merge({"text": f"Open question {i}"} for i in range(10))
+    assert [u["text"] for u in registry.unresolved(limit=3)] == [
+        "Open question 9",
+        "Open question 8",
+        "Open question 7",
+    ]
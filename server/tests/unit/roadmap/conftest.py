@@ -0,0 +1,110 @@
+"""
+Roadmap unit fixtures: an in-memory roadmap store behind a fake unit of work.
+
+Lets RoadmapStreamService run its real persist/load helpers without a
+database; nodes are plain namespaces with the columns the service reads.
+"""
+
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from app.models.node import NodeType
+
+
+def _node(roadmap_id, parent_id, type: NodeType, data: dict, order: int):
+    return SimpleNamespace(
+        id=uuid4(),
+        roadmap_id=roadmap_id,
+        parent_id=parent_id,
+        type=type,
+        label=data.get("label", ""),
+        details=data.get("details"),
+        order=data.get("order", order),
+        is_assumed=data.get("is_assumed", False),
+        start_date=data.get("start_date"),
+        end_date=data.get("end_date"),
+        completion_criteria=data.get("completion_criteria"),
+    )
+
+
+class FakeRoadmapRepository:
+    """The RoadmapRepository calls the roadmap service makes, in memory."""
+
+    def __init__(self):
+        self.roadmaps: dict[UUID, SimpleNamespace] = {}
+
+    async def create_skeleton(
+        self, user_id, title, goal, milestones_data, conversation_id=None
+    ):
+        roadmap = SimpleNamespace(id=uuid4(), goal=goal, status="draft", nodes=[])
+        goal_node = _node(roadmap.id, None, NodeType.GOAL, {"label": goal}, 0)
+        roadmap.nodes.append(goal_node)
+        for i, m in enumerate(milestones_data):
+            roadmap.nodes.append(
+                _node(roadmap.id, goal_node.id, NodeType.MILESTONE, m, i)
+            )
+        self.roadmaps[roadmap.id] = roadmap
+        return roadmap
+
+    async def get(self, roadmap_id):
+        return self.roadmaps.get(UUID(str(roadmap_id)))
+
+    async def add_actions_to_roadmap(
+        self,
+        roadmap_id,
+        milestone_actions,
+        goal_actions=None,
+        activate=True,
+        replace=False,
+    ):
+        roadmap = await self.get(roadmap_id)
+        ms_ids = {UUID(str(ms_id)) for ms_id in milestone_actions}
+        if replace:
+            roadmap.nodes = [
+                n
+                for n in roadmap.nodes
+                if not (n.type == NodeType.ACTION and n.parent_id in ms_ids)
+            ]
+        for ms_id, actions in milestone_actions.items():
+            for i, a in enumerate(actions):
+                roadmap.nodes.append(
+                    _node(roadmap.id, UUID(str(ms_id)), NodeType.ACTION, a, i)
+                )
+        goal = next(n for n in roadmap.nodes if n.type == NodeType.GOAL)
+        for i, a in enumerate(goal_actions or []):
+            roadmap.nodes.append(_node(roadmap.id, goal.id, NodeType.ACTION, a, i))
+        if activate:
+            roadmap.status = "active"
+        return roadmap
+
+    def actions_by_milestone(self, roadmap_id) -> dict[str, list[str]]:
+        """Milestone label -> saved action labels."""
+        roadmap = self.roadmaps[UUID(str(roadmap_id))]
+        labels = {n.id: n.label for n in roadmap.nodes if n.type == NodeType.MILESTONE}
+        saved: dict[str, list[str]] = {label: [] for label in labels.values()}
+        for n in roadmap.nodes:
+            if n.type == NodeType.ACTION and n.parent_id in labels:
+                saved[labels[n.parent_id]].append(n.label)
+        return saved
+
+
+class FakeUnitOfWork:
+    def __init__(self, roadmaps: FakeRoadmapRepository):
+        self.roadmaps = roadmaps
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+
+@pytest.fixture
+def roadmap_store() -> FakeRoadmapRepository:
+    return FakeRoadmapRepository()
+
+
+@pytest.fixture
+def roadmap_uow(roadmap_store) -> FakeUnitOfWork:
+    return FakeUnitOfWork(roadmap_store)
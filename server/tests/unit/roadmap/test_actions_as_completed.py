@@ -0,0 +1,54 @@
+"""
+Unit tests for completion-ordered action generation.
+
+Mocks the LLM chain with per-milestone latencies - no database interaction.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from app.agents.roadmap.pipeline import generate_actions, generate_actions_as_completed
+from app.schemas.events.roadmap import GoalNode, Milestone
+
+LATENCY = {"Slow": 0.05, "Medium": 0.02, "Fast": 0.0}
+
+
+def _goal_node() -> GoalNode:
+    return GoalNode(
+        id="goal-1",
+        label="Test Goal",
+        milestones=[
+            Milestone(id=f"ms-{label.lower()}", label=label, order=i)
+            for i, label in enumerate(LATENCY)
+        ],
+    )
+
+
+async def _fake_ainvoke(self, variables, *args, **kwargs):
+    await asyncio.sleep(LATENCY[variables["milestone_label"]])
+    return {"actions": [{"label": f"{variables['milestone_label']} action"}]}
+
+
+@pytest.mark.asyncio
+async def test_milestones_yielded_in_completion_order():
+    """The fastest milestone is yielded first, not the first in order."""
+    with patch("langchain_core.runnables.base.RunnableSequence.ainvoke", _fake_ainvoke):
+        labels = [
+            ms.label
+            async for ms in generate_actions_as_completed(
+                _goal_node(), {"goal": "Test Goal"}
+            )
+        ]
+
+    assert labels == ["Fast", "Medium", "Slow"]
+
+
+@pytest.mark.asyncio
+async def test_generate_actions_keeps_milestone_order():
+    """The collected GoalNode still lists milestones in their original order."""
+    with patch("langchain_core.runnables.base.RunnableSequence.ainvoke", _fake_ainvoke):
+        result = await generate_actions(_goal_node(), {"goal": "Test Goal"})
+
+    assert [ms.label for ms in result.milestones] == ["Slow", "Medium", "Fast"]
+    assert result.milestones[0].actions[0].label == "Slow action"
@@ -0,0 +1,98 @@
+"""
+Unit tests for retrying an interrupted stream_actions run.
+
+Runs the service against the in-memory roadmap store with a patched action
+generator - no database or LLM interaction.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from app.schemas.events.roadmap import ActionNode
+from app.services.roadmap_service import RoadmapStreamService
+
+LABELS = ["Base mileage", "Long runs", "Taper"]
+
+
+@pytest.fixture
+def generated():
+    """Patches action generation; records the milestones sent to the LLM."""
+    calls: list[str] = []
+
+    async def fake_as_completed(goal_node, context, **kwargs):
+        for ms in goal_node.milestones:
+            calls.append(ms.label)
+            await asyncio.sleep(0)
+            action = ActionNode(id=f"a-{ms.order}", label=f"{ms.label} action")
+            yield ms.model_copy(update={"actions": [action]})
+
+    with patch(
+        "app.services.roadmap_service.generate_actions_as_completed",
+        fake_as_completed,
+    ):
+        yield calls
+
+
+async def _draft(roadmap_store) -> str:
+    roadmap = await roadmap_store.create_skeleton(
+        user_id="user-1",
+        title="Half marathon",
+        goal="Half marathon",
+        milestones_data=[
+            {"label": label, "order": i} for i, label in enumerate(LABELS)
+        ],
+    )
+    return str(roadmap.id)
+
+
+def _events(frames: list[str]) -> list[tuple[str, dict]]:
+    events = []
+    for frame in frames:
+        event, data = frame.strip().split("\n")[:2]
+        events.append((event.removeprefix("event: "), json.loads(data[6:])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_retry_after_interruption_does_not_duplicate_actions(
+    roadmap_store, roadmap_uow, generated
+):
+    roadmap_id = await _draft(roadmap_store)
+    service = RoadmapStreamService(roadmap_uow)
+
+    # First run: the client drops after the first milestone's actions
+    stream = service.stream_actions(roadmap_id, "user-1")
+    async for frame in stream:
+        if frame.startswith("event: roadmap_actions"):
+            break
+    await stream.aclose()
+    assert roadmap_store.actions_by_milestone(roadmap_id)["Base mileage"]
+
+    # Retry: only the unsaved milestones go to the LLM
+    generated.clear()
+    events = _events([f async for f in service.stream_actions(roadmap_id, "user-1")])
+
+    assert generated == ["Long runs", "Taper"]
+    assert roadmap_store.actions_by_milestone(roadmap_id) == {
+        label: [f"{label} action"] for label in LABELS
+    }
+    actions = [data for name, data in events if name == "roadmap_actions"]
+    assert len(actions) == 3  # the saved milestone is replayed from the DB
+    assert events[-1][0] == "roadmap_complete"
+
+
+@pytest.mark.asyncio
+async def test_resaving_a_milestone_replaces_its_actions(roadmap_store, roadmap_uow):
+    roadmap_id = await _draft(roadmap_store)
+    service = RoadmapStreamService(roadmap_uow)
+    ms = (await service._load_goal_node(roadmap_id)).milestones[0]
+
+    for label in ("first", "second"):
+        action = ActionNode(id="a-0", label=label)
+        await service._persist_milestone_actions(
+            roadmap_id, ms.model_copy(update={"actions": [action]})
+        )
+
+    assert roadmap_store.actions_by_milestone(roadmap_id)["Base mileage"] == ["second"]
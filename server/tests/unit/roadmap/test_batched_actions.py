@@ -0,0 +1,70 @@
+"""
+Unit tests for the batched action generation strategy.
+
+Mocks the LLM chain - no database interaction.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from app.agents.roadmap.pipeline import choose_actions_strategy, generate_actions
+from app.core.config import settings
+from app.schemas.events.roadmap import GoalNode, Milestone
+
+
+def _goal_node(count: int) -> GoalNode:
+    return GoalNode(
+        id="goal-1",
+        label="Batch Goal",
+        milestones=[
+            Milestone(id=f"ms-{i}", label=f"Milestone {i}", order=i)
+            for i in range(count)
+        ],
+    )
+
+
+@pytest.fixture
+def calls():
+    calls: list[dict] = []
+
+    async def fake_ainvoke(self, variables, *args, **kwargs):
+        calls.append(variables)
+        if "milestones" in variables:
+            # Batched reply that skips the last milestone of the chunk
+            lines = variables["milestones"].splitlines()
+            return {
+                "milestones": [
+                    {"index": i, "actions": [{"label": f"batched {i}"}]}
+                    for i in range(len(lines) - 1)
+                ]
+            }
+        return {"actions": [{"label": f"single {variables['milestone_label']}"}]}
+
+    with patch("langchain_core.runnables.base.RunnableSequence.ainvoke", fake_ainvoke):
+        yield calls
+
+
+@pytest.mark.asyncio
+async def test_batched_uses_one_call_per_chunk(calls):
+    """4 milestones in chunks of 2 -> 2 batch calls, plus fallbacks for gaps."""
+    with patch.object(settings, "ACTIONS_BATCH_CHUNK_SIZE", 2):
+        result = await generate_actions(
+            _goal_node(4), {"goal": "Batch goal A"}, strategy="batched"
+        )
+
+    batch_calls = [c for c in calls if "milestones" in c]
+    assert len(batch_calls) == 2
+    assert [ms.actions[0].label for ms in result.milestones] == [
+        "batched 0",
+        "single Milestone 1",
+        "batched 0",
+        "single Milestone 3",
+    ]
+    assert result.milestones[2].actions[0].id.startswith("ms-2-")
+
+
+def test_auto_batches_from_milestone_threshold():
+    with patch.object(settings, "ACTIONS_BATCH_MIN_MILESTONES", 3):
+        assert choose_actions_strategy("auto", 2) == "per_milestone"
+        assert choose_actions_strategy("auto", 3) == "batched"
+        assert choose_actions_strategy("per_milestone", 8) == "per_milestone"
@@ -0,0 +1,21 @@
+"""
+Unit tests for the roadmap_partial SSE event.
+"""
+
+import json
+
+from app.schemas.events.roadmap import Milestone
+from app.services.roadmap_service import RoadmapStreamService
+
+
+def test_partial_event_names_milestones_missing_actions():
+    missing = [Milestone(id="ms-2", label="Increase distance")]
+
+    frame = RoadmapStreamService._partial_event("rm-1", missing)
+
+    event, data = frame.strip().split("\n")
+    assert event == "event: roadmap_partial"
+    payload = json.loads(data.removeprefix("data: "))
+    assert payload["roadmap_id"] == "rm-1"
+    assert payload["missing"] == [{"id": "ms-2", "label": "Increase distance"}]
+    assert payload["reason"] == "generation_failed"
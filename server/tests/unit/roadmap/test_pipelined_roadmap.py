@@ -0,0 +1,125 @@
+"""
+Unit tests for one-shot pipelined generation (_stream_roadmap_pipelined).
+
+A fake planner yields milestones one at a time and a fake action call records
+when it starts; results are persisted to the in-memory roadmap store - no
+database or LLM interaction.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from app.schemas.api.roadmaps import GenerateRoadmapRequest
+from app.schemas.events.roadmap import ActionNode, GoalNode
+from app.schemas.llm.roadmap import MilestoneContent
+from app.services.roadmap_service import RoadmapStreamService
+from app.utils.roadmap import assign_milestone_ids
+
+REQUEST = GenerateRoadmapRequest(
+    conversation_id="", goal="Half marathon", pipelined=True
+)
+
+
+def _goal(labels: list[str]) -> GoalNode:
+    return GoalNode(
+        id="goal-1",
+        label="Half marathon",
+        milestones=assign_milestone_ids(
+            [MilestoneContent(label=label) for label in labels]
+        ),
+        actions=[ActionNode(id="g-1", label="Buy shoes")],
+    )
+
+
+@pytest.fixture
+def pipeline():
+    """Fake planner + action calls sharing one timeline of what happened."""
+    state = {"scanned": [], "final": [], "no_actions": set(), "log": []}
+
+    async def fake_stream(context, user_id=None):
+        for label in state["scanned"]:
+            await asyncio.sleep(0.01)
+            state["log"].append(f"scanned {label}")
+            yield MilestoneContent(label=label)
+        await asyncio.sleep(0.01)
+        state["log"].append("planner done")
+        yield _goal(state["final"])
+
+    async def fake_actions(ms, goal_text, user_id=None):
+        state["log"].append(f"actions {ms.label}")
+        if ms.label in state["no_actions"]:
+            return ms
+        action = ActionNode(id=f"a-{ms.id}", label=f"{ms.label} action")
+        return ms.model_copy(update={"actions": [action]})
+
+    service = "app.services.roadmap_service"
+    with (
+        patch(f"{service}.stream_skeleton_milestones", fake_stream),
+        patch(f"{service}.generate_milestone_actions", fake_actions),
+    ):
+        yield state
+
+
+async def _run(roadmap_uow) -> list[tuple[str, dict]]:
+    service = RoadmapStreamService(roadmap_uow)
+    events = []
+    async for frame in service._stream_roadmap_pipelined(REQUEST, "user-1"):
+        event, data = frame.strip().split("\n")[:2]
+        events.append((event.removeprefix("event: "), json.loads(data[6:])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_actions_overlap_planning_and_persist_under_db_ids(
+    pipeline, roadmap_store, roadmap_uow
+):
+    labels = ["Base mileage", "Long runs", "Taper"]
+    pipeline["scanned"] = pipeline["final"] = labels
+
+    events = await _run(roadmap_uow)
+
+    log = pipeline["log"]
+    assert log.index("actions Base mileage") < log.index("scanned Long runs")
+    assert log.index("actions Taper") < log.index("planner done")
+
+    names = [name for name, _ in events]
+    assert names[:4] == ["roadmap_milestone"] * 3 + ["roadmap_skeleton"]
+    assert names[-1] == "roadmap_complete"
+    skeleton = dict(events)["roadmap_skeleton"]
+    db_ids = {ms["label"]: ms["id"] for ms in skeleton["goal"]["milestones"]}
+    actions = {
+        data["milestone_id"]: data["actions"][0]["label"]
+        for name, data in events
+        if name == "roadmap_actions" and data["milestone_id"]
+    }
+    assert actions == {db_ids[label]: f"{label} action" for label in labels}
+
+    roadmap_id = skeleton["roadmap_id"]
+    assert roadmap_store.actions_by_milestone(roadmap_id) == {
+        label: [f"{label} action"] for label in labels
+    }
+    assert (await roadmap_store.get(roadmap_id)).status == "active"
+
+
+@pytest.mark.asyncio
+async def test_skipped_or_changed_milestones_get_their_own_actions(
+    pipeline, roadmap_store, roadmap_uow
+):
+    # The scanner missed "Long runs" and saw a label the final output changed
+    pipeline["scanned"] = ["Base mileage", "Taper (draft)"]
+    pipeline["final"] = ["Base mileage", "Long runs", "Taper"]
+    pipeline["no_actions"] = {"Taper"}
+
+    events = await _run(roadmap_uow)
+
+    roadmap_id = dict(events)["roadmap_skeleton"]["roadmap_id"]
+    assert roadmap_store.actions_by_milestone(roadmap_id) == {
+        "Base mileage": ["Base mileage action"],
+        "Long runs": ["Long runs action"],
+        "Taper": [],
+    }
+    partial = dict(events)["roadmap_partial"]
+    assert [ms["label"] for ms in partial["missing"]] == ["Taper"]
+    assert [name for name, _ in events][-2:] == ["roadmap_partial", "roadmap_complete"]
@@ -0,0 +1,68 @@
+"""
+Unit tests for skeleton speculation during discovery.
+
+Drives the discovery trigger and the skeleton claim with a patched planner
+call - no database interaction.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from app.schemas.api.chat import BlueprintData
+from app.schemas.events.roadmap import GoalNode
+from app.services.discovery_service import DiscoveryStreamService
+from app.services.roadmap_service import RoadmapStreamService
+from app.services.speculation import speculative_skeletons
+from app.utils.roadmap import skeleton_context
+
+BLUEPRINT = BlueprintData(
+    goal="Run a marathon",
+    why="Health",
+    timeline="6 months",
+    obstacles="Knee pain",
+    resources="Weekends",
+)
+
+
+@pytest.fixture
+def planner_calls():
+    calls: list[dict] = []
+
+    async def fake_generate_skeleton(context, user_id=None, priority=None):
+        calls.append(context)
+        return GoalNode(id="goal-1", label=context["goal"])
+
+    with patch(
+        "app.services.discovery_service.generate_skeleton", fake_generate_skeleton
+    ):
+        yield calls
+    speculative_skeletons.discard("chat-1")
+
+
+@pytest.mark.asyncio
+async def test_unchanged_blueprint_is_served_from_speculation(planner_calls):
+    """A matching request reuses the speculated skeleton."""
+    DiscoveryStreamService._speculate_skeleton("chat-1", BLUEPRINT, "user-1")
+    DiscoveryStreamService._speculate_skeleton("chat-1", BLUEPRINT, "user-1")
+
+    goal_node = await RoadmapStreamService._claim_speculative_skeleton(
+        "chat-1", skeleton_context(BLUEPRINT)
+    )
+
+    assert goal_node is not None and goal_node.label == "Run a marathon"
+    assert len(planner_calls) == 1
+    assert not speculative_skeletons.has_scope("chat-1")
+
+
+@pytest.mark.asyncio
+async def test_changed_blueprint_falls_back_to_live(planner_calls):
+    """Editing any blueprint field after speculation forces a live call."""
+    DiscoveryStreamService._speculate_skeleton("chat-1", BLUEPRINT, "user-1")
+    edited = BLUEPRINT.model_copy(update={"timeline": "3 months"})
+
+    goal_node = await RoadmapStreamService._claim_speculative_skeleton(
+        "chat-1", skeleton_context(edited)
+    )
+
+    assert goal_node is None
+    assert not speculative_skeletons.has_scope("chat-1")
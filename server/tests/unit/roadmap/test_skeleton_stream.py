@@ -0,0 +1,42 @@
+"""
+Unit tests for streaming skeleton generation with the offline scripted LLM.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from app.agents.roadmap.pipeline import stream_skeleton_milestones
+from app.schemas.events.roadmap import GoalNode
+from app.schemas.llm.roadmap import MilestoneContent
+from app.services.offline_llm import ScriptedChatModel
+
+
+@pytest.mark.asyncio
+async def test_milestones_stream_before_final_goal_node():
+    """Every milestone is yielded before the complete GoalNode."""
+    llm = ScriptedChatModel(prompt_name="roadmap-planner", ttft_ms=0, token_delay_ms=0)
+
+    with patch("app.agents.roadmap.pipeline.get_llm", return_value=llm):
+        items = [
+            item async for item in stream_skeleton_milestones({"goal": "Half marathon"})
+        ]
+
+    assert all(isinstance(i, MilestoneContent) for i in items[:-1])
+    assert isinstance(items[-1], GoalNode)
+    assert [m.label for m in items[:-1]] == [m.label for m in items[-1].milestones]
+
+
+@pytest.mark.asyncio
+async def test_unparseable_output_yields_no_goal_node():
+    """Broken planner output ends the stream without a GoalNode."""
+    llm = ScriptedChatModel(
+        prompt_name="roadmap-planner",
+        ttft_ms=0,
+        token_delay_ms=0,
+        scripts={"roadmap-planner": "Sorry, I can't help with that."},
+    )
+
+    with patch("app.agents.roadmap.pipeline.get_llm", return_value=llm):
+        items = [item async for item in stream_skeleton_milestones({"goal": "x"})]
+
+    assert not any(isinstance(i, GoalNode) for i in items)
@@ -0,0 +1,54 @@
+"""
+Unit tests for the compiled chain registry.
+
+Uses the offline scripted model - no network calls.
+"""
+
+from app.services.chain_registry import ChainRegistry
+from app.services.offline_llm import ScriptedChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+builds: list[str] = []
+
+
+def _build(prompt, llm):
+    builds.append(prompt.messages[0].prompt.template)
+    return prompt | llm | StrOutputParser()
+
+
+def _prompt(text: str) -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([("system", text)])
+
+
+def test_chain_built_once_per_prompt_version_and_model():
+    registry = ChainRegistry()
+    llm = ScriptedChatModel(prompt_name="test", ttft_ms=0, token_delay_ms=0)
+    v1 = _prompt("v1 {x}")
+    builds.clear()
+
+    first = registry.get("test", v1, llm, _build)
+    again = registry.get("test", v1, llm, _build)
+    # An equal prompt object (e.g. reloaded from Langfuse) maps to the same version
+    equal = registry.get("test", _prompt("v1 {x}"), llm, _build)
+    changed = registry.get("test", _prompt("v2 {x}"), llm, _build)
+
+    assert first.runnable is again.runnable is equal.runnable
+    assert changed.prompt_version != first.prompt_version
+    assert changed.runnable is not first.runnable
+    assert builds == ["v1 {x}", "v2 {x}"]
+
+
+def test_new_llm_instance_and_invalidate_rebuild():
+    registry = ChainRegistry()
+    prompt = _prompt("hello {x}")
+    llm = ScriptedChatModel(prompt_name="test", ttft_ms=0, token_delay_ms=0)
+    other = ScriptedChatModel(prompt_name="test", ttft_ms=0, token_delay_ms=0)
+
+    first = registry.get("test", prompt, llm, _build)
+    swapped = registry.get("test", prompt, other, _build)
+    assert swapped.runnable is not first.runnable
+
+    registry.invalidate()
+    assert len(registry) == 0
+    assert registry.get("test", prompt, other, _build).runnable is not swapped.runnable
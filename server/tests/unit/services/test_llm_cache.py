@@ -0,0 +1,210 @@
+"""
+Unit tests for the content-addressed LLM response cache.
+
+Memory tier, plus the Postgres tier against an in-memory repository -
+validates keying, TTL/LRU eviction, opt-in, single-flight behaviour and
+purging of expired shared entries.
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.core.metrics import metrics
+from app.services.llm_cache import LLMResponseCache, cache_key
+from langchain_core.messages import HumanMessage
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _cache(**kwargs) -> LLMResponseCache:
+    defaults = {"prompts": ["roadmap-actions"], "max_entries": 8, "ttl_seconds": 60}
+    return LLMResponseCache(**{**defaults, **kwargs})
+
+
+def _counter(calls: list):
+    async def call():
+        calls.append(1)
+        return {"actions": [{"label": f"call {len(calls)}"}]}
+
+    return call
+
+
+def test_key_covers_version_model_and_variables():
+    """Any change to prompt version, model or variables changes the key."""
+    base = cache_key("p", "v1", "m", {"goal": "x"})
+
+    assert base == cache_key("p", "v1", "m", {"goal": "x"})
+    assert base != cache_key("p", "v2", "m", {"goal": "x"})
+    assert base != cache_key("p", "v1", "m2", {"goal": "x"})
+    assert base != cache_key("p", "v1", "m", {"goal": "y"})
+    assert cache_key("p", "v1", "m", {"h": [HumanMessage(content="hi")]}) != cache_key(
+        "p", "v1", "m", {"h": [HumanMessage(content="bye")]}
+    )
+
+
+@pytest.mark.asyncio
+async def test_hit_returns_independent_copy():
+    """The second identical call is served from memory without calling the LLM."""
+    cache = _cache()
+    calls: list = []
+
+    first = await cache.get_or_call(
+        "roadmap-actions", "v1", "m", {"g": 1}, _counter(calls)
+    )
+    first["actions"].clear()
+    second = await cache.get_or_call(
+        "roadmap-actions", "v1", "m", {"g": 1}, _counter(calls)
+    )
+
+    assert len(calls) == 1
+    assert second == {"actions": [{"label": "call 1"}]}
+    labels = {"prompt": "roadmap-actions", "tier": "memory"}
+    assert metrics.counter_value("llm_cache_hits_total", labels) == 1
+
+
+@pytest.mark.asyncio
+async def test_prompts_not_opted_in_always_call():
+    cache = _cache()
+    calls: list = []
+
+    for _ in range(2):
+        await cache.get_or_call("roadmap-planner", "v1", "m", {"g": 1}, _counter(calls))
+
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_lru_eviction():
+    """Expired entries miss; the least recently used entry is evicted first."""
+    expired = _cache(ttl_seconds=0)
+    calls: list = []
+    for _ in range(2):
+        await expired.get_or_call("roadmap-actions", "v1", "m", {}, _counter(calls))
+    assert len(calls) == 2
+
+    lru = _cache(max_entries=2)
+    calls = []
+    for g in (1, 2, 1, 3, 1, 2):
+        await lru.get_or_call("roadmap-actions", "v1", "m", {"g": g}, _counter(calls))
+    # 1, 2 miss; 1 hits; 3 evicts 2; 1 hits; 2 misses again
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    """Identical requests in flight at the same time trigger a single LLM call."""
+    cache = _cache()
+    calls: list = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"actions": []}
+
+    results = await asyncio.gather(
+        *[cache.get_or_call("roadmap-actions", "v1", "m", {}, slow) for _ in range(3)]
+    )
+
+    assert len(calls) == 1
+    assert results == [{"actions": []}] * 3
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached():
+    cache = _cache()
+    attempts: list = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ValueError("malformed JSON")
+        return {"actions": []}
+
+    with pytest.raises(ValueError):
+        await cache.get_or_call("roadmap-actions", "v1", "m", {}, flaky)
+    assert await cache.get_or_call("roadmap-actions", "v1", "m", {}, flaky) == {
+        "actions": []
+    }
+    assert len(attempts) == 2
+
+
+class _FakeCacheRepository:
+    """LLMCacheRepository over a dict: key -> (expires_at, response)."""
+
+    def __init__(self):
+        self.rows: dict[str, tuple[float, str]] = {}
+
+    async def get_fresh(self, cache_key):
+        return None
+
+    async def upsert(self, cache_key, prompt_name, response, ttl_seconds):
+        self.rows[cache_key] = (time.monotonic() + ttl_seconds, response)
+
+    async def delete_expired(self):
+        expired = [k for k, (at, _) in self.rows.items() if at <= time.monotonic()]
+        for key in expired:
+            del self.rows[key]
+        return len(expired)
+
+
+class _FakeUnitOfWork:
+    def __init__(self, repo):
+        self.llm_cache = repo
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_sampled_writes_purge_expired_shared_entries():
+    """Every purge_every-th Postgres write also deletes expired rows."""
+    repo = _FakeCacheRepository()
+    repo.rows = {"stale-1": (0.0, "{}"), "stale-2": (0.0, "{}")}
+    cache = _cache(shared=True, purge_every=3)
+    cache._shared.uow_factory = lambda: _FakeUnitOfWork(repo)
+
+    for g in range(2):
+        await cache.get_or_call("roadmap-actions", "v1", "m", {"g": g}, _counter([]))
+    assert {"stale-1", "stale-2"} <= repo.rows.keys()
+
+    await cache.get_or_call("roadmap-actions", "v1", "m", {"g": 2}, _counter([]))
+
+    assert len(repo.rows) == 3
+    assert not {"stale-1", "stale-2"} & repo.rows.keys()
+    assert metrics.counter_value("llm_cache_purged_total") == 2
+
+
+@pytest.mark.asyncio
+async def test_results_vetoed_by_cacheable_are_not_stored():
+    """An empty reply is returned but kept out of both tiers."""
+    repo = _FakeCacheRepository()
+    cache = _cache(shared=True)
+    cache._shared.uow_factory = lambda: _FakeUnitOfWork(repo)
+    replies = [{"actions": []}, {"actions": [{"label": "Buy shoes"}]}]
+
+    async def call():
+        return replies.pop(0)
+
+    def has_actions(result):
+        return bool(result["actions"])
+
+    results = [
+        await cache.get_or_call(
+            "roadmap-actions", "v1", "m", {}, call, cacheable=has_actions
+        )
+        for _ in range(3)
+    ]
+
+    assert results == [{"actions": []}] + [{"actions": [{"label": "Buy shoes"}]}] * 2
+    assert len(cache) == 1
+    assert len(repo.rows) == 1
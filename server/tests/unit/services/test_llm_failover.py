@@ -0,0 +1,93 @@
+"""
+Unit tests for provider failover, with two offline stand-in providers.
+"""
+
+import pytest
+from app.core.metrics import metrics
+from app.services.llm_failover import FailoverChain, FailoverChatModel
+from app.services.offline_llm import ScriptedChatModel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _provider(text: str, ttft_ms: int = 0, failure_rate: float = 0.0):
+    return ScriptedChatModel(
+        prompt_name="discovery-chat",
+        ttft_ms=ttft_ms,
+        token_delay_ms=0,
+        failure_rate=failure_rate,
+        scripts={"discovery-chat": text},
+    )
+
+
+def _failover(primary, secondary, clock) -> FailoverChatModel:
+    chain = FailoverChain(
+        "discovery-chat",
+        ["primary", "secondary"],
+        p95_threshold=0.03,
+        error_threshold=0.5,
+        window=10,
+        min_samples=3,
+        probe_seconds=30,
+        clock=clock,
+    )
+    return FailoverChatModel(models=[primary, secondary], chain=chain)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_fails_over_and_recovers_after_probe():
+    clock = FakeClock()
+    primary = _provider("primary", ttft_ms=60)
+    llm = _failover(primary, _provider("secondary"), clock)
+
+    replies = [(await llm.ainvoke("hi")).content for _ in range(5)]
+
+    # Three slow samples push the primary's p95 over the threshold
+    assert replies == ["primary"] * 3 + ["secondary"] * 2
+    assert metrics.counter_value(
+        "llm_failover_total",
+        {
+            "prompt": "discovery-chat",
+            "from_provider": "primary",
+            "to_provider": "secondary",
+        },
+    )
+
+    # The primary is fast again; the next probe brings traffic back
+    primary.ttft_ms = 0
+    clock.now = 31
+    replies = [(await llm.ainvoke("hi")).content for _ in range(2)]
+    assert replies == ["primary", "primary"]
+    assert llm.chain.unhealthy()["prompt=discovery-chat,provider=primary"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_fall_through_to_secondary():
+    llm = _failover(
+        _provider("primary", failure_rate=1.0), _provider("secondary"), FakeClock()
+    )
+
+    replies = [(await llm.ainvoke("hi")).content for _ in range(4)]
+
+    assert replies == ["secondary"] * 4
+    # Once the error rate is over the threshold the primary isn't tried at all
+    assert (
+        metrics.counter_value(
+            "llm_provider_calls_total",
+            {"prompt": "discovery-chat", "provider": "primary", "outcome": "error"},
+        )
+        == 3
+    )
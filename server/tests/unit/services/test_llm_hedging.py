@@ -0,0 +1,156 @@
+"""
+Unit tests for hedged LLM requests.
+
+Pure asyncio with short sleeps standing in for provider latency.
+"""
+
+import asyncio
+
+import pytest
+from app.core.metrics import metrics
+from app.services.llm_hedging import LLMHedger
+from app.services.llm_scheduler import LLMScheduler
+
+
+def _hedger(budget_ratio=1.0) -> LLMHedger:
+    return LLMHedger(
+        percentile=95, min_samples=1000, default_delay=0.02, budget_ratio=budget_ratio
+    )
+
+
+def _calls(*delays: float, fail_first: bool = False):
+    """fn() whose n-th invocation sleeps delays[n] and returns n."""
+    started: list[int] = []
+    cancelled: list[int] = []
+
+    async def fn():
+        n = len(started)
+        started.append(n)
+        try:
+            await asyncio.sleep(delays[n])
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        if fail_first and n == 0:
+            raise RuntimeError("primary failed")
+        return {"call": n}
+
+    return fn, started, cancelled
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_fast_call_is_not_hedged():
+    fn, started, _ = _calls(0)
+
+    assert await _hedger().run("p", fn) == {"call": 0}
+    assert started == [0]
+    assert metrics.counter_value("llm_hedges_total", {"prompt": "p"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_loser_cancelled():
+    fn, started, cancelled = _calls(1.0, 0)
+
+    result = await _hedger().run("p", fn, input_tokens=10)
+
+    assert result == {"call": 1}
+    assert started == [0, 1]
+    await asyncio.sleep(0)
+    assert cancelled == [0]
+    assert metrics.counter_value("llm_hedge_wins_total", {"prompt": "p"}) == 1
+    assert metrics.counter_value("llm_hedge_extra_tokens_total", {"prompt": "p"}) > 10
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_falls_back_to_hedge():
+    fn, _, _ = _calls(0.05, 0.1, fail_first=True)
+
+    assert await _hedger().run("p", fn) == {"call": 1}
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_duplicate_calls():
+    hedger = _hedger(budget_ratio=0.0)
+
+    fn, started, _ = _calls(0.05, 0.05)
+    await hedger.run("p", fn)  # the one hedge the empty budget allows
+    fn, started, _ = _calls(0.05, 0)
+    assert await hedger.run("p", fn) == {"call": 0}
+
+    assert started == [0]
+    assert metrics.counter_value("llm_hedge_budget_exhausted_total", {"prompt": "p"})
+
+
+async def _run_in_slot(scheduler: LLMScheduler, hedger: LLMHedger, fn):
+    """The pipeline's composition: hedge the provider call inside its slot."""
+    async with scheduler.slot(user_id="user-1"):
+        return await hedger.run(
+            "p",
+            fn,
+            spare_slot=lambda: scheduler.try_acquire("user-1"),
+            release_slot=lambda: scheduler.release("user-1"),
+        )
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_does_not_trigger_or_feed_the_deadline():
+    """A call slow only because it waited for a slot is not hedged."""
+    scheduler = LLMScheduler(max_in_flight=1, max_per_user=10)
+    await scheduler.acquire()
+    fn, started, _ = _calls(0)
+
+    queued = asyncio.create_task(_run_in_slot(scheduler, _hedger(), fn))
+    await asyncio.sleep(0.05)  # well past the 0.02s deadline
+    scheduler.release()
+
+    assert await queued == {"call": 0}
+    assert started == [0]
+    latency = metrics.histogram("llm_call_seconds", {"prompt": "p"})
+    assert latency.count == 1 and latency.total < 0.02
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_a_spare_slot():
+    """At the in-flight cap the primary continues alone."""
+    scheduler = LLMScheduler(max_in_flight=1, max_per_user=10)
+    fn, started, _ = _calls(0.05, 0)
+
+    assert await _run_in_slot(scheduler, _hedger(), fn) == {"call": 0}
+    assert started == [0]
+    assert metrics.counter_value("llm_hedge_no_capacity_total", {"prompt": "p"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_holds_and_returns_its_own_slot():
+    scheduler = LLMScheduler(max_in_flight=2, max_per_user=10)
+    fn, started, _ = _calls(1.0, 0)
+
+    assert await _run_in_slot(scheduler, _hedger(), fn) == {"call": 1}
+    assert started == [0, 1]
+    await asyncio.sleep(0)
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_losers_keep_the_deadline_from_shrinking():
+    """Losers are recorded at their elapsed time, not dropped as unfinished."""
+    # Budget above 1.0: every call may hedge
+    hedger = LLMHedger(
+        percentile=95, min_samples=2, default_delay=0.02, budget_ratio=2.0
+    )
+
+    for _ in range(5):
+        fn, started, _ = _calls(1.0, 0)
+        assert await hedger.run("p", fn) == {"call": 1}
+        await asyncio.sleep(0)  # let the loser's cancellation land
+        assert hedger.deadline("p") > 0.015
+
+    latency = metrics.histogram("llm_call_seconds", {"prompt": "p"})
+    assert latency.count == 10
@@ -0,0 +1,83 @@
+"""
+Unit tests for the API key pool, using the offline scripted LLM per key.
+"""
+
+import pytest
+from app.core.metrics import metrics
+from app.services.llm_key_pool import KeyPool, KeyPoolChatModel
+from app.services.llm_resilience import is_rate_limited
+from app.services.offline_llm import ScriptedChatModel, ScriptedLLMError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _key(rate_limited: bool = False) -> ScriptedChatModel:
+    return ScriptedChatModel(
+        prompt_name="discovery-chat",
+        ttft_ms=0,
+        token_delay_ms=0,
+        scripts={"discovery-chat": "hi"},
+        failure_rate=1.0 if rate_limited else 0.0,
+        failure_code=429,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_round_robin_and_least_loaded():
+    pool = KeyPool(3)
+    picks = []
+    for _ in range(4):
+        picks.append(pool.acquire())
+        pool.release(picks[-1])
+    assert picks == [0, 1, 2, 0]
+
+    pool = KeyPool(3, strategy="least_loaded")
+    busy = [pool.acquire(), pool.acquire()]
+    pool.release(busy[0])
+    assert busy == [0, 1]
+    assert pool.acquire() == 2  # keys 0 and 2 idle, 2 is next in rotation
+    assert pool.acquire() == 0  # key 1 is still busy, rotation would pick it
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_key_cools_down_and_call_moves_on():
+    clock = FakeClock()
+    pool = KeyPool(2, cooldown_seconds=30, clock=clock)
+    llm = KeyPoolChatModel(clients=[_key(rate_limited=True), _key()], pool=pool)
+
+    assert (await llm.ainvoke("hello")).content == "hi"
+    assert pool.is_cooling_down(0)
+    assert metrics.counter_value("llm_key_rate_limited_total", {"key": "key-0"}) == 1
+
+    # Key 0 is skipped while cooling down, even when it is next in rotation
+    await llm.ainvoke("hello")
+    assert metrics.counter_value("llm_key_calls_total", {"key": "key-0"}) == 1
+    assert metrics.counter_value("llm_key_calls_total", {"key": "key-1"}) == 2
+
+    clock.now = 31
+    assert not pool.is_cooling_down(0)
+    assert pool.in_flight() == {"key=key-0": 0, "key=key-1": 0}
+
+
+@pytest.mark.asyncio
+async def test_all_keys_rate_limited_raises():
+    pool = KeyPool(2, clock=FakeClock())
+    llm = KeyPoolChatModel(clients=[_key(True), _key(True)], pool=pool)
+
+    with pytest.raises(ScriptedLLMError) as exc_info:
+        await llm.ainvoke("hello")
+
+    assert is_rate_limited(exc_info.value)
+    assert pool.cooling_down() == {"key=key-0": 1.0, "key=key-1": 1.0}
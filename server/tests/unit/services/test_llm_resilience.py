@@ -0,0 +1,92 @@
+"""
+Unit tests for LLM retries and the shared circuit breaker.
+
+Pure asyncio with zero backoff delays - no provider calls.
+"""
+
+import pytest
+from app.services.llm_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMResilience,
+    is_retryable,
+)
+from app.services.offline_llm import ScriptedLLMError
+
+
+class RateLimited(Exception):
+    code = 429
+
+
+def _resilience(max_attempts=3, threshold=5, reset_seconds=60.0) -> LLMResilience:
+    return LLMResilience(
+        max_attempts=max_attempts,
+        base_delay=0,
+        max_delay=0,
+        breaker=CircuitBreaker(threshold, reset_seconds),
+    )
+
+
+def _flaky(failures: list[Exception], result="ok"):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return result
+
+    return fn, calls
+
+
+def test_retryable_classification_follows_cause_chain():
+    try:
+        try:
+            raise RateLimited()
+        except RateLimited as e:
+            raise RuntimeError("Error calling model") from e
+    except RuntimeError as wrapped:
+        assert is_retryable(wrapped)
+
+    assert is_retryable(ScriptedLLMError("503"))
+    assert not is_retryable(ValueError("bad request"))
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried():
+    resilience = _resilience()
+    fn, calls = _flaky([RateLimited(), TimeoutError()])
+
+    assert await resilience.call("p", fn) == "ok"
+    assert len(calls) == 3
+    assert resilience.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_failure_raises_immediately():
+    resilience = _resilience()
+    fn, calls = _flaky([ValueError("bad request")])
+
+    with pytest.raises(ValueError):
+        await resilience.call("p", fn)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers_via_probe():
+    resilience = _resilience(max_attempts=1, threshold=2, reset_seconds=0.05)
+    failing, _ = _flaky([RateLimited()] * 2)
+
+    for _ in range(2):
+        with pytest.raises(RateLimited):
+            await resilience.call("p", failing)
+    assert resilience.breaker.is_open
+
+    healthy, calls = _flaky([])
+    with pytest.raises(CircuitOpenError):
+        await resilience.call("p", healthy)
+    assert calls == []
+
+    resilience.breaker._opened_at -= 1  # reset window elapsed
+    assert await resilience.call("p", healthy) == "ok"
+    assert resilience.breaker.state == "closed"
@@ -0,0 +1,115 @@
+"""
+Unit tests for the process-wide LLM scheduler.
+
+Pure asyncio - validates caps, priority ordering and cancellation.
+"""
+
+import asyncio
+
+import pytest
+from app.services.llm_scheduler import LLMScheduler, Priority
+
+
+@pytest.mark.asyncio
+async def test_global_cap_limits_in_flight():
+    """No more than max_in_flight holders run at once."""
+    scheduler = LLMScheduler(max_in_flight=2, max_per_user=10)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with scheduler.slot():
+            peak = max(peak, scheduler.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[work() for _ in range(6)])
+
+    assert peak == 2
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_served_before_bulk():
+    """Queued interactive waiters are granted ahead of earlier bulk waiters."""
+    scheduler = LLMScheduler(max_in_flight=1, max_per_user=10)
+    order: list[str] = []
+
+    await scheduler.acquire(Priority.STANDARD)
+
+    async def work(name: str, priority: Priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+
+    tasks = [
+        asyncio.create_task(work("bulk", Priority.BULK)),
+        asyncio.create_task(work("background", Priority.BACKGROUND)),
+        asyncio.create_task(work("chat", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth()["bulk"] == 1
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["chat", "background", "bulk"]
+
+
+@pytest.mark.asyncio
+async def test_per_user_cap_does_not_block_other_users():
+    """A user at their cap waits while another user's call proceeds."""
+    scheduler = LLMScheduler(max_in_flight=4, max_per_user=1)
+    await scheduler.acquire(user_id="alice")
+
+    blocked = asyncio.create_task(scheduler.acquire(user_id="alice"))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    await asyncio.wait_for(scheduler.acquire(user_id="bob"), timeout=1)
+
+    scheduler.release(user_id="alice")
+    await asyncio.wait_for(blocked, timeout=1)
+    assert scheduler.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_removed():
+    """Cancelling a queued acquire frees its queue position."""
+    scheduler = LLMScheduler(max_in_flight=1, max_per_user=10)
+    await scheduler.acquire()
+
+    waiter = asyncio.create_task(scheduler.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    scheduler.release()
+    assert scheduler.in_flight == 0
+    assert sum(scheduler.queue_depth().values()) == 0
+
+
+@pytest.mark.asyncio
+async def test_promoted_task_jumps_the_queue_and_keeps_its_priority():
+    """A claimed background task is served before waiting standard work."""
+    scheduler = LLMScheduler(max_in_flight=1, max_per_user=10)
+    order: list[str] = []
+    await scheduler.acquire(Priority.STANDARD)
+
+    async def work(name: str, priority: Priority, calls: int = 1):
+        for _ in range(calls):
+            async with scheduler.slot(priority):
+                order.append(name)
+
+    speculative = asyncio.create_task(work("speculative", Priority.BACKGROUND, 2))
+    other = asyncio.create_task(work("other", Priority.BACKGROUND))
+    standard = asyncio.create_task(work("standard", Priority.STANDARD))
+    await asyncio.sleep(0)
+
+    scheduler.promote(speculative, Priority.INTERACTIVE)
+    assert scheduler.queue_depth()["interactive"] == 1
+
+    scheduler.release()
+    await asyncio.gather(speculative, other, standard)
+
+    # Its retry after promotion is queued at the promoted priority too
+    assert order == ["speculative", "standard", "speculative", "other"]
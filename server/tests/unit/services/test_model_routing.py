@@ -0,0 +1,51 @@
+"""
+Unit tests for per-prompt model routing.
+"""
+
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services import gemini
+from app.services.model_routing import DEFAULT_ROUTES, ModelRoute, resolve_route
+
+
+def test_langfuse_config_overrides_env_and_defaults():
+    env = {"roadmap-planner": {"model": "env-model", "max_output_tokens": 1000}}
+    langfuse = {"temperature": "0.1", "max_tokens": 512, "response_format": {}}
+
+    with (
+        patch.object(settings, "LLM_MODEL_ROUTES", env),
+        patch("app.services.model_routing.get_prompt_config", return_value=langfuse),
+    ):
+        route = resolve_route("roadmap-planner")
+
+    assert route == ModelRoute("env-model", 0.1, 512)
+
+
+def test_cheap_model_for_analysis_stronger_for_planning():
+    assert (
+        resolve_route("discovery-analysis").model
+        != resolve_route("roadmap-planner").model
+    )
+    assert resolve_route("checkin-analysis") == DEFAULT_ROUTES["checkin-analysis"]
+    assert resolve_route(None) == ModelRoute()
+
+
+def test_get_llm_builds_one_client_per_route():
+    with (
+        patch.object(settings, "LLM_PROVIDER", "gemini"),
+        patch.object(settings, "GEMINI_API_KEY", "test-key"),
+    ):
+        planner = gemini.get_llm(prompt_name="roadmap-planner")
+        again = gemini.get_llm(prompt_name="roadmap-planner")
+        override = gemini.get_llm("gemini-custom", prompt_name="roadmap-planner")
+    gemini._build_llm.cache_clear()
+
+    route = DEFAULT_ROUTES["roadmap-planner"]
+    assert planner is again
+    assert (planner.model, planner.temperature, planner.max_output_tokens) == (
+        route.model,
+        route.temperature,
+        route.max_output_tokens,
+    )
+    assert override.model == "gemini-custom"
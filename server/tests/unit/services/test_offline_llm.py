@@ -0,0 +1,80 @@
+"""
+Unit tests for the offline scripted LLM.
+
+No network or database - validates canned output, streaming and failure injection.
+"""
+
+import json
+
+import pytest
+from app.services.offline_llm import ScriptedChatModel, ScriptedLLMError
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+PROMPT = ChatPromptTemplate.from_messages([("human", "{text}")])
+
+
+@pytest.mark.asyncio
+async def test_returns_canned_json_for_prompt_name():
+    """The planner script parses into the same shape the pipeline expects."""
+    llm = ScriptedChatModel(prompt_name="roadmap-planner", ttft_ms=0, token_delay_ms=0)
+    chain = PROMPT | llm | JsonOutputParser()
+
+    result = await chain.ainvoke({"text": "plan"})
+
+    assert result["goal"]["label"] == "Run a half marathon"
+    assert len(result["goal"]["milestones"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_streams_script_token_by_token():
+    """Streaming yields multiple chunks that join back into the full script."""
+    scripts = {"discovery-chat": "one two three"}
+    llm = ScriptedChatModel(
+        prompt_name="discovery-chat", ttft_ms=0, token_delay_ms=0, scripts=scripts
+    )
+    chain = PROMPT | llm | StrOutputParser()
+
+    chunks = [c async for c in chain.astream({"text": "hi"})]
+
+    assert [c for c in chunks if c] == ["one ", "two ", "three"]
+
+
+@pytest.mark.asyncio
+async def test_failure_rate_is_deterministic_per_seed():
+    """Same seed produces the same failure pattern across model instances."""
+
+    async def pattern(seed: int) -> list[bool]:
+        llm = ScriptedChatModel(
+            prompt_name="roadmap-actions",
+            ttft_ms=0,
+            token_delay_ms=0,
+            failure_rate=0.5,
+            seed=seed,
+        )
+        outcomes = []
+        for _ in range(20):
+            try:
+                await llm.ainvoke("go")
+                outcomes.append(True)
+            except ScriptedLLMError:
+                outcomes.append(False)
+        return outcomes
+
+    first = await pattern(7)
+    assert first == await pattern(7)
+    assert True in first and False in first
+
+
+@pytest.mark.asyncio
+async def test_script_file_overrides_defaults(tmp_path):
+    """Scripts loaded from JSON replace the built-in response for that prompt."""
+    from app.services.offline_llm import load_scripts
+
+    path = tmp_path / "scripts.json"
+    path.write_text(json.dumps({"checkin-analysis": {"updates": [{"x": 1}]}}))
+
+    scripts = load_scripts(str(path))
+
+    assert scripts["checkin-analysis"] == {"updates": [{"x": 1}]}
+    assert "roadmap-planner" in scripts
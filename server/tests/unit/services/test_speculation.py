@@ -0,0 +1,102 @@
+"""
+Unit tests for the speculative task store.
+
+Pure asyncio - validates hit/miss accounting, waste on discard and TTL expiry.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from app.core.metrics import metrics
+from app.services.llm_scheduler import LLMScheduler, Priority
+from app.services.speculation import SpeculativeTasks
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_take_returns_started_task():
+    """A matching key is claimed once; later lookups miss."""
+    store = SpeculativeTasks("test", ttl_seconds=60)
+
+    async def work():
+        return "actions"
+
+    store.start("rm-1", "ms-1:abc", work)
+    task = store.take("rm-1", "ms-1:abc")
+
+    assert task is not None
+    assert await task == "actions"
+    assert store.take("rm-1", "ms-1:abc") is None
+    assert metrics.counter_value("speculation_hits_total", {"kind": "test"}) == 1
+    assert metrics.counter_value("speculation_misses_total", {"kind": "test"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_discard_cancels_and_counts_waste():
+    """Unclaimed running tasks are cancelled and reported as wasted."""
+    store = SpeculativeTasks("test", ttl_seconds=60)
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    store.start("rm-1", "ms-1:abc", slow)
+    await started.wait()
+    task = store._scopes["rm-1"][1]["ms-1:abc"]
+
+    assert store.discard("rm-1") == 1
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert not store.has_scope("rm-1")
+    labels = {"kind": "test", "state": "cancelled"}
+    assert metrics.counter_value("speculation_wasted_total", labels) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_scope_is_dropped():
+    """Scopes older than the TTL are discarded on the next access."""
+    store = SpeculativeTasks("test", ttl_seconds=0)
+
+    async def work():
+        return None
+
+    store.start("rm-1", "ms-1:abc", work)
+    await asyncio.sleep(0.01)
+
+    assert not store.has_scope("rm-1")
+
+
+@pytest.mark.asyncio
+async def test_take_promotes_a_queued_background_task():
+    """The claimant doesn't wait in the background queue behind other work."""
+    scheduler = LLMScheduler(max_in_flight=1, max_per_user=10)
+    store = SpeculativeTasks("test", ttl_seconds=60)
+    await scheduler.acquire(Priority.STANDARD)
+
+    async def speculate():
+        async with scheduler.slot(Priority.BACKGROUND):
+            return "actions"
+
+    with patch("app.services.speculation.llm_scheduler", scheduler):
+        store.start("rm-1", "ms-1:abc", speculate)
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth()["background"] == 1
+
+        task = store.take("rm-1", "ms-1:abc", priority=Priority.STANDARD)
+
+    assert scheduler.queue_depth() == {
+        "interactive": 0,
+        "standard": 1,
+        "background": 0,
+        "bulk": 0,
+    }
+    scheduler.release()
+    assert await task == "actions"
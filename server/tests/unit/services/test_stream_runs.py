@@ -0,0 +1,75 @@
+"""
+Unit tests for resumable SSE runs (event ids, replay, live follow-up).
+"""
+
+import asyncio
+
+import pytest
+from app.services.stream_runs import StreamRunRegistry
+
+
+def _frame(i: int) -> str:
+    return f"event: token\ndata: {i}\n\n"
+
+
+async def _source(count: int, calls: list[int], delay: float = 0.01):
+    for i in range(1, count + 1):
+        calls.append(i)
+        await asyncio.sleep(delay)
+        yield _frame(i)
+
+
+def _ids(frames: list[str]) -> list[int]:
+    return [int(f.rstrip("\n").rsplit("\n", 1)[1].removeprefix("id: ")) for f in frames]
+
+
+@pytest.mark.asyncio
+async def test_dropped_stream_resumes_the_same_generation():
+    registry = StreamRunRegistry(buffer_size=100, ttl_seconds=60, max_runs=10)
+    calls: list[int] = []
+    run = registry.start(_source(6, calls), owner="user-1")
+
+    # The client reads two frames, then its connection drops
+    first = []
+    frames = run.frames()
+    async for frame in frames:
+        first.append(frame)
+        if len(first) == 2:
+            break
+    await frames.aclose()
+
+    resumed = registry.resume(run.run_id, "user-1", last_event_id=2)
+    rest = [frame async for frame in resumed]
+
+    assert _ids(first) == [1, 2]
+    assert _ids(rest) == [3, 4, 5, 6]
+    assert rest[-1] == "event: token\ndata: 6\nid: 6\n\n"
+    assert calls == [1, 2, 3, 4, 5, 6]  # generated once, not re-run
+
+
+@pytest.mark.asyncio
+async def test_resume_rejects_other_users_and_evicted_frames():
+    registry = StreamRunRegistry(buffer_size=3, ttl_seconds=60, max_runs=10)
+    run = registry.start(_source(5, [], delay=0), owner="user-1")
+    await run._task
+
+    assert registry.resume(run.run_id, "intruder", last_event_id=0) is None
+    assert registry.resume("unknown", "user-1", last_event_id=0) is None
+
+    tail = [f async for f in registry.resume(run.run_id, "user-1", last_event_id=2)]
+    assert _ids(tail) == [3, 4, 5]
+
+    evicted = [f async for f in registry.resume(run.run_id, "user-1", last_event_id=1)]
+    assert len(evicted) == 1 and "replay_unavailable" in evicted[0]
+
+
+@pytest.mark.asyncio
+async def test_frame_layout_keeps_event_and_data_first():
+    """The web client takes the type from line 0 and the data from line 1."""
+    registry = StreamRunRegistry(buffer_size=10, ttl_seconds=60, max_runs=10)
+    run = registry.start(_source(1, [], delay=0), owner=None)
+    frames = [f async for f in run.frames()]
+
+    assert frames == ["event: token\ndata: 1\nid: 1\n\n"]
+    lines = frames[0].split("\n\n")[0].split("\n")
+    assert lines[0].startswith("event: ") and lines[1].startswith("data: ")
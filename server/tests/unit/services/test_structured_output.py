@@ -0,0 +1,114 @@
+"""
+Unit tests for structured-output chains with the offline scripted LLM.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.llm.checkin import CheckInAnalysisResult
+from app.schemas.llm.roadmap import ActionsResult, SkeletonResult
+from app.services.gemini import structured_llm
+from app.services.json_output import parse_json_reply
+from app.services.offline_llm import ScriptedChatModel
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+NODE_ID = "3f1c2a4e-8b7d-4c1e-9a2f-5d6e7f8a9b0c"
+ACTIONS_REPLY = '{"actions": [{"label": "Buy running shoes"}]}'
+
+
+def _llm(script=None) -> ScriptedChatModel:
+    kwargs = {"scripts": {"p": script}} if script is not None else {}
+    return ScriptedChatModel(prompt_name="p", ttft_ms=0, token_delay_ms=0, **kwargs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("native", [True, False])
+async def test_planner_output_validates_in_one_pass(native):
+    """Both modes return a validated SkeletonResult, not a raw dict."""
+    llm = ScriptedChatModel(prompt_name="roadmap-planner", ttft_ms=0, token_delay_ms=0)
+
+    with patch.object(settings, "LLM_STRUCTURED_OUTPUT", native):
+        result = await structured_llm(llm, SkeletonResult, "p").ainvoke("plan")
+
+    assert isinstance(result, SkeletonResult)
+    assert result.goal.milestones
+    assert result.goal.milestones[0].start_date is not None
+
+
+@pytest.mark.asyncio
+async def test_schema_violation_raises():
+    """An update with a malformed node_id fails validation instead of leaking through."""
+    llm = _llm(
+        {"updates": [{"node_id": "n-1", "progress_delta": 10, "log_entry": "x"}]}
+    )
+
+    with pytest.raises(OutputParserException, match="node_id"):
+        await structured_llm(llm, CheckInAnalysisResult, "p").ainvoke("check in")
+
+
+@pytest.mark.asyncio
+async def test_malformed_reply_repaired_locally():
+    """Fenced, truncated output is repaired without another model call."""
+    llm = _llm(
+        '```json\n{"updates": [{"node_id": "%s", "progress_delta": 5, '
+        '"log_entry": "Ran 5km"}, {"node_id": "x"' % NODE_ID
+    )
+
+    with patch.object(settings, "LLM_STRUCTURED_OUTPUT", False):
+        result = await structured_llm(
+            llm, CheckInAnalysisResult, "checkin-test"
+        ).ainvoke("check in")
+
+    assert [str(u.node_id) for u in result.updates] == [NODE_ID]
+    assert metrics.counter_value(
+        "llm_json_parse_total", {"prompt": "checkin-test", "outcome": "repaired"}
+    )
+    assert metrics.snapshot()["gauges"]["llm_json_repair_rate"]["prompt=checkin-test"]
+
+
+@pytest.mark.asyncio
+async def test_unrecoverable_reply_gets_one_targeted_retry():
+    """Only output no repair can save is sent back to the model with the error."""
+    llm = FakeListChatModel(
+        responses=["I can't help with that.", '{"updates": []}', "unused"]
+    )
+
+    result = await structured_llm(llm, CheckInAnalysisResult, "retry-test").ainvoke(
+        "check in"
+    )
+
+    assert result == CheckInAnalysisResult(updates=[])
+    assert llm.i == 2
+    assert metrics.counter_value(
+        "llm_json_parse_total", {"prompt": "retry-test", "outcome": "retried"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_reply_truncated_to_nothing_is_retried_not_repaired():
+    """Backing off to an empty result loses all content; ask the model again."""
+    llm = FakeListChatModel(
+        responses=['{"actions": [{"lab', ACTIONS_REPLY, "unused"]
+    )
+
+    result = await structured_llm(llm, ActionsResult, "empty-test").ainvoke("plan")
+
+    assert [a.label for a in result.actions] == ["Buy running shoes"]
+    assert llm.i == 2
+    assert not metrics.counter_value(
+        "llm_json_parse_total", {"prompt": "empty-test", "outcome": "repaired"}
+    )
+
+
+def test_repair_keeps_elements_after_an_escaped_quote():
+    reply = (
+        '{"actions":[{"label":"Read "Atomic Habits" book","details":"x",'
+        '"is_assumed":false},{"label":"Plan","deta'
+    )
+
+    result = parse_json_reply(reply, ActionsResult, "quote-test")
+
+    assert [a.label for a in result.actions] == ['Read "Atomic Habits" book', "Plan"]
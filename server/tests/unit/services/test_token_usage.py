@@ -0,0 +1,77 @@
+"""
+Unit tests for per-stage / per-user token accounting.
+"""
+
+import pytest
+from app.core.metrics import metrics
+from app.services.llm_scheduler import LLMScheduler
+from app.services.offline_llm import ScriptedChatModel
+from app.services.token_usage import usage_handler, user_label
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _summary(name: str, labels: str) -> dict:
+    return metrics.snapshot()["histograms"][name][labels]
+
+
+@pytest.mark.asyncio
+async def test_provider_usage_recorded_per_stage_and_user():
+    llm = GenericFakeChatModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="ok",
+                    usage_metadata={
+                        "input_tokens": 120,
+                        "output_tokens": 30,
+                        "total_tokens": 150,
+                    },
+                )
+            ]
+        ),
+        callbacks=[usage_handler("roadmap-planner")],
+    )
+
+    async with LLMScheduler(4, 4).slot(user_id="user-1"):
+        await llm.ainvoke("plan")
+
+    assert _summary("llm_input_tokens", "stage=roadmap-planner")["sum"] == 120
+    assert _summary("llm_output_tokens", "stage=roadmap-planner")["sum"] == 30
+    assert _summary("llm_user_tokens", f"user={user_label('user-1')}")["sum"] == 150
+    assert "user-1" not in str(metrics.snapshot())  # raw ids never exposed
+    assert metrics.counter_value(
+        "llm_tokens_total",
+        {"stage": "roadmap-planner", "kind": "input", "source": "provider"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_missing_usage_is_estimated_locally():
+    llm = ScriptedChatModel(
+        prompt_name="roadmap-actions",
+        ttft_ms=0,
+        token_delay_ms=0,
+        callbacks=[usage_handler("roadmap-actions", "offline-scripted")],
+    )
+
+    await llm.ainvoke("Generate actions for the milestone")
+
+    assert _summary("llm_input_tokens", "stage=roadmap-actions")["sum"] > 0
+    assert _summary("llm_output_tokens", "stage=roadmap-actions")["sum"] > 50
+    assert _summary("llm_user_tokens", "user=anonymous")["count"] == 1
+    latency = _summary(
+        "llm_stage_seconds", "model=offline-scripted,stage=roadmap-actions"
+    )
+    assert latency["count"] == 1
+    assert metrics.counter_value(
+        "llm_tokens_total",
+        {"stage": "roadmap-actions", "kind": "output", "source": "estimate"},
+    )
@@ -0,0 +1,47 @@
+"""
+Unit tests for token coalescing over async streams.
+"""
+
+import asyncio
+
+import pytest
+from app.utils.async_stream import coalesce
+
+
+async def _tokens(items: list[tuple[float, str]]):
+    for delay, token in items:
+        await asyncio.sleep(delay)
+        yield token
+
+
+async def _collect(stream) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_first_token_passes_through_then_size_window_flushes():
+    source = _tokens([(0, "a"), (0, "bb"), (0, "cc"), (0, "dd"), (0, "e")])
+
+    # 4 bytes per batch; the remainder is flushed when the source ends
+    assert await _collect(coalesce(source, 1.0, 4)) == ["a", "bbcc", "dde"]
+
+
+@pytest.mark.asyncio
+async def test_time_window_flushes_while_source_is_silent():
+    source = _tokens([(0, "a"), (0, "b"), (0, "c"), (0.15, "d")])
+    received: list[tuple[str, float]] = []
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async for chunk in coalesce(source, 0.05, 0):
+        received.append((chunk, loop.time() - start))
+
+    assert [chunk for chunk, _ in received] == ["a", "bc", "d"]
+    assert received[1][1] < 0.12  # flushed by the 50ms window, not by "d"
+
+
+@pytest.mark.asyncio
+async def test_zero_delay_disables_coalescing():
+    source = _tokens([(0, "a"), (0, "b"), (0, "c")])
+
+    assert await _collect(coalesce(source, 0, 512)) == ["a", "b", "c"]
@@ -0,0 +1,69 @@
+"""
+Unit tests for local repair of malformed LLM JSON output.
+"""
+
+import pytest
+from app.utils.json_repair import (
+    STRAY_PROSE,
+    TRAILING_COMMA,
+    TRUNCATED,
+    UNESCAPED_QUOTE,
+    repair_candidates,
+    repair_json,
+)
+
+
+def test_prose_fences_and_trailing_commas():
+    text = 'Sure! Here it is:\n```json\n{"a": [1, 2,], "b": {"c": 3,},}\n```\nDone.'
+
+    value, repairs = repair_json(text)
+
+    assert value == {"a": [1, 2], "b": {"c": 3}}
+    assert STRAY_PROSE in repairs and TRAILING_COMMA in repairs
+
+
+def test_unescaped_inner_quotes():
+    value, repairs = repair_json('{"label": "Read "the book" first", "n": 1}')
+
+    assert value == {"label": 'Read "the book" first', "n": 1}
+    assert repairs == [UNESCAPED_QUOTE]
+
+
+def test_truncated_string_is_closed():
+    value, repairs = repair_json('{"goal": {"label": "Run", "details": "Finish a ha')
+
+    assert value == {"goal": {"label": "Run", "details": "Finish a ha"}}
+    assert TRUNCATED in repairs
+
+
+def test_truncated_array_falls_back_to_complete_elements():
+    text = '{"actions": [{"label": "A"}, {"label": "B"}, {"lab'
+
+    values = [value for value, _ in repair_candidates(text)]
+
+    assert {"actions": [{"label": "A"}, {"label": "B"}]} in values
+
+
+def test_escape_repairs_keep_truncation_cut_points_aligned():
+    """Escaped quotes/newlines add characters; back-off must still cut cleanly."""
+    text = (
+        '{"actions": [{"label": "Read "Atomic Habits" book", "details": "a\nb"},'
+        ' {"label": "Plan", "deta'
+    )
+
+    values = [value for value, _ in repair_candidates(text)]
+
+    first = {"label": 'Read "Atomic Habits" book', "details": "a\nb"}
+    assert {"actions": [first, {"label": "Plan"}]} in values
+    assert {"actions": [first]} in values
+
+
+def test_missing_closing_braces():
+    value, _ = repair_json('{"updates": [{"node_id": "x", "progress_delta": 5}')
+
+    assert value == {"updates": [{"node_id": "x", "progress_delta": 5}]}
+
+
+def test_no_json_is_unrecoverable():
+    with pytest.raises(ValueError):
+        repair_json("I could not generate a plan for this goal.")
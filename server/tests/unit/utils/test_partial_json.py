@@ -0,0 +1,56 @@
+"""
+Unit tests for incremental JSON array item extraction.
+"""
+
+import json
+
+from app.utils.partial_json import JsonArrayItemStream
+
+DOC = {
+    "goal": {
+        "label": "Learn {Rust}",
+        "milestones": [
+            {"label": 'Read "the book"', "details": "ch. 1-5, [basics]"},
+            {"label": "Build a CLI", "details": None},
+        ],
+        "actions": [{"label": "Not a milestone"}],
+    }
+}
+
+
+def _feed_in_chunks(text: str, size: int) -> list[tuple[int, dict]]:
+    scanner = JsonArrayItemStream("milestones")
+    found = []
+    for offset in range(0, len(text), size):
+        for item in scanner.feed(text[offset : offset + size]):
+            found.append((offset, item))
+    return found
+
+
+def test_items_emitted_as_soon_as_they_close():
+    """Each milestone is returned by the chunk containing its closing brace."""
+    text = json.dumps(DOC)
+    found = _feed_in_chunks(text, 1)
+
+    assert [item for _, item in found] == DOC["goal"]["milestones"]
+    first_close = text.index("}", text.index('"milestones"'))
+    assert found[0][0] == first_close
+
+
+def test_ignores_fences_and_other_arrays():
+    """Markdown fences are skipped and items of other arrays are not returned."""
+    text = "```json\n" + json.dumps(DOC, indent=2) + "\n```"
+    found = _feed_in_chunks(text, 7)
+
+    assert [item["label"] for _, item in found] == ['Read "the book"', "Build a CLI"]
+
+
+def test_truncated_stream_returns_only_closed_items():
+    """An unfinished trailing item is never returned."""
+    text = json.dumps(DOC)
+    cut = text.index("Build a CLI")
+    scanner = JsonArrayItemStream("milestones")
+
+    items = scanner.feed(text[:cut])
+
+    assert len(items) == 1